@@ -175,6 +175,8 @@ create table if not exists public.optimization_jobs (
   owner_id uuid not null references public.profiles(id) on delete cascade,
   strategy_version_id uuid not null references public.strategy_versions(id),
   param_space jsonb not null,
+  -- 归一化后的参数维度，按 [key, values] 有序数组保存（jsonb 对象不保序）
+  normalized_space jsonb,
   concurrency_limit int not null default 2 check (concurrency_limit > 0 and concurrency_limit <= 64),
   early_stop_policy jsonb,
   status run_status not null default 'queued',
@@ -187,6 +189,11 @@ create table if not exists public.optimization_jobs (
 );
 create index if not exists idx_opt_jobs_owner_created on public.optimization_jobs(owner_id, created_at desc);
 create index if not exists idx_opt_jobs_version on public.optimization_jobs(strategy_version_id);
+-- 历史列表按 updated_at 游标分页
+create index if not exists idx_opt_jobs_owner_updated on public.optimization_jobs(owner_id, updated_at desc, id desc);
+-- 旧库迁移（显式步骤，服务启动不会自动改表）：执行本文件的 add column 补列，
+-- 再调用 TaskPersistence.migrate_task_storage() 回填 normalized_space / combo_index
+alter table public.optimization_jobs add column if not exists normalized_space jsonb;
 
 create table if not exists public.optimization_tasks (
   id uuid primary key default uuid_generate_v4(),
@@ -194,6 +201,8 @@ create table if not exists public.optimization_tasks (
   owner_id uuid not null references public.profiles(id) on delete cascade,
   strategy_version_id uuid not null references public.strategy_versions(id),
   param_set jsonb not null,
+  -- compact 存储（OPT_TASK_STORAGE=compact）：param_set 置为 {}，由 combo_index 与作业 normalized_space 解码
+  combo_index int,
   status run_status not null default 'queued',
   progress real,
   retries int not null default 0,
@@ -207,9 +216,17 @@ create table if not exists public.optimization_tasks (
   updated_at timestamptz not null default now()
 );
 create index if not exists idx_opt_tasks_job on public.optimization_tasks(job_id);
+alter table public.optimization_tasks add column if not exists combo_index int;
 create index if not exists idx_opt_tasks_owner on public.optimization_tasks(owner_id);
 create index if not exists idx_opt_tasks_status_next on public.optimization_tasks(status, next_run_at);
 
+-- 多副本共享派发（OPT_DISPATCH_MODE=db）：每个作业一行运行计数，认领任务时原子占用槽位
+create table if not exists public.optimization_job_slots (
+  job_id uuid primary key references public.optimization_jobs(id) on delete cascade,
+  running int not null default 0 check (running >= 0),
+  concurrency_limit int not null
+);
+
 -- =============================
 -- Helper Views (examples)
 -- =============================
@@ -0,0 +1,110 @@
+"""Asyncio facade over the orchestrator for the FastAPI handlers.
+
+Orchestrator calls take the store lock and, with persistence enabled, block on
+SQLAlchemy I/O. The facade runs them on a bounded thread pool so a slow write
+only occupies a pool thread instead of stalling the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from . import orchestrator
+from .events import JobSubscription
+
+DEFAULT_ASYNC_WORKERS = 8
+DEFAULT_ASYNC_WAITERS = 32
+
+T = TypeVar("T")
+
+
+def get_async_workers() -> int:
+    raw = os.getenv("OPT_ASYNC_WORKERS")
+    if not raw:
+        return DEFAULT_ASYNC_WORKERS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_ASYNC_WORKERS
+    return max(1, value)
+
+
+def get_async_waiters() -> int:
+    raw = os.getenv("OPT_ASYNC_WAITERS")
+    if not raw:
+        return DEFAULT_ASYNC_WAITERS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_ASYNC_WAITERS
+    return max(1, value)
+
+
+class AsyncOrchestrator:
+    """Awaitable versions of the orchestrator entry points used over HTTP.
+
+    Functions are resolved on the orchestrator module at call time, so tests
+    that monkeypatch the module keep working through the facade.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or get_async_workers()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="orchestrator",
+        )
+        # Blocking long-poll dequeues park here so idle workers never starve
+        # the pool serving status/snapshot requests.
+        self._wait_executor = ThreadPoolExecutor(
+            max_workers=get_async_waiters(),
+            thread_name_prefix="orchestrator-wait",
+        )
+
+    async def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def call_blocking(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._wait_executor, functools.partial(fn, *args, **kwargs))
+
+    async def create_optimization_job(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.call(orchestrator.create_optimization_job, **kwargs)
+
+    async def get_job_status(self, job_id: str, owner_id: str) -> Dict[str, Any]:
+        return await self.call(orchestrator.get_job_status, job_id, owner_id)
+
+    async def get_job_snapshot(self, job_id: str, owner_id: str) -> Dict[str, Any]:
+        return await self.call(orchestrator.get_job_snapshot, job_id, owner_id)
+
+    async def export_top_n_bundle(self, job_id: str, owner_id: str) -> Dict[str, Any]:
+        return await self.call(orchestrator.export_top_n_bundle, job_id, owner_id)
+
+    async def cancel_job(self, job_id: str, owner_id: str, *, reason: Optional[str] = None) -> Dict[str, Any]:
+        return await self.call(orchestrator.cancel_job, job_id, owner_id, reason=reason)
+
+    async def list_jobs_page(
+        self,
+        owner_id: str,
+        **kwargs: Any,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.call(orchestrator.list_jobs_page, owner_id, **kwargs)
+
+    async def job_count(self) -> int:
+        return await self.call(lambda: len(orchestrator.debug_jobs()))
+
+    async def subscribe_job_events(self, job_id: str, owner_id: str) -> JobSubscription:
+        loop = asyncio.get_running_loop()
+        return await self.call(orchestrator.subscribe_job_events, job_id, owner_id, loop=loop)
+
+    def get_job_revision(self, job_id: str, owner_id: str) -> int:
+        # Lock-free in the orchestrator, so it is safe to call on the loop.
+        return orchestrator.get_job_revision(job_id, owner_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        self._wait_executor.shutdown(wait=wait)
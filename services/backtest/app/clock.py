@@ -0,0 +1,92 @@
+"""Process-wide clock used by the orchestrator, worker, leases and timers.
+
+``time()`` is wall-clock epoch seconds for timestamps, ``monotonic()`` is for
+measuring durations. Swapping in a VirtualClock (``set_clock``/``use_clock``)
+lets tests and simulations move time forward instantly instead of sleeping.
+Real blocking waits (condition variables, asyncio) stay on the system clock.
+"""
+
+from __future__ import annotations
+
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Iterator, Optional, Union
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SystemClock:
+    def time(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.perf_counter()
+
+    def utcnow(self) -> datetime:
+        return datetime.utcnow()
+
+
+class VirtualClock:
+    """Clock that only moves when told to; monotonic and wall time advance together."""
+
+    def __init__(self, start: Optional[Union[float, datetime]] = None) -> None:
+        if start is None:
+            start = _time.time()
+        elif isinstance(start, datetime):
+            start = (start - _EPOCH).total_seconds() if start.tzinfo is None else start.timestamp()
+        self._now = float(start)
+        self._elapsed = 0.0
+        self._lock = Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    def utcnow(self) -> datetime:
+        return _EPOCH + timedelta(seconds=self._now)
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("a clock cannot move backwards")
+        with self._lock:
+            self._now += seconds
+            self._elapsed += seconds
+
+    def advance_to(self, epoch: float) -> None:
+        """Move to ``epoch`` if it is in the future; earlier targets are ignored."""
+
+        with self._lock:
+            if epoch > self._now:
+                self._elapsed += epoch - self._now
+                self._now = epoch
+
+
+Clock = Union[SystemClock, VirtualClock]
+
+_CLOCK: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    return _CLOCK
+
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """Install ``clock`` (None restores the system clock); returns the previous one."""
+
+    global _CLOCK
+    previous = _CLOCK
+    _CLOCK = clock if clock is not None else SystemClock()
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -0,0 +1,539 @@
+"""Append-only event log persistence backend.
+
+Selected with an ``eventlog://<directory>`` DSN. Instead of updating rows in
+place, every job and task transition is appended as one JSON line to the
+current segment file, so the hot path is a sequential write. Every
+OPT_EVENTLOG_SNAPSHOT_EVERY events the log rolls to a new segment and a
+background thread rewrites the per-job records under ``snapshot/`` for the
+jobs touched since the previous snapshot, then ``snapshot.json`` to point
+past the segments it covers, and deletes those. Restart loads the records
+and replays the newer segments in order; every event sets absolute values,
+so replaying one a record already reflects is harmless.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import IO, Any, Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from .observability import emit_metric, timed_methods
+from .orchestrator import (
+    DEFAULT_STATUS,
+    EVENTLOG_DSN_PREFIX,
+    OptimizationJob,
+    OptimizationTask,
+    _dict_to_policy,
+    _dict_to_summary,
+    _install_hydrated,
+    _policy_to_dict,
+    _space_from_json,
+    _space_to_json,
+    _summary_to_dict,
+    _to_epoch,
+    decode_combo_index,
+    format_ts,
+    get_task_storage,
+)
+
+DEFAULT_SNAPSHOT_EVERY = 5000
+SNAPSHOT_NAME = "snapshot.json"
+SNAPSHOT_DIR = "snapshot"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+
+# Mutable task fields carried by every task event, with the value an omitted
+# key stands for. Status, retries and the timestamp are always written.
+_TASK_DEFAULTS: Dict[str, Any] = {
+    "p": None,  # progress
+    "sc": None,  # score
+    "th": False,  # throttled
+    "n": None,  # next_run_at
+    "err": None,
+    "le": None,  # last_error
+    "rs": None,  # result_summary_id
+}
+
+
+class EventLogError(Exception):
+    """A segment is damaged somewhere other than its final line."""
+
+
+def get_snapshot_every() -> int:
+    raw = os.getenv("OPT_EVENTLOG_SNAPSHOT_EVERY")
+    if not raw:
+        return DEFAULT_SNAPSHOT_EVERY
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_SNAPSHOT_EVERY
+    return max(1, value)
+
+
+def get_eventlog_fsync() -> bool:
+    return os.getenv("OPT_EVENTLOG_FSYNC", "false").lower() == "true"
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _task_fields(task: OptimizationTask) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {"s": task.status, "r": task.retries, "ts": format_ts(task.updated_at)}
+    values = {
+        "p": task.progress,
+        "sc": task.score,
+        "th": task.throttled,
+        "n": format_ts(task.next_run_at) if task.next_run_at is not None else None,
+        "err": task.error,
+        "le": task.last_error,
+        "rs": task.result_summary_id,
+    }
+    for key, value in values.items():
+        if value != _TASK_DEFAULTS[key]:
+            fields[key] = value
+    return fields
+
+
+def _task_record(task: OptimizationTask, compact: bool) -> Dict[str, Any]:
+    record = {"id": task.id, "k": task.combo_index, "c": format_ts(task.created_at)}
+    if not (compact and task.combo_index is not None):
+        record["params"] = task.params
+    record.update(_task_fields(task))
+    return record
+
+
+def _job_fields(job: OptimizationJob) -> Dict[str, Any]:
+    return {
+        "status": job.status,
+        "total_tasks": job.total_tasks,
+        "estimate": job.estimate,
+        "summary": _summary_to_dict(job.summary),
+        "updated_at": format_ts(job.updated_at),
+        "locked_status": job.locked_status,
+        "stop_reason": job.stop_reason,
+    }
+
+
+def _job_record(job: OptimizationJob) -> Dict[str, Any]:
+    record = {
+        "id": job.id,
+        "owner_id": job.owner_id,
+        "version_id": job.version_id,
+        "param_space": job.param_space,
+        "normalized_space": _space_to_json(job.normalized_space),
+        "concurrency_limit": job.concurrency_limit,
+        "early_stop_policy": _policy_to_dict(job.early_stop_policy),
+        "created_at": format_ts(job.created_at),
+        "source_job_id": job.source_job_id,
+    }
+    record.update(_job_fields(job))
+    return record
+
+
+def _record_to_job(record: Dict[str, Any]) -> OptimizationJob:
+    job = OptimizationJob(
+        id=record["id"],
+        owner_id=record["owner_id"],
+        version_id=record["version_id"],
+        param_space=record.get("param_space") or {},
+        normalized_space=_space_from_json(record.get("normalized_space")),
+        concurrency_limit=record.get("concurrency_limit") or 0,
+        early_stop_policy=_dict_to_policy(record.get("early_stop_policy")),
+        status=record.get("status") or DEFAULT_STATUS,
+        total_tasks=record.get("total_tasks") or 0,
+        estimate=record.get("estimate") or record.get("total_tasks") or 0,
+        locked_status=record.get("locked_status"),
+        stop_reason=record.get("stop_reason"),
+        source_job_id=record.get("source_job_id"),
+    )
+    job.created_at = _to_epoch(record.get("created_at"))
+    job.updated_at = _to_epoch(record.get("updated_at"))
+    job.summary = _dict_to_summary(record.get("summary"), job.total_tasks)
+    return job
+
+
+def _record_to_task(record: Dict[str, Any], job: OptimizationJob) -> OptimizationTask:
+    params = record.get("params")
+    combo_index = record.get("k")
+    if params is None:
+        params = decode_combo_index(job.normalized_space, combo_index) if combo_index is not None else {}
+    return OptimizationTask(
+        id=record["id"],
+        job_id=job.id,
+        owner_id=job.owner_id,
+        version_id=job.version_id,
+        params=params,
+        status=record.get("s") or DEFAULT_STATUS,
+        progress=record.get("p"),
+        retries=record.get("r") or 0,
+        error=record.get("err"),
+        result_summary_id=record.get("rs"),
+        score=record.get("sc"),
+        throttled=bool(record.get("th")),
+        next_run_at=_to_epoch(record.get("n")),
+        last_error=record.get("le"),
+        created_at=_to_epoch(record.get("c") or record.get("ts")),
+        updated_at=_to_epoch(record.get("ts")),
+        combo_index=combo_index,
+    )
+
+
+def _record_key(record: Dict[str, Any]) -> Tuple[float, str]:
+    # Records keep the ISO strings that are on disk; list order compares epochs.
+    updated_at = record.get("updated_at")
+    return (_to_epoch(updated_at) if updated_at else 0.0, record["id"])
+
+
+@timed_methods("persistence.eventlog")
+class EventLogPersistence:
+    """Persistence backend that appends transitions to local segment files.
+
+    Exposes the same surface as ``TaskPersistence``. Writes are synchronous
+    appends (flushed to the OS, fsynced with OPT_EVENTLOG_FSYNC=true), and an
+    event reaches the materialized copy of the records only once its line is
+    written. Snapshots are taken from that copy, so they never need the
+    orchestrator's store lock, and written on a background thread.
+    """
+
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self.path = dsn[len(EVENTLOG_DSN_PREFIX) :] if dsn.lower().startswith(EVENTLOG_DSN_PREFIX) else dsn
+        self.enabled = bool(self.path)
+        self.snapshot_every = get_snapshot_every()
+        self.fsync = get_eventlog_fsync()
+        self._lock = Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, List[Dict[str, Any]]] = {}
+        # task id -> (job id, position); events address tasks by position
+        self._positions: Dict[str, Tuple[str, int]] = {}
+        # jobs changed since the last snapshot; only these are rewritten
+        self._dirty: Set[str] = set()
+        self._segment = 0
+        self._segment_events = 0
+        self._file: Optional[IO[str]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._compaction: Optional[Future] = None
+        if not self.enabled:
+            return
+        os.makedirs(os.path.join(self.path, SNAPSHOT_DIR), exist_ok=True)
+        with self._lock:
+            self._recover()
+            next_segment = self._segment + 1
+            self._open_segment(next_segment)
+            dirty, self._dirty = self._dirty, set()
+        if dirty:
+            # Fold the replayed tail into a snapshot so the next restart is a single read.
+            self._write_snapshot(next_segment, dirty)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eventlog-snapshot")
+
+    # ---- TaskPersistence surface ----
+
+    def persist_job(
+        self,
+        job: OptimizationJob,
+        tasks: List[OptimizationTask],
+        *,
+        on_done: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        if not self.enabled:
+            return None
+        compact = get_task_storage() == "compact" and bool(job.normalized_space)
+        event = {"e": "job", "job": _job_record(job), "tasks": [_task_record(task, compact) for task in tasks]}
+        ok = self._append(event)
+        if on_done:
+            on_done(ok)
+        return None
+
+    def update_task(self, task: OptimizationTask) -> None:
+        if not self.enabled:
+            return
+        position = self._positions.get(task.id)
+        if position is None:
+            return
+        event = {"e": "task", "j": position[0], "i": position[1]}
+        event.update(_task_fields(task))
+        self._append(event)
+
+    def update_job(self, job: OptimizationJob) -> None:
+        if not self.enabled or job.id not in self._jobs:
+            return
+        event = {"e": "jobu", "j": job.id}
+        event.update(_job_fields(job))
+        self._append(event)
+
+    def load_result_summary(self, result_id: str) -> Optional[Dict[str, Any]]:
+        # Not logged: the orchestrator rebuilds optimization summaries from the task.
+        return None
+
+    def save_result_summary(self, summary: Dict[str, Any]) -> None:
+        return None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Appends are synchronous; only a snapshot can be in flight.
+        compaction = self._compaction
+        if compaction is None:
+            return True
+        done, _ = wait([compaction], timeout=timeout)
+        return bool(done)
+
+    def hydrate(self) -> None:
+        if not self.enabled:
+            return
+        _install_hydrated(self.load_jobs(lambda _job_id: True))
+
+    def load_jobs(self, include: Callable[[str], bool]) -> List[Tuple[OptimizationJob, List[OptimizationTask]]]:
+        if not self.enabled:
+            return []
+        with self._lock:
+            loaded = []
+            for job_id, record in self._jobs.items():
+                if not include(job_id):
+                    continue
+                job = _record_to_job(record)
+                tasks = [_record_to_task(task_record, job) for task_record in self._tasks.get(job_id, [])]
+                loaded.append((job, tasks))
+        return loaded
+
+    def load_job(self, job_id: str) -> Optional[Tuple[OptimizationJob, List[OptimizationTask]]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            job = _record_to_job(record)
+            return job, [_record_to_task(task_record, job) for task_record in self._tasks.get(job_id, [])]
+
+    def query_jobs_page(
+        self,
+        owner_id: str,
+        *,
+        before: Optional[Tuple[float, str]],
+        limit: int,
+        statuses: Optional[Collection[str]] = None,
+    ) -> List[OptimizationJob]:
+        if not self.enabled:
+            return []
+        with self._lock:
+            candidates = [
+                record
+                for record in self._jobs.values()
+                if record["owner_id"] == owner_id
+                and (not statuses or record.get("status") in statuses)
+                and (before is None or _record_key(record) < before)
+            ]
+        candidates.sort(key=_record_key, reverse=True)
+        return [_record_to_job(record) for record in candidates[:limit]]
+
+    def reset(self) -> None:
+        if not self.enabled:
+            return
+        self.flush()
+        with self._lock:
+            self._close_segment()
+            for name in os.listdir(self.path):
+                if name == SNAPSHOT_NAME or self._segment_number(name) is not None:
+                    os.remove(os.path.join(self.path, name))
+            snapshot_dir = os.path.join(self.path, SNAPSHOT_DIR)
+            for name in os.listdir(snapshot_dir):
+                os.remove(os.path.join(snapshot_dir, name))
+            self._jobs.clear()
+            self._tasks.clear()
+            self._positions.clear()
+            self._dirty.clear()
+            self._open_segment(1)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._close_segment()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    # ---- log mechanics ----
+
+    def _append(self, event: Dict[str, Any]) -> bool:
+        line = _dumps(event) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open_segment(self._segment + 1)
+                self._file.write(line)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except (OSError, ValueError):
+                emit_metric("eventlog_write_failures_total", 1.0, tags={"path": self.path})
+                # A partial line may be on disk: keep it the last line of its
+                # segment, which replay skips, and leave memory as it was.
+                self._close_segment()
+                return False
+            self._apply(event)
+            self._segment_events += 1
+            if self._segment_events >= self.snapshot_every:
+                self._compact()
+        return True
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        kind = event.get("e")
+        if kind == "task":
+            records = self._tasks.get(event["j"])
+            if records is None or event["i"] >= len(records):
+                return
+            record = records[event["i"]]
+            self._dirty.add(event["j"])
+            for key, default in _TASK_DEFAULTS.items():
+                record[key] = event.get(key, default)
+            record["s"] = event["s"]
+            record["r"] = event["r"]
+            record["ts"] = event["ts"]
+        elif kind == "jobu":
+            record = self._jobs.get(event["j"])
+            if record is not None:
+                self._dirty.add(event["j"])
+                record.update({key: value for key, value in event.items() if key not in ("e", "j")})
+        elif kind == "job":
+            self._load_job(event["job"], event.get("tasks") or [])
+            self._dirty.add(event["job"]["id"])
+
+    def _load_job(self, job_record: Dict[str, Any], task_records: List[Dict[str, Any]]) -> None:
+        job_id = job_record["id"]
+        self._jobs[job_id] = job_record
+        self._tasks[job_id] = task_records
+        for index, record in enumerate(task_records):
+            self._positions[record["id"]] = (job_id, index)
+
+    def _recover(self) -> int:
+        next_segment = 1
+        snapshot_path = os.path.join(self.path, SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as handle:
+                snapshot = json.load(handle)
+            next_segment = int(snapshot.get("nextSegment", 1))
+            for entry in snapshot.get("jobs", []):
+                # Version 1 kept every job inline; move them to per-job records.
+                self._load_job(entry["job"], entry["tasks"])
+                self._dirty.add(entry["job"]["id"])
+        snapshot_dir = os.path.join(self.path, SNAPSHOT_DIR)
+        for name in sorted(os.listdir(snapshot_dir)):
+            if not name.endswith(".json"):
+                # A record staged by a crash mid-snapshot; the segments still cover it.
+                os.remove(os.path.join(snapshot_dir, name))
+                continue
+            with open(os.path.join(snapshot_dir, name), encoding="utf-8") as handle:
+                entry = json.load(handle)
+            self._load_job(entry["job"], entry["tasks"])
+        replayed = 0
+        self._segment = next_segment - 1
+        for number, name in self._segments():
+            path = os.path.join(self.path, name)
+            if number < next_segment:
+                # Already folded into the snapshot; left behind by a crash mid-compaction.
+                os.remove(path)
+                continue
+            with open(path, encoding="utf-8") as handle:
+                lines = handle.readlines()
+            for index, line in enumerate(lines):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    if index < len(lines) - 1:
+                        raise EventLogError(f"{name}: unreadable event on line {index + 1} of {len(lines)}") from None
+                    # A torn final write (crash or failed append); it never reached memory.
+                    emit_metric("eventlog_torn_lines_total", 1.0, tags={"path": self.path})
+                    break
+                self._apply(event)
+                replayed += 1
+            self._segment = max(self._segment, number)
+        return replayed
+
+    def _compact(self) -> None:
+        """Roll to a new segment and snapshot the jobs changed before it in the background."""
+
+        if self._compaction is not None and not self._compaction.done():
+            # The running snapshot is behind by a few segments; the next one catches up.
+            return
+        next_segment = self._segment + 1
+        dirty, self._dirty = self._dirty, set()
+        self._close_segment()
+        self._open_segment(next_segment)
+        assert self._executor is not None
+        self._compaction = self._executor.submit(self._write_snapshot, next_segment, dirty)
+
+    def _copy_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Records are updated in place by _apply, so the snapshot gets copies.
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            return {"job": dict(record), "tasks": [dict(task) for task in self._tasks.get(job_id, [])]}
+
+    def _write_snapshot(self, next_segment: int, job_ids: Iterable[str]) -> None:
+        """Rewrite the records of ``job_ids``, then drop the segments before ``next_segment``.
+
+        Runs without the log lock except to copy one job at a time, so appends
+        keep going; a record may already include events from the newer
+        segments, which replay applies again to the same result.
+        """
+
+        job_ids = set(job_ids)
+        try:
+            for job_id in sorted(job_ids):
+                entry = self._copy_job(job_id)
+                if entry is not None:
+                    self._write_entry(entry)
+            self._replace_file(os.path.join(self.path, SNAPSHOT_NAME), {"version": 2, "nextSegment": next_segment})
+            for number, name in self._segments():
+                if number < next_segment:
+                    os.remove(os.path.join(self.path, name))
+        except OSError:
+            # The segments are still there; the next snapshot retries these jobs.
+            with self._lock:
+                self._dirty |= job_ids
+            emit_metric("eventlog_snapshot_failures_total", 1.0, tags={"path": self.path})
+            raise
+        emit_metric("eventlog_snapshots_total", 1.0, tags={"path": self.path})
+        emit_metric("eventlog_snapshot_jobs", float(len(job_ids)), tags={"path": self.path})
+
+    def _write_entry(self, entry: Dict[str, Any]) -> None:
+        self._replace_file(os.path.join(self.path, SNAPSHOT_DIR, f"{entry['job']['id']}.json"), entry)
+
+    @staticmethod
+    def _replace_file(target: str, payload: Dict[str, Any]) -> None:
+        staging = target + ".tmp"
+        with open(staging, "w", encoding="utf-8") as handle:
+            handle.write(_dumps(payload))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(staging, target)
+
+    def _open_segment(self, number: int) -> None:
+        self._segment = number
+        self._segment_events = 0
+        name = f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+        self._file = open(os.path.join(self.path, name), "a", encoding="utf-8")
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        found = []
+        for name in os.listdir(self.path):
+            number = self._segment_number(name)
+            if number is not None:
+                found.append((number, name))
+        return sorted(found)
+
+    @staticmethod
+    def _segment_number(name: str) -> Optional[int]:
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+            return None
+        try:
+            return int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+        except ValueError:
+            return None
@@ -0,0 +1,141 @@
+"""In-process pub/sub for optimization job revisions.
+
+The orchestrator publishes a monotonically increasing revision per job whenever
+its observable state changes. HTTP handlers subscribe to a job and await the
+next revision instead of polling the status endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from threading import Lock
+from typing import Dict, Optional, Set
+
+
+class JobSubscription:
+    """A single listener bound to one job and one asyncio event loop."""
+
+    def __init__(
+        self,
+        bus: "JobEventBus",
+        job_id: str,
+        revision: int,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.job_id = job_id
+        self._bus = bus
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._latest = revision
+        self._delivered = revision
+        self._last_delivery = 0.0
+        self.closed = False
+
+    @property
+    def revision(self) -> int:
+        return self._latest
+
+    def _notify(self, revision: int) -> None:
+        # May be called from any thread; only the loop touches the asyncio.Event.
+        if revision <= self._latest:
+            return
+        self._latest = revision
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:  # pragma: no cover - loop already closed
+            pass
+
+    def mark_delivered(self, revision: int) -> None:
+        self._delivered = max(self._delivered, revision)
+        self._last_delivery = time.monotonic()
+
+    async def _wait_newer(self, than: int, timeout: float) -> bool:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while self._latest <= than:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._event.clear()
+            if self._latest > than:
+                break
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return self._latest > than
+        return True
+
+    async def next_revision(self, *, timeout: float, interval: float = 0.0) -> Optional[int]:
+        """Wait for a revision newer than the last delivered one.
+
+        Returns None on timeout. Bursts are coalesced: at most one revision is
+        handed out per ``interval`` seconds, always the latest one seen.
+        """
+
+        if not await self._wait_newer(self._delivered, timeout):
+            return None
+        pause = interval - (time.monotonic() - self._last_delivery)
+        if pause > 0:
+            await asyncio.sleep(pause)
+        revision = self._latest
+        self.mark_delivered(revision)
+        return revision
+
+    async def wait_for(self, revision: int, timeout: float) -> bool:
+        """Wait until the job reaches ``revision``; False on timeout."""
+
+        return await self._wait_newer(revision - 1, timeout)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._bus.unsubscribe(self)
+
+
+class JobEventBus:
+    """Fan out job revisions to subscribers across threads and event loops."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._subscribers: Dict[str, Set[JobSubscription]] = {}
+
+    def subscribe(
+        self,
+        job_id: str,
+        revision: int,
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> JobSubscription:
+        subscription = JobSubscription(self, job_id, revision, loop or asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobSubscription) -> None:
+        with self._lock:
+            listeners = self._subscribers.get(subscription.job_id)
+            if not listeners:
+                return
+            listeners.discard(subscription)
+            if not listeners:
+                self._subscribers.pop(subscription.job_id, None)
+
+    def publish(self, job_id: str, revision: int) -> None:
+        listeners = self._subscribers.get(job_id)
+        if not listeners:
+            return
+        with self._lock:
+            targets = list(self._subscribers.get(job_id, ()))
+        for subscription in targets:
+            subscription._notify(revision)
+
+    def subscriber_count(self, job_id: Optional[str] = None) -> int:
+        with self._lock:
+            if job_id is not None:
+                return len(self._subscribers.get(job_id, ()))
+            return sum(len(listeners) for listeners in self._subscribers.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
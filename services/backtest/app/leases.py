@@ -0,0 +1,236 @@
+"""Task leases handed to remote workers over /internal/tasks/*.
+
+A lease wraps a task that the orchestrator moved to ``running``. The worker
+keeps it alive with heartbeats and settles it with complete/fail; a lease that
+is not renewed within its TTL expires (the API expires them on a timer) and
+the task goes back through the normal retry path, so a crashed worker cannot
+strand work. Leases live in memory: after a restart or a shard hand-off the
+orchestrator requeues the running tasks itself and settles of the old leases
+answer 409, which workers treat as a lost lease.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Collection, Dict, Iterable, List, Optional
+
+from . import orchestrator
+from .clock import get_clock
+from .observability import emit_metric
+
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_LEASE_MAX_BATCH = 16
+LEASE_EXPIRED_ERROR = "INTERNAL_ERROR"
+
+
+def get_lease_seconds() -> int:
+    raw = os.getenv("OPT_LEASE_SECONDS")
+    if not raw:
+        return DEFAULT_LEASE_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_LEASE_SECONDS
+    return max(1, value)
+
+
+def get_lease_max_batch() -> int:
+    raw = os.getenv("OPT_LEASE_MAX_BATCH")
+    if not raw:
+        return DEFAULT_LEASE_MAX_BATCH
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_LEASE_MAX_BATCH
+    return max(1, value)
+
+
+class LeaseError(Exception):
+    """Lease is unknown, expired, or held by another worker."""
+
+    def __init__(self, message: str, code: str, status: int, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.details = details or {}
+
+
+@dataclass
+class TaskLease:
+    id: str
+    job_id: str
+    task_id: str
+    owner_id: str
+    worker_id: str
+    ttl_seconds: float
+    expires_at: float
+
+
+def lease_node(lease_id: str) -> Optional[str]:
+    """Replica that granted ``lease_id``, or None for leases of an unsharded replica."""
+
+    node, sep, _ = lease_id.rpartition(".")
+    return node if sep else None
+
+
+class LeaseRegistry:
+    """Outstanding leases of this replica, keyed by lease id.
+
+    With ``node_id`` (the shard id of this replica) lease ids read
+    ``<node_id>.<uuid>``, so any replica can route a settle to the one that
+    holds the lease.
+    """
+
+    def __init__(self, node_id: Optional[str] = None) -> None:
+        self.node_id = node_id
+        self._lock = Lock()
+        self._leases: Dict[str, TaskLease] = {}
+
+    def lease(
+        self,
+        owner_id: str,
+        worker_id: str,
+        *,
+        max_tasks: int = 1,
+        lease_seconds: Optional[float] = None,
+        wait_seconds: Optional[float] = None,
+        prefer_versions: Optional[Collection[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Dequeue up to ``max_tasks`` tasks for ``owner_id`` and lease them to ``worker_id``.
+
+        Blocks up to ``wait_seconds`` for the first task; the rest of the batch
+        is whatever is ready at that point. ``prefer_versions`` is passed on
+        to ``dequeue_next`` for cache affinity.
+        """
+
+        current = get_clock().monotonic() if now is None else now
+        self.expire(current)
+        ttl = float(lease_seconds or get_lease_seconds())
+        granted: List[Dict[str, Any]] = []
+        for _ in range(max(1, min(max_tasks, get_lease_max_batch()))):
+            task = orchestrator.dequeue_next(
+                owner_id,
+                timeout=None if granted else wait_seconds,
+                prefer_versions=prefer_versions,
+            )
+            if task is None:
+                break
+            # the wait for the first task may have taken a while
+            current = get_clock().monotonic() if now is None else now
+            lease = TaskLease(
+                id=f"{self.node_id}.{uuid.uuid4()}" if self.node_id else str(uuid.uuid4()),
+                job_id=task["jobId"],
+                task_id=task["id"],
+                owner_id=owner_id,
+                worker_id=worker_id,
+                ttl_seconds=ttl,
+                expires_at=current + ttl,
+            )
+            with self._lock:
+                self._leases[lease.id] = lease
+            granted.append({"leaseId": lease.id, "leaseSeconds": ttl, "task": task})
+        if granted:
+            emit_metric("task_leases_granted_total", float(len(granted)), tags={"ownerId": owner_id})
+        return granted
+
+    def heartbeat(
+        self,
+        worker_id: str,
+        lease_ids: Iterable[str],
+        *,
+        now: Optional[float] = None,
+    ) -> Dict[str, List[str]]:
+        """Extend the given leases; ones that already expired are reported as lost."""
+
+        current = get_clock().monotonic() if now is None else now
+        self.expire(current)
+        renewed: List[str] = []
+        lost: List[str] = []
+        with self._lock:
+            for lease_id in lease_ids:
+                lease = self._leases.get(lease_id)
+                if lease is None or lease.worker_id != worker_id:
+                    lost.append(lease_id)
+                    continue
+                lease.expires_at = current + lease.ttl_seconds
+                renewed.append(lease_id)
+        return {"renewed": renewed, "lost": lost}
+
+    def complete(
+        self,
+        worker_id: str,
+        lease_id: str,
+        *,
+        score: Optional[float] = None,
+        result_summary_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        lease = self._release(worker_id, lease_id, now)
+        return orchestrator.mark_task_succeeded(
+            lease.job_id,
+            lease.task_id,
+            score=score,
+            result_summary_id=result_summary_id,
+        )
+
+    def fail(
+        self,
+        worker_id: str,
+        lease_id: str,
+        *,
+        error_type: str,
+        message: str,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        lease = self._release(worker_id, lease_id, now)
+        return orchestrator.mark_task_failed(lease.job_id, lease.task_id, error_type=error_type, message=message)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Return expired leases' tasks to the retry path; returns how many expired."""
+
+        current = get_clock().monotonic() if now is None else now
+        with self._lock:
+            expired = [lease for lease in self._leases.values() if lease.expires_at < current]
+            for lease in expired:
+                del self._leases[lease.id]
+        for lease in expired:
+            try:
+                orchestrator.mark_task_failed(
+                    lease.job_id,
+                    lease.task_id,
+                    error_type=LEASE_EXPIRED_ERROR,
+                    message=f"lease expired (worker {lease.worker_id})",
+                )
+            except orchestrator.JobAccessError:
+                # job was archived or forgotten meanwhile
+                continue
+        if expired:
+            emit_metric("task_leases_expired_total", float(len(expired)))
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._leases.clear()
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def _release(self, worker_id: str, lease_id: str, now: Optional[float]) -> TaskLease:
+        self.expire(now)
+        with self._lock:
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                raise LeaseError("lease expired or unknown", "E.LEASE_INVALID", 409, {"leaseId": lease_id})
+            if lease.worker_id != worker_id:
+                raise LeaseError(
+                    "lease held by another worker",
+                    "E.FORBIDDEN",
+                    403,
+                    {"leaseId": lease_id, "workerId": worker_id},
+                )
+            del self._leases[lease_id]
+        return lease
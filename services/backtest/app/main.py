@@ -1,35 +1,258 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Request
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+import httpx
 import structlog
 from datetime import datetime
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Awaitable, Callable, List, Literal, Union
 from pydantic import BaseModel, Field, field_validator
 
 from .observability import (
+    emit_latency_metrics,
+    emit_metric,
+    get_latency_emit_seconds,
+    latency_snapshot,
+    profiling_enabled,
     log_enqueue,
     log_start,
     log_end,
     log_error,
     Timer,
 )
+from .async_orchestrator import AsyncOrchestrator
 from .orchestrator import (
+    COMPACT_LIST_FIELDS,
+    FINISHED_STATUSES,
     JobAccessError,
     ParamInvalidError,
-    cancel_job,
-    create_optimization_job,
-    debug_jobs,
-    get_job_status,
-    get_job_snapshot,
-    export_top_n_bundle,
-    list_jobs,
+    get_events_coalesce_seconds,
+    get_events_heartbeat_seconds,
+    get_shard_router,
+    refresh_shard_membership,
+    uses_db_dispatch,
 )
+from .leases import LeaseError, LeaseRegistry, get_lease_seconds, lease_node
+from .profiler import ProfilerBusyError, sample_stacks, to_collapsed
+from .serialization import FastJSONResponse, PayloadCache, dumps, get_payload_cache_size
+from .sharding import get_shard_lease_ttl_seconds, get_shard_routing
+from .timers import build_timer_store
 
 logger = structlog.get_logger()
-app = FastAPI(title="Backtest Service")
 
-# 简单的内存计时器存储（仅用于最小验证；生产应使用更稳健的作业上下文存储）
-TIMERS: Dict[str, Timer] = {}
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    await _start_shard_heartbeat()
+    _start_lease_expiry()
+    _start_latency_emitter()
+    try:
+        yield
+    finally:
+        _stop_latency_emitter()
+        _stop_lease_expiry()
+        await _stop_shard_heartbeat()
+
+
+app = FastAPI(title="Backtest Service", default_response_class=FastJSONResponse, lifespan=_lifespan)
+
+# 作业计时上下文：TTL + 容量上限；BACKTEST_TIMER_STORE=sqlite:///path 时跨进程共享
+TIMERS = build_timer_store()
+
+# 长轮询等待上限（秒），避免连接被代理层提前断开
+LONG_POLL_MAX_SECONDS = 60.0
+
+# 按作业 revision 缓存已序列化的 status/snapshot 响应体（export 带 generatedAt，不缓存）
+PAYLOAD_CACHE = PayloadCache(get_payload_cache_size())
+
+# 编排器调用（含存储锁与数据库 I/O）统一在有界线程池中执行，避免阻塞事件循环
+ORCHESTRATOR = AsyncOrchestrator()
+
+# 远程 worker 的任务租约；未续约的租约过期后任务按重试策略重新入队
+# 分片模式下租约 ID 带上授予副本的节点 ID，续约/结算请求据此转发
+LEASES = LeaseRegistry(node_id=get_shard_router().self_id if get_shard_router() is not None else None)
+_LEASE_EXPIRY: Optional[asyncio.Task] = None
+
+# 租约长轮询单次阻塞上限（秒）
+LEASE_WAIT_SLICE_SECONDS = 5.0
+
+# 分片模式下转发请求时携带，防止副本之间因成员视图不一致而来回转发
+SHARD_HOP_HEADER = "x-opt-shard-hop"
+SHARD_FORWARD_HEADERS = ("x-owner-id", "x-opt-shared-secret", "content-type")
+SHARD_CLIENT: Optional[httpx.AsyncClient] = None
+_SHARD_HEARTBEAT: Optional[asyncio.Task] = None
+
+# 开启 OBS_PROFILE_ENABLED 时定期把热路径耗时直方图写入指标流
+_LATENCY_EMITTER: Optional[asyncio.Task] = None
+
+
+def _shard_client() -> httpx.AsyncClient:
+    global SHARD_CLIENT
+    if SHARD_CLIENT is None:
+        SHARD_CLIENT = httpx.AsyncClient(timeout=LONG_POLL_MAX_SECONDS + 5.0)
+    return SHARD_CLIENT
+
+
+async def _route_foreign_job(request: Request, job_id: str) -> Optional[Response]:
+    """Redirect or forward a request for a job owned by another replica; None when local."""
+
+    router = get_shard_router()
+    if router is None or router.is_local(job_id) or request.headers.get(SHARD_HOP_HEADER):
+        return None
+    node = router.owner(job_id)
+    # SSE 长连接不做代理，始终重定向到所属副本
+    redirect = get_shard_routing() == "redirect" or request.url.path.endswith("/events")
+    return await _route_to_node(request, node, {"jobId": job_id}, redirect=redirect)
+
+
+async def _route_foreign_lease(request: Request, lease_id: str) -> Optional[Response]:
+    """Forward a lease settle to the replica that granted the lease; None when local."""
+
+    router = get_shard_router()
+    node = lease_node(lease_id)
+    if router is None or not node or node == router.self_id or request.headers.get(SHARD_HOP_HEADER):
+        return None
+    if node not in router.members():
+        # 授予租约的副本已离开，任务已由新的所属副本重新入队
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "E.LEASE_INVALID", "message": "lease expired or unknown", "details": {"leaseId": lease_id}},
+        )
+    # 租约请求始终代理转发：worker 只认一个入口地址
+    return await _route_to_node(request, node, {"leaseId": lease_id}, redirect=False)
+
+
+async def _route_to_node(request: Request, node: str, details: Dict[str, Any], *, redirect: bool) -> Response:
+    router = get_shard_router()
+    base = router.url_for(node)
+    if not base:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "code": "E.SHARD_UNAVAILABLE",
+                "message": "owner replica has no address",
+                "details": {**details, "node": node},
+            },
+        )
+    target = f"{base}{request.url.path}"
+    if request.url.query:
+        target = f"{target}?{request.url.query}"
+    if redirect:
+        return RedirectResponse(target, status_code=307)
+    headers = {key: request.headers[key] for key in SHARD_FORWARD_HEADERS if key in request.headers}
+    headers[SHARD_HOP_HEADER] = router.self_id
+    try:
+        upstream = await _shard_client().request(
+            request.method, target, headers=headers, content=await request.body()
+        )
+    except httpx.HTTPError as exc:
+        raise HTTPException(
+            status_code=502,
+            detail={
+                "code": "E.SHARD_UNAVAILABLE",
+                "message": "failed to reach owner replica",
+                "details": {**details, "node": node},
+            },
+        ) from exc
+    emit_metric("shard_forwarded_total", 1.0, tags={"node": node})
+    return Response(
+        content=upstream.content,
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type"),
+    )
+
+
+async def _shard_heartbeat_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await ORCHESTRATOR.call(refresh_shard_membership):
+                PAYLOAD_CACHE.clear()
+                logger.info("shard_membership_changed", members=sorted(get_shard_router().members()))
+        except Exception as exc:  # pragma: no cover - keep renewing the lease
+            logger.exception("shard_heartbeat_failed", exc_info=exc)
+
+
+async def _lease_expiry_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ORCHESTRATOR.call(LEASES.expire)
+        except Exception as exc:  # pragma: no cover - keep expiring
+            logger.exception("lease_expiry_failed", exc_info=exc)
+
+
+async def _latency_emit_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # 运行时可通过 set_profiling 关闭，关闭后不再输出
+        if profiling_enabled():
+            emit_latency_metrics()
+
+
+def _start_latency_emitter() -> None:
+    global _LATENCY_EMITTER
+    interval = get_latency_emit_seconds()
+    if profiling_enabled() and interval > 0:
+        _LATENCY_EMITTER = asyncio.create_task(_latency_emit_loop(interval))
+
+
+def _stop_latency_emitter() -> None:
+    global _LATENCY_EMITTER
+    if _LATENCY_EMITTER is not None:
+        _LATENCY_EMITTER.cancel()
+        _LATENCY_EMITTER = None
+
+
+def _start_lease_expiry() -> None:
+    global _LEASE_EXPIRY
+    # 定时回收过期租约，不依赖 worker 的下一次调用
+    interval = max(1.0, get_lease_seconds() / 4.0)
+    _LEASE_EXPIRY = asyncio.create_task(_lease_expiry_loop(interval))
+
+
+def _stop_lease_expiry() -> None:
+    if _LEASE_EXPIRY is not None:
+        _LEASE_EXPIRY.cancel()
+
+
+async def _start_shard_heartbeat() -> None:
+    global _SHARD_HEARTBEAT
+    if get_shard_router() is not None:
+        # 续租间隔取 TTL 的三分之一，成员变化时重新加载本副本负责的分片
+        interval = max(1.0, get_shard_lease_ttl_seconds() / 3.0)
+        _SHARD_HEARTBEAT = asyncio.create_task(_shard_heartbeat_loop(interval))
+
+
+async def _stop_shard_heartbeat() -> None:
+    global SHARD_CLIENT
+    if _SHARD_HEARTBEAT is not None:
+        _SHARD_HEARTBEAT.cancel()
+    router = get_shard_router()
+    if router is not None:
+        router.membership.leave()
+    if SHARD_CLIENT is not None:
+        await SHARD_CLIENT.aclose()
+        SHARD_CLIENT = None
+
+
+async def _cached_job_response(
+    kind: str,
+    job_id: str,
+    owner_id: str,
+    build: Callable[[str, str], Awaitable[Dict[str, Any]]],
+) -> FastJSONResponse:
+    if uses_db_dispatch():
+        # 共享派发模式下其他副本也会推进任务，本地 revision 不能作为缓存依据
+        return FastJSONResponse(dumps(await build(job_id, owner_id)))
+    revision = ORCHESTRATOR.get_job_revision(job_id, owner_id)
+    body = PAYLOAD_CACHE.get(kind, job_id, revision)
+    if body is None:
+        body = dumps(await build(job_id, owner_id))
+        PAYLOAD_CACHE.put(kind, job_id, revision, body)
+    return FastJSONResponse(body)
 
 @app.get("/internal/health")
 async def internal_health():
@@ -66,7 +289,7 @@ class StartReq(BaseModel):
 @app.post("/internal/backtest/start")
 async def start(req: StartReq):
     t = log_start(req.jobId, req.ownerId, retry=req.retry)
-    TIMERS[req.jobId] = t
+    await ORCHESTRATOR.call(TIMERS.put, req.jobId, t)
     return {"ok": True}
 
 
@@ -77,7 +300,7 @@ class EndReq(BaseModel):
 
 @app.post("/internal/backtest/end")
 async def end(req: EndReq):
-    t = TIMERS.pop(req.jobId, None)
+    t = await ORCHESTRATOR.call(TIMERS.pop, req.jobId)
     if t is None:
         # 若未显式 start，也记录一个极短持续时间，避免丢失结束日志
         t = Timer()
@@ -143,6 +366,36 @@ def require_internal_secret(secret: Optional[str] = Header(None, alias="x-opt-sh
         )
 
 
+@app.get("/internal/metrics/latency")
+async def internal_latency(_secret: None = Depends(require_internal_secret)):
+    # 热路径耗时直方图（锁等待/持有、调度函数、持久化方法）；需 OBS_PROFILE_ENABLED=true
+    return {"enabled": profiling_enabled(), "histograms": latency_snapshot()}
+
+
+@app.post("/internal/debug/profile")
+async def internal_profile(
+    seconds: float = 5.0,
+    intervalMs: Optional[int] = None,
+    format: Literal["collapsed", "json"] = "collapsed",
+    _secret: None = Depends(require_internal_secret),
+):
+    # 对运行中进程的所有线程做栈采样；同一时间只允许一个采样会话
+    try:
+        result = await ORCHESTRATOR.call_blocking(sample_stacks, seconds, interval_ms=intervalMs)
+    except ProfilerBusyError as exc:
+        raise HTTPException(
+            status_code=exc.status,
+            detail={"code": exc.code, "message": str(exc)},
+        ) from exc
+    if format == "json":
+        return result
+    return Response(
+        content=to_collapsed(result["stacks"]),
+        media_type="text/plain",
+        headers={"x-profile-samples": str(result["samples"])},
+    )
+
+
 @app.post("/internal/optimizations")
 async def optimizations(
     req: OptimizationCreateReq,
@@ -159,7 +412,7 @@ async def optimizations(
             },
         )
     try:
-        payload = create_optimization_job(
+        payload = await ORCHESTRATOR.create_optimization_job(
             owner_id=req.ownerId,
             version_id=req.versionId,
             param_space=req.paramSpace,
@@ -168,7 +421,7 @@ async def optimizations(
             estimate=req.estimate,
             source_job_id=req.sourceJobId,
         )
-        logger.info("optimization_job_created", job=payload, total_jobs=len(debug_jobs()))
+        logger.info("optimization_job_created", job=payload, total_jobs=await ORCHESTRATOR.job_count())
         return payload
     except ParamInvalidError as exc:
         raise HTTPException(
@@ -186,6 +439,10 @@ async def optimizations(
 @app.get("/internal/optimizations")
 async def optimizations_history(
     limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    view: Literal["full", "compact"] = "full",
+    fields: Optional[str] = None,
     _secret: None = Depends(require_internal_secret),
     owner_header: Optional[str] = Header(None, alias="x-owner-id"),
 ):
@@ -195,13 +452,42 @@ async def optimizations_history(
             detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
         )
     safe_limit = max(1, min(limit, 200))
-    jobs = list_jobs(owner_header, limit=safe_limit)
-    return jobs
+    statuses = [item.strip() for item in status.split(",") if item.strip()] if status else None
+    # fields= 优先于 view=；compact 视图跳过 paramSpace、earlyStopPolicy 与 topN
+    projection = [item.strip() for item in fields.split(",") if item.strip()] if fields else None
+    if projection is None and view == "compact":
+        projection = list(COMPACT_LIST_FIELDS)
+    try:
+        jobs, next_cursor = await ORCHESTRATOR.list_jobs_page(
+            owner_header,
+            limit=safe_limit,
+            cursor=cursor,
+            statuses=statuses,
+            fields=projection,
+        )
+    except ParamInvalidError as exc:
+        raise HTTPException(
+            status_code=exc.status,
+            detail={"code": exc.code, "message": str(exc), "details": exc.details},
+        ) from exc
+    timer = Timer()
+    body = dumps(jobs)
+    tags = {"view": "fields" if fields else view}
+    emit_metric("history_serialize_ms", timer.ms(), tags=tags)
+    emit_metric("history_response_bytes", float(len(body)), tags=tags)
+    response = FastJSONResponse(body)
+    # 下一页游标通过响应头返回，保持响应体为数组以兼容现有调用方
+    if next_cursor:
+        response.headers["x-next-cursor"] = next_cursor
+    return response
 
 
 @app.get("/internal/optimizations/{job_id}/status")
 async def optimization_status(
     job_id: str,
+    request: Request,
+    waitForRevision: Optional[int] = None,
+    timeoutSeconds: float = 25.0,
     _secret: None = Depends(require_internal_secret),
     owner_header: Optional[str] = Header(None, alias="x-owner-id"),
 ):
@@ -210,9 +496,19 @@ async def optimization_status(
             status_code=400,
             detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
         )
+    forwarded = await _route_foreign_job(request, job_id)
+    if forwarded is not None:
+        return forwarded
     try:
-        payload = get_job_status(job_id, owner_header)
-        return payload
+        if waitForRevision is not None:
+            # 长轮询：阻塞直到作业 revision 达到 waitForRevision 或超时
+            subscription = await ORCHESTRATOR.subscribe_job_events(job_id, owner_header)
+            try:
+                timeout = max(0.0, min(timeoutSeconds, LONG_POLL_MAX_SECONDS))
+                await subscription.wait_for(waitForRevision, timeout)
+            finally:
+                subscription.close()
+        return await _cached_job_response("status", job_id, owner_header, ORCHESTRATOR.get_job_status)
     except JobAccessError as exc:
         raise HTTPException(
             status_code=exc.status,
@@ -220,9 +516,68 @@ async def optimization_status(
         ) from exc
 
 
+def _sse_event(payload: Dict[str, Any]) -> str:
+    data = dumps(payload).decode("utf-8")
+    return f"id: {payload['revision']}\nevent: status\ndata: {data}\n\n"
+
+
+@app.get("/internal/optimizations/{job_id}/events")
+async def optimization_events(
+    job_id: str,
+    request: Request,
+    _secret: None = Depends(require_internal_secret),
+    owner_header: Optional[str] = Header(None, alias="x-owner-id"),
+):
+    if not owner_header:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
+        )
+    forwarded = await _route_foreign_job(request, job_id)
+    if forwarded is not None:
+        return forwarded
+    try:
+        subscription = await ORCHESTRATOR.subscribe_job_events(job_id, owner_header)
+    except JobAccessError as exc:
+        raise HTTPException(
+            status_code=exc.status,
+            detail={"code": exc.code, "message": str(exc), "details": exc.details},
+        ) from exc
+
+    interval = get_events_coalesce_seconds()
+    heartbeat = get_events_heartbeat_seconds()
+
+    async def stream():
+        try:
+            payload = await ORCHESTRATOR.get_job_status(job_id, owner_header)
+            subscription.mark_delivered(payload["revision"])
+            yield _sse_event(payload)
+            # 作业进入终态后推送最后一次状态并关闭流
+            while payload["status"] not in FINISHED_STATUSES:
+                revision = await subscription.next_revision(timeout=heartbeat, interval=interval)
+                if await request.is_disconnected():
+                    break
+                if revision is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = await ORCHESTRATOR.get_job_status(job_id, owner_header)
+                yield _sse_event(payload)
+        except JobAccessError:
+            return
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/internal/optimizations/{job_id}")
 async def optimization_snapshot(
     job_id: str,
+    request: Request,
     _secret: None = Depends(require_internal_secret),
     owner_header: Optional[str] = Header(None, alias="x-owner-id"),
 ):
@@ -231,9 +586,11 @@ async def optimization_snapshot(
             status_code=400,
             detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
         )
+    forwarded = await _route_foreign_job(request, job_id)
+    if forwarded is not None:
+        return forwarded
     try:
-        payload = get_job_snapshot(job_id, owner_header)
-        return payload
+        return await _cached_job_response("snapshot", job_id, owner_header, ORCHESTRATOR.get_job_snapshot)
     except JobAccessError as exc:
         raise HTTPException(
             status_code=exc.status,
@@ -244,6 +601,7 @@ async def optimization_snapshot(
 @app.post("/internal/optimizations/{job_id}/cancel")
 async def optimization_cancel(
     job_id: str,
+    request: Request,
     req: CancelReq,
     _secret: None = Depends(require_internal_secret),
     owner_header: Optional[str] = Header(None, alias="x-owner-id"),
@@ -253,8 +611,11 @@ async def optimization_cancel(
             status_code=400,
             detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
         )
+    forwarded = await _route_foreign_job(request, job_id)
+    if forwarded is not None:
+        return forwarded
     try:
-        payload = cancel_job(job_id, owner_header, reason=req.reason)
+        payload = await ORCHESTRATOR.cancel_job(job_id, owner_header, reason=req.reason)
         return payload
     except JobAccessError as exc:
         raise HTTPException(
@@ -266,6 +627,7 @@ async def optimization_cancel(
 @app.post("/internal/optimizations/{job_id}/export")
 async def optimization_export(
     job_id: str,
+    request: Request,
     _secret: None = Depends(require_internal_secret),
     owner_header: Optional[str] = Header(None, alias="x-owner-id"),
 ):
@@ -274,11 +636,165 @@ async def optimization_export(
             status_code=400,
             detail={"code": "E.PARAM_INVALID", "message": "x-owner-id header required"},
         )
+    forwarded = await _route_foreign_job(request, job_id)
+    if forwarded is not None:
+        return forwarded
     try:
-        payload = export_top_n_bundle(job_id, owner_header)
-        return payload
+        return await ORCHESTRATOR.export_top_n_bundle(job_id, owner_header)
     except JobAccessError as exc:
         raise HTTPException(
             status_code=exc.status,
             detail={"code": exc.code, "message": str(exc), "details": exc.details},
         ) from exc
+
+
+# ==== Remote Worker Protocol (Internal) ====
+
+class TaskLeaseReq(BaseModel):
+    workerId: str = Field(..., min_length=1)
+    ownerId: str = Field(..., min_length=1)
+    maxTasks: int = Field(1, ge=1)
+    waitSeconds: float = Field(20.0, ge=0)
+    leaseSeconds: Optional[float] = Field(None, gt=0)
+    # 工作节点已加载（缓存命中）的策略版本，优先派发这些版本的任务
+    preferVersions: List[str] = Field(default_factory=list)
+
+
+class TaskHeartbeatReq(BaseModel):
+    workerId: str = Field(..., min_length=1)
+    leaseIds: List[str] = Field(default_factory=list)
+
+
+class TaskCompleteReq(BaseModel):
+    workerId: str = Field(..., min_length=1)
+    leaseId: str = Field(..., min_length=1)
+    score: Optional[float] = None
+    resultSummaryId: Optional[str] = None
+
+
+class TaskFailReq(BaseModel):
+    workerId: str = Field(..., min_length=1)
+    leaseId: str = Field(..., min_length=1)
+    code: Literal["PARAM_ERROR", "UPSTREAM_ERROR", "INTERNAL_ERROR"] = "INTERNAL_ERROR"
+    message: str = ""
+
+
+def _lease_http_error(exc: Union[LeaseError, JobAccessError]) -> HTTPException:
+    return HTTPException(
+        status_code=exc.status,
+        detail={"code": exc.code, "message": str(exc), "details": exc.details},
+    )
+
+
+@app.post("/internal/tasks/lease")
+async def task_lease(
+    req: TaskLeaseReq,
+    request: Request,
+    _secret: None = Depends(require_internal_secret),
+    owner_header: Optional[str] = Header(None, alias="x-owner-id"),
+):
+    if owner_header and owner_header != req.ownerId:
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "code": "E.FORBIDDEN",
+                "message": "owner mismatch",
+                "details": {"ownerId": req.ownerId, "header": owner_header},
+            },
+        )
+    # 长轮询：在编排器条件变量上阻塞等待任务就绪，按时间片返回以便检查客户端是否断开
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(req.waitSeconds, LONG_POLL_MAX_SECONDS)
+    while True:
+        remaining = max(deadline - loop.time(), 0.0)
+        leases = await ORCHESTRATOR.call_blocking(
+            LEASES.lease,
+            req.ownerId,
+            req.workerId,
+            max_tasks=req.maxTasks,
+            lease_seconds=req.leaseSeconds,
+            wait_seconds=min(remaining, LEASE_WAIT_SLICE_SECONDS),
+            prefer_versions=set(req.preferVersions),
+        )
+        if leases or deadline - loop.time() <= 0 or await request.is_disconnected():
+            return {"leases": leases}
+
+
+@app.post("/internal/tasks/heartbeat")
+async def task_heartbeat(
+    req: TaskHeartbeatReq,
+    request: Request,
+    _secret: None = Depends(require_internal_secret),
+):
+    router = get_shard_router()
+    local: List[str] = []
+    foreign: Dict[str, List[str]] = {}
+    for lease_id in req.leaseIds:
+        node = lease_node(lease_id)
+        if router is None or not node or node == router.self_id or request.headers.get(SHARD_HOP_HEADER):
+            local.append(lease_id)
+        else:
+            foreign.setdefault(node, []).append(lease_id)
+    result = await ORCHESTRATOR.call(LEASES.heartbeat, req.workerId, local)
+    # 其他副本授予的租约按副本分组转发续约；副本不可达时视为租约丢失
+    for node, lease_ids in foreign.items():
+        base = router.url_for(node) if node in router.members() else None
+        try:
+            if not base:
+                raise httpx.HTTPError(f"no address for replica {node}")
+            headers = {key: request.headers[key] for key in SHARD_FORWARD_HEADERS if key in request.headers}
+            headers[SHARD_HOP_HEADER] = router.self_id
+            upstream = await _shard_client().post(
+                f"{base}{request.url.path}",
+                headers=headers,
+                json={"workerId": req.workerId, "leaseIds": lease_ids},
+            )
+            upstream.raise_for_status()
+            forwarded = upstream.json()
+        except (httpx.HTTPError, ValueError):
+            forwarded = {"renewed": [], "lost": lease_ids}
+        result["renewed"].extend(forwarded["renewed"])
+        result["lost"].extend(forwarded["lost"])
+    return result
+
+
+@app.post("/internal/tasks/complete")
+async def task_complete(
+    req: TaskCompleteReq,
+    request: Request,
+    _secret: None = Depends(require_internal_secret),
+):
+    routed = await _route_foreign_lease(request, req.leaseId)
+    if routed is not None:
+        return routed
+    try:
+        return await ORCHESTRATOR.call(
+            LEASES.complete,
+            req.workerId,
+            req.leaseId,
+            score=req.score,
+            result_summary_id=req.resultSummaryId,
+        )
+    except (LeaseError, JobAccessError) as exc:
+        raise _lease_http_error(exc) from exc
+
+
+@app.post("/internal/tasks/fail")
+async def task_fail(
+    req: TaskFailReq,
+    request: Request,
+    _secret: None = Depends(require_internal_secret),
+):
+    routed = await _route_foreign_lease(request, req.leaseId)
+    if routed is not None:
+        return routed
+    try:
+        return await ORCHESTRATOR.call(
+            LEASES.fail,
+            req.workerId,
+            req.leaseId,
+            error_type=req.code,
+            message=req.message[:200],
+        )
+    except (LeaseError, JobAccessError) as exc:
+        raise _lease_http_error(exc) from exc
@@ -0,0 +1,274 @@
+"""Memory-mapped columnar OHLCV store for backtest runners.
+
+A store is a directory with one flat file per column (``ts`` and ``volume``
+int64, ``open``/``high``/``low``/``close`` float64) holding every symbol's
+rows back to back, each symbol sorted by timestamp, plus ``index.json``
+mapping symbol -> (offset, length). Columns are opened read-only with
+``numpy.memmap``, so ``bars()`` hands out zero-copy views and worker
+processes on one host share the same page cache. Rows of a date range are
+found by binary search on the symbol's slice of the ``ts`` column.
+
+The store path is a symlink to a versioned directory next to it
+(``.<name>.v-*``); a rewrite builds a new version and swaps the link
+atomically, so the path always resolves to a complete store.
+
+Needs numpy, which is optional for the rest of the service (the
+``marketdata`` extra). Build a store with ``write_store`` or ``import_csv``;
+workers call ``open_store()`` once (OPT_MARKETDATA_PATH) and keep it,
+typically from a ``WarmRunner`` loader.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import date, datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+INDEX_NAME = "index.json"
+STORE_FORMAT = 1
+# column -> dtype, in file order; "ts" is epoch seconds (UTC)
+COLUMNS: Dict[str, str] = {
+    "ts": "<i8",
+    "open": "<f8",
+    "high": "<f8",
+    "low": "<f8",
+    "close": "<f8",
+    "volume": "<i8",
+}
+COLUMN_SUFFIX = ".col"
+
+Timestamp = Union[int, float, str, date, datetime]
+
+_STORES: Dict[str, "ColumnarStore"] = {}
+_STORES_LOCK = Lock()
+
+
+class MarketDataError(Exception):
+    """Store missing, malformed or asked for an unknown symbol."""
+
+
+class Bars(NamedTuple):
+    """One symbol's rows as read-only views into the store's columns."""
+
+    ts: Any
+    open: Any
+    high: Any
+    low: Any
+    close: Any
+    volume: Any
+
+
+def get_marketdata_path() -> Optional[str]:
+    return os.getenv("OPT_MARKETDATA_PATH") or None
+
+
+def to_epoch_seconds(value: Timestamp) -> int:
+    """Epoch seconds for an int/float, ISO date or datetime string, date or datetime.
+
+    Naive datetimes and dates are taken as UTC.
+    """
+
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise MarketDataError("numpy is required for the columnar market data store")
+
+
+class ColumnarStore:
+    """Read-only view of a store directory; safe to share between threads."""
+
+    def __init__(self, path: str) -> None:
+        _require_numpy()
+        self.path = path
+        # Resolve the version once so the index and columns come from the same write.
+        self._root = os.path.realpath(path)
+        try:
+            with open(os.path.join(self._root, INDEX_NAME), "r", encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise MarketDataError(f"cannot read market data index in {path}") from exc
+        if index.get("format") != STORE_FORMAT:
+            raise MarketDataError(f"unsupported market data format {index.get('format')!r}")
+        self.rows = int(index["rows"])
+        self._symbols: Dict[str, Tuple[int, int]] = {
+            symbol: (int(offset), int(length)) for symbol, (offset, length) in index["symbols"].items()
+        }
+        self._columns = {name: self._map(name, dtype) for name, dtype in COLUMNS.items()}
+
+    def _map(self, name: str, dtype: str) -> Any:
+        if not self.rows:
+            # mmap cannot map an empty file
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self._root, name + COLUMN_SUFFIX), dtype=dtype, mode="r", shape=(self.rows,))
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._symbols
+
+    def row_range(
+        self,
+        symbol: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> Tuple[int, int]:
+        """Absolute ``[first, last)`` rows of ``symbol`` with ``start <= ts <= end``."""
+
+        try:
+            offset, length = self._symbols[symbol]
+        except KeyError:
+            raise MarketDataError(f"unknown symbol {symbol!r}") from None
+        ts = self._columns["ts"][offset : offset + length]
+        first = int(ts.searchsorted(to_epoch_seconds(start), side="left")) if start is not None else 0
+        last = int(ts.searchsorted(to_epoch_seconds(end), side="right")) if end is not None else length
+        return offset + first, offset + max(first, last)
+
+    def bars(
+        self,
+        symbol: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> Bars:
+        """Zero-copy, read-only column views for ``symbol`` between ``start`` and ``end``."""
+
+        first, last = self.row_range(symbol, start, end)
+        return Bars(*(self._columns[name][first:last] for name in COLUMNS))
+
+    def close(self) -> None:
+        # Views already handed out keep their mapping alive until released.
+        self._columns = {}
+
+
+def open_store(path: Optional[str] = None) -> ColumnarStore:
+    """Open ``path`` (default OPT_MARKETDATA_PATH) once per process and reuse it."""
+
+    resolved = path or get_marketdata_path()
+    if not resolved:
+        raise MarketDataError("no market data path given and OPT_MARKETDATA_PATH is not set")
+    resolved = os.path.abspath(resolved)
+    with _STORES_LOCK:
+        store = _STORES.get(resolved)
+        if store is None:
+            store = _STORES[resolved] = ColumnarStore(resolved)
+        return store
+
+
+def close_stores() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+def write_store(path: str, data: Mapping[str, Mapping[str, Sequence[Any]]]) -> None:
+    """Write ``{symbol: {column: values}}`` as a store at ``path``, replacing it.
+
+    Every symbol needs all of COLUMNS with equal lengths; ``ts`` values may be
+    anything ``to_epoch_seconds`` accepts. Rows are sorted by ``ts``. The
+    store is built as a new version directory next to ``path`` and the
+    ``path`` symlink is replaced atomically, so readers never see a missing
+    or half-written store. The previous version is kept for readers still
+    opening it; older ones are removed.
+    """
+
+    _require_numpy()
+    symbols: Dict[str, List[int]] = {}
+    chunks: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+    offset = 0
+    for symbol, columns in data.items():
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise MarketDataError(f"{symbol}: missing columns {missing}")
+        ts = np.asarray([to_epoch_seconds(value) for value in columns["ts"]], dtype=COLUMNS["ts"])
+        arrays = {"ts": ts}
+        for name in COLUMNS:
+            if name != "ts":
+                arrays[name] = np.asarray(columns[name], dtype=COLUMNS[name])
+                if len(arrays[name]) != len(ts):
+                    raise MarketDataError(f"{symbol}: column {name} has {len(arrays[name])} rows, ts has {len(ts)}")
+        order = np.argsort(ts, kind="stable")
+        for name, values in arrays.items():
+            chunks[name].append(values[order])
+        symbols[symbol] = [offset, len(ts)]
+        offset += len(ts)
+
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    prefix = f".{os.path.basename(path)}.v-"
+    version = tempfile.mkdtemp(prefix=prefix, dir=parent)
+    try:
+        for name, dtype in COLUMNS.items():
+            values = np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype=dtype)
+            values.astype(dtype, copy=False).tofile(os.path.join(version, name + COLUMN_SUFFIX))
+        with open(os.path.join(version, INDEX_NAME), "w", encoding="utf-8") as handle:
+            json.dump({"format": STORE_FORMAT, "rows": offset, "symbols": symbols}, handle)
+        previous = _swap_version(path, version, prefix)
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+    keep = {os.path.basename(version), os.path.basename(previous or "")}
+    for entry in os.listdir(parent):
+        if entry.startswith(prefix) and entry not in keep:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def _swap_version(path: str, version: str, prefix: str) -> Optional[str]:
+    """Point the ``path`` symlink at ``version``; returns the version it replaced."""
+
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    if previous is None and os.path.isdir(path):
+        # A store written before versioning: moved aside once, not atomically.
+        previous = os.path.join(os.path.dirname(path), prefix + uuid.uuid4().hex)
+        os.rename(path, previous)
+    link = version + ".link"
+    os.symlink(os.path.basename(version), link)
+    try:
+        os.replace(link, path)
+    except BaseException:
+        os.unlink(link)
+        raise
+    return previous
+
+
+def read_csv(path: str) -> Dict[str, List[Any]]:
+    """Columns of one symbol's CSV (header ``date,open,high,low,close,volume``)."""
+
+    columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            columns["ts"].append(row.get("date") or row["ts"])
+            for name in ("open", "high", "low", "close"):
+                columns[name].append(float(row[name]))
+            columns["volume"].append(int(float(row["volume"])))
+    return columns
+
+
+def import_csv(path: str, csv_files: Iterable[str]) -> None:
+    """Build a store from per-symbol CSV files named ``<SYMBOL>.csv``."""
+
+    data = {os.path.splitext(os.path.basename(name))[0]: read_csv(name) for name in csv_files}
+    write_store(path, data)
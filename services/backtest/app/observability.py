@@ -7,11 +7,17 @@ Minimal structured logging helpers for workers.
 """
 from __future__ import annotations
 
+import bisect
+import functools
+import inspect
 import json
 import os
 import sys
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .clock import get_clock
 
 COMPONENT = os.getenv("WORKER_COMPONENT", "backtest-worker")
 
@@ -87,11 +93,15 @@ def log(
 
 
 class Timer:
-    def __init__(self):
-        self._start = time.perf_counter()
+    def __init__(self, started_at: Optional[float] = None):
+        # started_at is a wall-clock epoch so a timer can be rebuilt in another process
+        clock = get_clock()
+        now = clock.time()
+        self.started_at = now if started_at is None else started_at
+        self._start = clock.monotonic() - max(now - self.started_at, 0.0)
 
     def ms(self) -> float:
-        return (time.perf_counter() - self._start) * 1000.0
+        return (get_clock().monotonic() - self._start) * 1000.0
 
 
 # Convenience wrappers
@@ -175,3 +185,219 @@ def emit_metric(
         except Exception:
             payload["tags"] = {"note": "unserializable_tags"}
     _write(payload)
+
+
+# ==== Hot-path instrumentation (opt-in: OBS_PROFILE_ENABLED=true) ====
+
+# Upper bounds in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0,
+)
+
+_PROFILING = os.getenv("OBS_PROFILE_ENABLED", "false").lower() == "true"
+
+DEFAULT_LATENCY_EMIT_SECONDS = 60.0
+
+
+def profiling_enabled() -> bool:
+    return _PROFILING
+
+
+def get_latency_emit_seconds() -> float:
+    """Interval at which the service emits latency summaries; 0 disables it."""
+
+    raw = os.getenv("OBS_LATENCY_EMIT_SECONDS")
+    if not raw:
+        return DEFAULT_LATENCY_EMIT_SECONDS
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_LATENCY_EMIT_SECONDS
+    return max(0.0, value)
+
+
+def set_profiling(enabled: bool) -> None:
+    """Toggle function timers at runtime (locks are only wrapped if enabled at import)."""
+
+    global _PROFILING
+    _PROFILING = bool(enabled)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; quantiles are bucket upper bounds, capped at the max seen."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(LATENCY_BUCKETS_MS[index], self.max_ms) if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": float(self.count),
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+_HISTOGRAMS: Dict[str, LatencyHistogram] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def observe_latency(name: str, ms: float) -> None:
+    histogram = _HISTOGRAMS.get(name)
+    if histogram is None:
+        with _HISTOGRAMS_LOCK:
+            histogram = _HISTOGRAMS.setdefault(name, LatencyHistogram())
+    # Updates race benignly across threads; counts are diagnostic, not billing.
+    histogram.observe(ms)
+
+
+def latency_snapshot() -> Dict[str, Dict[str, float]]:
+    with _HISTOGRAMS_LOCK:
+        items = list(_HISTOGRAMS.items())
+    return {name: histogram.snapshot() for name, histogram in sorted(items)}
+
+
+def reset_latency() -> None:
+    with _HISTOGRAMS_LOCK:
+        _HISTOGRAMS.clear()
+
+
+def emit_latency_metrics() -> None:
+    """Emit each histogram's summary through emit_metric as ``latency_ms`` (tags op/stat)."""
+
+    for name, stats in latency_snapshot().items():
+        for stat, value in stats.items():
+            emit_metric("latency_ms", value, tags={"op": name, "stat": stat})
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Record the wrapped function's latency under ``name`` while profiling is enabled."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _PROFILING:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe_latency(name, (time.perf_counter() - started) * 1000.0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def timed_methods(prefix: str) -> Callable[[type], type]:
+    """Class decorator applying ``timed(f"{prefix}.{method}")`` to every public method."""
+
+    def decorate(cls: type) -> type:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value):
+                continue
+            setattr(cls, attr, timed(f"{prefix}.{attr}")(value))
+        return cls
+
+    return decorate
+
+
+class InstrumentedLock:
+    """RLock wrapper recording acquisition wait and outermost hold time.
+
+    Implements the private hooks ``threading.Condition`` uses, so a condition
+    built on it releases every recursion level while waiting.
+    """
+
+    def __init__(self, name: str, lock: Optional[Any] = None) -> None:
+        self.name = name
+        self._lock = lock if lock is not None else threading.RLock()
+        self._local = threading.local()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if not _PROFILING:
+            acquired = self._lock.acquire(blocking, timeout)
+            if acquired:
+                self._local.depth = getattr(self._local, "depth", 0) + 1
+            return acquired
+        started = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            now = time.perf_counter()
+            depth = getattr(self._local, "depth", 0)
+            if depth == 0:
+                observe_latency(f"{self.name}.wait", (now - started) * 1000.0)
+                self._local.held_since = now
+            self._local.depth = depth + 1
+        return acquired
+
+    def release(self) -> None:
+        depth = self._local.depth - 1
+        self._local.depth = depth
+        if depth == 0:
+            self._observe_hold()
+        self._lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def _observe_hold(self) -> None:
+        held_since = getattr(self._local, "held_since", None)
+        if _PROFILING and held_since is not None:
+            observe_latency(f"{self.name}.hold", (time.perf_counter() - held_since) * 1000.0)
+        self._local.held_since = None
+
+    # threading.Condition hooks
+    def _is_owned(self) -> bool:
+        return self._lock._is_owned()
+
+    def _release_save(self) -> Any:
+        depth = self._local.depth
+        self._local.depth = 0
+        self._observe_hold()
+        return self._lock._release_save(), depth
+
+    def _acquire_restore(self, state: Any) -> None:
+        inner, depth = state
+        started = time.perf_counter()
+        self._lock._acquire_restore(inner)
+        now = time.perf_counter()
+        if _PROFILING:
+            observe_latency(f"{self.name}.wait", (now - started) * 1000.0)
+            self._local.held_since = now
+        self._local.depth = depth
+
+
+def instrument_lock(name: str, lock: Any) -> Any:
+    """Wrap ``lock`` when profiling is enabled at import time; otherwise return it as-is."""
+
+    return InstrumentedLock(name, lock) if _PROFILING else lock
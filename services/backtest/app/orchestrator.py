@@ -2,13 +2,37 @@
 
 from __future__ import annotations
 
+import base64
+import bisect
+import copy
 import itertools
+import json
 import os
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from collections import OrderedDict, deque
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timedelta
-from threading import RLock
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from threading import Condition, Lock, RLock, local
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 try:
     from sqlalchemy import (
@@ -17,6 +41,7 @@ try:
         Integer,
         Float,
         Boolean,
+        Index,
         JSON,
         MetaData,
         String,
@@ -26,6 +51,12 @@ try:
         delete,
         select,
         update,
+        and_,
+        bindparam,
+        event,
+        inspect,
+        or_,
+        text,
     )
     from sqlalchemy.dialects.postgresql import JSONB
     from sqlalchemy.engine import Engine
@@ -34,8 +65,23 @@ except Exception:  # pragma: no cover - optional dependency
     create_engine = None
     Engine = None
     Boolean = Column = DateTime = Integer = JSON = MetaData = String = Table = insert = select = update = delete = Float = None
-
-from .observability import emit_metric, log_stop
+    Index = and_ = or_ = bindparam = event = inspect = text = None
+
+from .clock import get_clock
+from .events import JobEventBus, JobSubscription
+from .observability import (
+    emit_metric,
+    instrument_lock,
+    log_stop,
+    observe_latency,
+    profiling_enabled,
+    timed,
+    timed_methods,
+)
+from .sharding import HashRing, ShardRouter, build_shard_router, get_shard_lease_ttl_seconds
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle, loaded lazily at runtime
+    from .eventlog import EventLogPersistence
 
 JobStatus = str
 DEFAULT_STATUS: JobStatus = "queued"
@@ -46,11 +92,50 @@ MAX_TASK_CAP = 1000
 DEFAULT_TOP_N = 5
 DEFAULT_MAX_RETRIES = 5
 DEFAULT_RETRY_BASE_SECONDS = 2
+DEFAULT_EVENTS_COALESCE_MS = 250
+DEFAULT_EVENTS_HEARTBEAT_SECONDS = 15
+DEFAULT_DB_POOL_SIZE = 5
+DEFAULT_DB_MAX_OVERFLOW = 10
+DEFAULT_DB_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_DB_BULK_CHUNK = 500
+# ids per IN (...) when loading jobs; SQLite's default bind limit is 999
+LOAD_CHUNK = 500
+# other replicas do not signal this process, so shared-dispatch waiters re-poll
+DB_DISPATCH_POLL_SECONDS = 0.5
+DEFAULT_RETAIN_TERMINAL_PER_OWNER = 100
+DEFAULT_RETAIN_TERMINAL_MAX_AGE_SECONDS = 3600
+DEFAULT_RETAIN_SWEEP_SECONDS = 30
+DEFAULT_RESULT_CACHE_SIZE = 4096
+TASK_STORAGE_MODES = ("json", "compact")
+EVENTLOG_DSN_PREFIX = "eventlog://"
+DISPATCH_MODES = ("memory", "db")
+# jobs in these states hand out no more work, whatever their counters say
+_CLAIM_BLOCKED_STATUSES = ("canceled", "early-stopped")
 FINISHED_STATUSES = {"succeeded", "failed", "early-stopped", "canceled"}
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_now() -> float:
+    """Clock time in epoch seconds, at the microsecond precision of the ISO form."""
+
+    return round(get_clock().time(), 6)
+
+
+def format_ts(ts: float) -> str:
+    return (_EPOCH + timedelta(seconds=ts)).isoformat()
+
+
+@lru_cache(maxsize=1024)
+def parse_ts(value: str) -> float:
+    """Inverse of format_ts; cached because a job's tasks share one createdAt."""
+
+    return (datetime.fromisoformat(value).replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
 def iso_now() -> str:
-    return datetime.utcnow().isoformat()
+    return format_ts(epoch_now())
 
 
 class ParamInvalidError(Exception):
@@ -95,10 +180,85 @@ class OptimizationTask:
     result_summary_id: Optional[str] = None
     score: Optional[float] = None
     throttled: bool = False
-    next_run_at: datetime = field(default_factory=datetime.utcnow)
+    # timestamps are epoch seconds; ISO strings are produced only when serializing
+    next_run_at: float = field(default_factory=epoch_now)
     last_error: Optional[Dict[str, Any]] = None
-    created_at: str = field(default_factory=iso_now)
-    updated_at: str = field(default_factory=iso_now)
+    created_at: float = field(default_factory=epoch_now)
+    updated_at: float = field(default_factory=epoch_now)
+    combo_index: Optional[int] = None  # position in expand_param_space order
+
+
+class TaskHandle(Mapping):
+    """Snapshot of a task handed between the orchestrator and in-process workers.
+
+    Copies the task's fields into slots while the store lock is held, with no
+    dict building or timestamp formatting. It reads like the task dict
+    (``handle["params"]``), formatting timestamps only for the keys asked for;
+    ``to_dict()`` builds the full payload at HTTP boundaries.
+    """
+
+    __slots__ = (
+        "id",
+        "job_id",
+        "owner_id",
+        "version_id",
+        "params",
+        "status",
+        "progress",
+        "retries",
+        "error",
+        "result_summary_id",
+        "score",
+        "throttled",
+        "next_run_at",
+        "last_error",
+        "created_at",
+        "updated_at",
+    )
+
+    # payload key -> (slot, format as timestamp)
+    _KEYS: Dict[str, Tuple[str, bool]] = {
+        "id": ("id", False),
+        "jobId": ("job_id", False),
+        "ownerId": ("owner_id", False),
+        "versionId": ("version_id", False),
+        "params": ("params", False),
+        "status": ("status", False),
+        "progress": ("progress", False),
+        "retries": ("retries", False),
+        "error": ("error", False),
+        "resultSummaryId": ("result_summary_id", False),
+        "score": ("score", False),
+        "throttled": ("throttled", False),
+        "nextRunAt": ("next_run_at", True),
+        "lastError": ("last_error", False),
+        "createdAt": ("created_at", True),
+        "updatedAt": ("updated_at", True),
+    }
+
+    def __init__(self, task: OptimizationTask) -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(task, name))
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            name, is_ts = self._KEYS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        value = getattr(self, name)
+        return format_ts(value) if is_ts else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"TaskHandle(id={self.id!r}, job_id={self.job_id!r}, status={self.status!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self._KEYS}
 
 
 @dataclass
@@ -123,19 +283,134 @@ class OptimizationJob:
     total_tasks: int = 0
     estimate: int = 0
     summary: OptimizationSummary = field(default_factory=lambda: OptimizationSummary(0, 0, 0, 0))
-    created_at: str = field(default_factory=iso_now)
-    updated_at: str = field(default_factory=iso_now)
+    created_at: float = field(default_factory=epoch_now)
+    updated_at: float = field(default_factory=epoch_now)
     locked_status: Optional[JobStatus] = None
     stop_reason: Optional[Dict[str, Any]] = None
     source_job_id: Optional[str] = None
+    revision: int = 0
+    persist_state: Optional[str] = None  # "pending" | "durable" | "failed"; None without persistence
+    archived: bool = False  # terminal job reduced to its header; tasks live only in persistence
+
+
+class ResultSummaryCache:
+    """LRU of result summaries keyed by result_summary_id.
+
+    Guarded by _STORE_LOCK like the rest of the store. The bound is read from
+    OPT_RESULT_CACHE_SIZE on every insert; evicted entries are reloaded from
+    persistence (or rebuilt from the task) on the next lookup.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        summary = self._entries.get(result_id)
+        if summary is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(result_id)
+        self.hits += 1
+        return summary
+
+    def put(self, result_id: str, summary: Dict[str, Any]) -> None:
+        self._entries[result_id] = summary
+        self._entries.move_to_end(result_id)
+        limit = get_result_cache_size()
+        while len(self._entries) > limit:
+            self._entries.popitem(last=False)
+
+    def pop(self, result_id: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self._entries.pop(result_id, default)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, result_id: object) -> bool:
+        return result_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 _JOBS: Dict[str, OptimizationJob] = {}
 _TASKS: Dict[str, Dict[str, OptimizationTask]] = {}
 _TASK_ORDER: Dict[str, List[str]] = {}
 _JOB_ORDER: List[str] = []
-_RESULT_SUMMARIES: Dict[str, Dict[str, Any]] = {}
-_STORE_LOCK = RLock()
+_RESULT_SUMMARIES = ResultSummaryCache()
+# owner -> ascending [(updated_at, job_id)], kept sorted for keyset pagination
+_OWNER_INDEX: Dict[str, List[Tuple[float, str]]] = {}
+_INDEX_KEYS: Dict[str, Tuple[float, str]] = {}
+# owners with jobs persisted but not resident in memory; history falls back to the DB
+_PARTIAL_OWNERS: Set[str] = set()
+# writes made while a job's rows are still being inserted, replayed once durable
+_PERSIST_DIRTY: Dict[str, Set[str]] = {}
+_PERSIST_JOB_DIRTY: Set[str] = set()
+# job id -> epoch until which a job in shard hand-off is not dispatched
+_HANDOFF_FENCE: Dict[str, float] = {}
+_LAST_RETENTION_SWEEP = 0.0
+_STORE_LOCK = instrument_lock("orchestrator.store_lock", RLock())
+# signalled when a task may have become ready: job creation, task completion
+# (which also activates throttled slots) and re-hydration; backoff expiry is
+# covered by waiters bounding their wait at the earliest next_run_at
+_WORK_READY = Condition(_STORE_LOCK)
+# Persistence writes are snapshotted under the store lock and applied, in
+# queue order, once the outermost store section has released it, so slow
+# database I/O never holds up readers of the store.
+_WRITE_QUEUE: "deque[Tuple[Callable[..., Any], Tuple[Any, ...]]]" = deque()
+_WRITE_LOCK = Lock()
+_SECTION = local()
+
+
+class _StoreSection:
+    """``with _STORE_SECTION:`` holds the store lock and then drains queued writes."""
+
+    def __enter__(self) -> None:
+        _STORE_LOCK.acquire()
+        _SECTION.depth = getattr(_SECTION, "depth", 0) + 1
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _SECTION.depth -= 1
+        _STORE_LOCK.release()
+        if not _SECTION.depth and getattr(_SECTION, "queued", False):
+            _SECTION.queued = False
+            _drain_writes()
+
+
+_STORE_SECTION = _StoreSection()
+
+
+def _queue_write(write: Callable[..., Any], *args: Any) -> None:
+    _WRITE_QUEUE.append((write, args))
+    _SECTION.queued = True
+
+
+def _drain_writes() -> None:
+    """Apply queued writes in order, including ones other threads queued before."""
+
+    with _WRITE_LOCK:
+        while _WRITE_QUEUE:
+            write, args = _WRITE_QUEUE.popleft()
+            write(*args)
+
+
+def _task_snapshot(task: OptimizationTask) -> OptimizationTask:
+    return copy.copy(task)
+
+
+def _job_snapshot(job: OptimizationJob) -> OptimizationJob:
+    snapshot = copy.copy(job)
+    snapshot.summary = copy.copy(job.summary)
+    return snapshot
+
+_EVENTS = JobEventBus()
+# revisions come from one process-wide sequence so a (job, revision) pair is
+# never reused, even across debug resets and re-hydration
+_REVISION_SEQ = itertools.count(1)
 
 if JSON is not None:
     try:  # pragma: no cover - variant not available on all platforms
@@ -156,6 +431,7 @@ if JSON_TYPE is not None:
         Column("owner_id", String, nullable=False),
         Column("strategy_version_id", String, nullable=False),
         Column("param_space", JSON_TYPE, nullable=False),
+        Column("normalized_space", JSON_TYPE),
         Column("concurrency_limit", Integer, nullable=False),
         Column("early_stop_policy", JSON_TYPE),
         Column("status", String, nullable=False),
@@ -165,6 +441,7 @@ if JSON_TYPE is not None:
         Column("result_summary_id", String),
         Column("created_at", DateTime(timezone=True)),
         Column("updated_at", DateTime(timezone=True)),
+        Index("idx_opt_jobs_owner_updated", "owner_id", "updated_at", "id"),
         extend_existing=True,
     )
     _TASKS_TABLE = Table(
@@ -175,6 +452,7 @@ if JSON_TYPE is not None:
         Column("owner_id", String, nullable=False),
         Column("strategy_version_id", String, nullable=False),
         Column("param_set", JSON_TYPE, nullable=False),
+        Column("combo_index", Integer),
         Column("status", String, nullable=False),
         Column("progress", Float),
         Column("retries", Integer, nullable=False, default=0),
@@ -188,21 +466,92 @@ if JSON_TYPE is not None:
         Column("updated_at", DateTime(timezone=True)),
         extend_existing=True,
     )
+    _RESULTS_TABLE = Table(
+        "result_summaries",
+        _METADATA,
+        Column("id", String, primary_key=True),
+        Column("owner_id", String, nullable=False),
+        Column("source", String),
+        Column("metrics", JSON_TYPE, nullable=False),
+        Column("equity_curve_ref", String),
+        Column("trades_ref", String),
+        Column("artifacts", JSON_TYPE),
+        Column("created_at", DateTime(timezone=True)),
+        Column("updated_at", DateTime(timezone=True)),
+        extend_existing=True,
+    )
+    # One counter row per job: running claims vs. the job's concurrency limit,
+    # shared by every replica in OPT_DISPATCH_MODE=db.
+    _JOB_SLOTS_TABLE = Table(
+        "optimization_job_slots",
+        _METADATA,
+        Column("job_id", String, primary_key=True),
+        Column("running", Integer, nullable=False, default=0),
+        Column("concurrency_limit", Integer, nullable=False),
+        extend_existing=True,
+    )
+    _TASK_UPDATE_VALUES = {
+        name: bindparam(f"b_{name}", type_=_TASKS_TABLE.c[name].type)
+        for name in (
+            "status",
+            "progress",
+            "retries",
+            "next_run_at",
+            "throttled",
+            "error",
+            "last_error",
+            "result_summary_id",
+            "score",
+            "updated_at",
+        )
+    }
+    # Built once and reused with bound parameters, so SQLAlchemy's compiled
+    # cache is hit on every write instead of rebuilding the construct.
+    _UPDATE_TASK_STMT = update(_TASKS_TABLE).where(_TASKS_TABLE.c.id == bindparam("b_id")).values(_TASK_UPDATE_VALUES)
+    # Same write, but only for a task still holding its claim.
+    _FINISH_TASK_STMT = (
+        update(_TASKS_TABLE)
+        .where(_TASKS_TABLE.c.id == bindparam("b_id"), _TASKS_TABLE.c.status == "running")
+        .values(_TASK_UPDATE_VALUES)
+    )
+    _UPDATE_JOB_STMT = (
+        update(_JOBS_TABLE)
+        .where(_JOBS_TABLE.c.id == bindparam("b_id"))
+        .values(
+            {
+                name: bindparam(f"b_{name}", type_=_JOBS_TABLE.c[name].type)
+                for name in ("status", "total_tasks", "estimate", "summary", "updated_at")
+            }
+        )
+    )
 else:  # SQLAlchemy unavailable
     _METADATA = None
     _JOBS_TABLE = None
     _TASKS_TABLE = None
+    _RESULTS_TABLE = None
+    _JOB_SLOTS_TABLE = None
+    _UPDATE_TASK_STMT = None
+    _FINISH_TASK_STMT = None
+    _UPDATE_JOB_STMT = None
 
 
 def _clear_memory() -> None:
     """Clear in-memory job/task caches."""
 
-    with _STORE_LOCK:
+    global _LAST_RETENTION_SWEEP
+    with _STORE_SECTION:
+        _LAST_RETENTION_SWEEP = 0.0
         _JOBS.clear()
         _TASKS.clear()
         _TASK_ORDER.clear()
         _JOB_ORDER.clear()
         _RESULT_SUMMARIES.clear()
+        _OWNER_INDEX.clear()
+        _INDEX_KEYS.clear()
+        _PARTIAL_OWNERS.clear()
+        _PERSIST_DIRTY.clear()
+        _PERSIST_JOB_DIRTY.clear()
+        _HANDOFF_FENCE.clear()
 
 
 # ==== Environment helpers ====
@@ -262,6 +611,144 @@ def get_retry_base_seconds() -> int:
     return max(1, value)
 
 
+def get_events_coalesce_seconds() -> float:
+    raw = os.getenv("OPT_EVENTS_COALESCE_MS")
+    if not raw:
+        return DEFAULT_EVENTS_COALESCE_MS / 1000.0
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_EVENTS_COALESCE_MS / 1000.0
+    return max(0, value) / 1000.0
+
+
+def get_events_heartbeat_seconds() -> int:
+    raw = os.getenv("OPT_EVENTS_HEARTBEAT_SECONDS")
+    if not raw:
+        return DEFAULT_EVENTS_HEARTBEAT_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_EVENTS_HEARTBEAT_SECONDS
+    return max(1, value)
+
+
+def get_db_pool_size() -> int:
+    raw = os.getenv("OPT_DB_POOL_SIZE")
+    if not raw:
+        return DEFAULT_DB_POOL_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_DB_POOL_SIZE
+    return max(1, value)
+
+
+def get_db_max_overflow() -> int:
+    raw = os.getenv("OPT_DB_MAX_OVERFLOW")
+    if not raw:
+        return DEFAULT_DB_MAX_OVERFLOW
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_DB_MAX_OVERFLOW
+    return max(0, value)
+
+
+def get_db_pool_recycle_seconds() -> int:
+    raw = os.getenv("OPT_DB_POOL_RECYCLE_SECONDS")
+    if not raw:
+        return DEFAULT_DB_POOL_RECYCLE_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_DB_POOL_RECYCLE_SECONDS
+    return value if value > 0 else -1
+
+
+def get_db_pool_pre_ping() -> bool:
+    return os.getenv("OPT_DB_POOL_PRE_PING", "true").lower() != "false"
+
+
+def get_db_sqlite_wal() -> bool:
+    return os.getenv("OPT_DB_SQLITE_WAL", "true").lower() != "false"
+
+
+def get_db_bulk_chunk() -> int:
+    raw = os.getenv("OPT_DB_BULK_CHUNK")
+    if not raw:
+        return DEFAULT_DB_BULK_CHUNK
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_DB_BULK_CHUNK
+    return max(1, value)
+
+
+def get_persist_async() -> bool:
+    return os.getenv("OPT_PERSIST_ASYNC", "true").lower() != "false"
+
+
+def get_retain_terminal_per_owner() -> int:
+    raw = os.getenv("OPT_RETAIN_TERMINAL_PER_OWNER")
+    if not raw:
+        return DEFAULT_RETAIN_TERMINAL_PER_OWNER
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_RETAIN_TERMINAL_PER_OWNER
+    return max(0, value)
+
+
+def get_retain_terminal_max_age_seconds() -> int:
+    """Age after which terminal jobs are archived; 0 disables the age limit."""
+
+    raw = os.getenv("OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS")
+    if not raw:
+        return DEFAULT_RETAIN_TERMINAL_MAX_AGE_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_RETAIN_TERMINAL_MAX_AGE_SECONDS
+    return max(0, value)
+
+
+def get_retain_sweep_seconds() -> float:
+    raw = os.getenv("OPT_RETAIN_SWEEP_SECONDS")
+    if not raw:
+        return float(DEFAULT_RETAIN_SWEEP_SECONDS)
+    try:
+        value = float(raw)
+    except ValueError:
+        return float(DEFAULT_RETAIN_SWEEP_SECONDS)
+    return max(0.0, value)
+
+
+def get_result_cache_size() -> int:
+    raw = os.getenv("OPT_RESULT_CACHE_SIZE")
+    if not raw:
+        return DEFAULT_RESULT_CACHE_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_RESULT_CACHE_SIZE
+    return max(1, value)
+
+
+def get_dispatch_mode() -> str:
+    """``db`` claims tasks from the database so several replicas share the queue."""
+
+    value = os.getenv("OPT_DISPATCH_MODE", "memory").strip().lower()
+    return value if value in DISPATCH_MODES else "memory"
+
+
+def get_task_storage() -> str:
+    """``compact`` stores combo indices instead of per-task param JSON."""
+
+    value = os.getenv("OPT_TASK_STORAGE", "json").strip().lower()
+    return value if value in TASK_STORAGE_MODES else "json"
+
+
 # ==== Parameter normalization ====
 
 def summarize_param_space(
@@ -353,6 +840,29 @@ def expand_param_space(normalized: Dict[str, Sequence[Any]]) -> Iterable[Dict[st
         yield dict(zip(keys, combo))
 
 
+def decode_combo_index(normalized: Dict[str, Sequence[Any]], index: int) -> Dict[str, Any]:
+    """Inverse of the expand_param_space order: the last dimension varies fastest."""
+
+    keys = list(normalized.keys())
+    offsets: List[int] = []
+    for key in reversed(keys):
+        index, offset = divmod(index, len(normalized[key]))
+        offsets.append(offset)
+    offsets.reverse()
+    return {key: normalized[key][offset] for key, offset in zip(keys, offsets)}
+
+
+def encode_combo_index(normalized: Dict[str, Sequence[Any]], params: Dict[str, Any]) -> Optional[int]:
+    index = 0
+    for key, values in normalized.items():
+        try:
+            offset = list(values).index(params[key])
+        except (KeyError, ValueError):
+            return None
+        index = index * len(values) + offset
+    return index
+
+
 # ==== Orchestration core ==== 
 
 def create_optimization_job(
@@ -373,7 +883,7 @@ def create_optimization_job(
             {"limit": limit, "estimate": computed_estimate},
         )
     sanitized_concurrency = normalize_concurrency_limit(concurrency_limit)
-    job_id = str(uuid.uuid4())
+    job_id = _new_job_id()
     policy_obj = None
     if early_stop_policy:
         policy_obj = EarlyStopPolicy(
@@ -396,15 +906,20 @@ def create_optimization_job(
         estimate=estimate or computed_estimate,
         summary=_initial_summary(total_tasks, tasks),
         source_job_id=source_job_id,
+        persist_state="pending" if _PERSISTENCE.enabled else None,
     )
-    with _STORE_LOCK:
+    with _STORE_SECTION:
         _JOBS[job_id] = job
         _TASKS[job_id] = {task.id: task for task in tasks}
         _TASK_ORDER[job_id] = [task.id for task in tasks]
         if job_id not in _JOB_ORDER:
             _JOB_ORDER.append(job_id)
+        _index_job(job)
+        _WORK_READY.notify_all()
     if _PERSISTENCE.enabled:
-        _PERSISTENCE.persist_job(job, tasks)
+        # The job is already schedulable; rows are bulk-inserted in the background.
+        backend = _PERSISTENCE
+        backend.persist_job(job, tasks, on_done=lambda ok: _on_job_persisted(job_id, ok, backend))
     if job.summary.throttled > 0:
         emit_metric(
             "throttled_requests",
@@ -417,36 +932,115 @@ def create_optimization_job(
         "throttled": job.summary.throttled > 0,
         "totalTasks": total_tasks,
         "sourceJobId": source_job_id,
+        "persistState": job.persist_state,
     }
 
 
-def dequeue_next(owner_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    with _STORE_LOCK:
-        now = datetime.utcnow()
-        job_ids = [job_id] if job_id else list(_JOB_ORDER)
-        for jid in job_ids:
-            job = _JOBS.get(jid)
-            if not job or job.owner_id != owner_id:
-                continue
-            if job.locked_status:
+def dequeue_next(
+    owner_id: str,
+    job_id: Optional[str] = None,
+    *,
+    timeout: Optional[float] = None,
+    prefer_versions: Optional[Collection[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Start and return the next ready task as a payload dict, or None.
+
+    With ``timeout`` the call blocks for up to that many seconds until a task
+    becomes ready instead of returning None straight away. Jobs whose
+    version is in ``prefer_versions`` (already loaded by the worker) are
+    tried first; otherwise jobs are served in creation order.
+    """
+
+    handle = dequeue_task(owner_id, job_id, timeout=timeout, prefer_versions=prefer_versions)
+    return handle.to_dict() if handle is not None else None
+
+
+def dequeue_task(
+    owner_id: str,
+    job_id: Optional[str] = None,
+    *,
+    timeout: Optional[float] = None,
+    prefer_versions: Optional[Collection[str]] = None,
+) -> Optional[TaskHandle]:
+    """``dequeue_next`` for in-process workers: returns a TaskHandle.
+
+    ``orchestrator.dequeue_next`` latency covers each scan for a task (plus the
+    store lock wait before the first one), never the idle wait for work.
+    """
+
+    # Blocking waits are real: the deadline stays on the system clock.
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+    profiling = profiling_enabled()
+    if uses_db_dispatch():
+        # Shared dispatch claims in job creation order; prefer_versions is not applied.
+        while True:
+            started = time.perf_counter() if profiling else 0.0
+            task = _claim_from_db(owner_id, job_id)
+            if profiling:
+                observe_latency("orchestrator.dequeue_next", (time.perf_counter() - started) * 1000.0)
+            remaining = deadline - time.monotonic() if deadline is not None else 0.0
+            if task is not None or remaining <= 0:
+                return task
+            with _STORE_SECTION:
+                _WORK_READY.wait(min(remaining, DB_DISPATCH_POLL_SECONDS))
+    started = time.perf_counter() if profiling else 0.0
+    with _STORE_SECTION:
+        while True:
+            now = epoch_now()
+            _maybe_enforce_retention(now)
+            task, wake_at = _dequeue_locked(owner_id, job_id, now, prefer_versions)
+            if profiling:
+                observe_latency("orchestrator.dequeue_next", (time.perf_counter() - started) * 1000.0)
+            remaining = deadline - time.monotonic() if deadline is not None else 0.0
+            if task is not None or remaining <= 0:
+                return task
+            if wake_at is not None:
+                remaining = min(remaining, max(wake_at - now, 0.0))
+            _WORK_READY.wait(remaining)
+            started = time.perf_counter() if profiling else 0.0
+
+
+def _dequeue_locked(
+    owner_id: str,
+    job_id: Optional[str],
+    now: float,
+    prefer_versions: Optional[Collection[str]] = None,
+) -> Tuple[Optional[TaskHandle], Optional[float]]:
+    """Scan for a ready task; otherwise also return the earliest pending backoff."""
+
+    wake_at: Optional[float] = None
+    job_ids = [job_id] if job_id else list(_JOB_ORDER)
+    if prefer_versions and len(job_ids) > 1:
+        # stable: creation order still holds within the preferred and the other jobs
+        job_ids.sort(key=lambda jid: jid not in _JOBS or _JOBS[jid].version_id not in prefer_versions)
+    for jid in job_ids:
+        job = _JOBS.get(jid)
+        if not job or job.owner_id != owner_id:
+            continue
+        if job.locked_status or jid in _HANDOFF_FENCE:
+            continue
+        if _activate_slots(job):
+            _refresh_summary(job)
+        running = _count_status(job.id, "running")
+        if running >= job.concurrency_limit:
+            continue
+        for tid in _TASK_ORDER[jid]:
+            task = _TASKS[jid][tid]
+            if task.status != "queued" or task.throttled:
                 continue
-            _activate_slots(job)
-            running = _count_status(job.id, "running")
-            if running >= job.concurrency_limit:
+            if task.next_run_at > now:
+                if wake_at is None or task.next_run_at < wake_at:
+                    wake_at = task.next_run_at
                 continue
-            for tid in _TASK_ORDER[jid]:
-                task = _TASKS[jid][tid]
-                if task.status == "queued" and not task.throttled and task.next_run_at <= now:
-                    task.status = "running"
-                    task.progress = 0.0
-                    task.updated_at = iso_now()
-                    task.last_error = None
-                    job.status = "running"
-                    if _PERSISTENCE.enabled:
-                        _PERSISTENCE.update_task(task)
-                    _refresh_summary(job)
-                    return _task_to_dict(task)
-    return None
+            task.status = "running"
+            task.progress = 0.0
+            task.updated_at = now
+            task.last_error = None
+            job.status = "running"
+            _persist_task(job, task)
+            _refresh_summary(job)
+            return TaskHandle(task), None
+    return None, wake_at
 
 
 def mark_task_succeeded(
@@ -456,27 +1050,40 @@ def mark_task_succeeded(
     score: Optional[float] = None,
     result_summary_id: Optional[str] = None,
 ) -> Dict[str, Any]:
-    with _STORE_LOCK:
+    return complete_task(job_id, task_id, score=score, result_summary_id=result_summary_id).to_dict()
+
+
+@timed("orchestrator.mark_task_succeeded")
+def complete_task(
+    job_id: str,
+    task_id: str,
+    *,
+    score: Optional[float] = None,
+    result_summary_id: Optional[str] = None,
+) -> TaskHandle:
+    if uses_db_dispatch():
+        _sync_task_from_db(job_id, task_id)
+    with _STORE_SECTION:
+        stopped = _stopped_task_handle(job_id, task_id)
+        if stopped is not None:
+            return stopped
         job, task = _get_job_and_task(job_id, task_id)
-        if job.locked_status:
-            return _task_to_dict(task)
         task.status = "succeeded"
         if score is not None:
             task.score = float(score)
         task.result_summary_id = result_summary_id
         task.throttled = False
         task.progress = 1.0
-        task.updated_at = iso_now()
-        task.next_run_at = datetime.utcnow()
+        task.updated_at = task.next_run_at = epoch_now()
         task.error = None
         task.last_error = None
-        _ensure_result_summary(task)
-        if _PERSISTENCE.enabled:
-            _PERSISTENCE.update_task(task)
+        _record_result_summary(task)
+        _persist_task(job, task, release_slot=True)
         _activate_slots(job)
         _refresh_summary(job)
         _maybe_trigger_early_stop(job)
-        return _task_to_dict(task)
+        _WORK_READY.notify_all()
+        return TaskHandle(task)
 
 
 def mark_task_failed(
@@ -486,12 +1093,26 @@ def mark_task_failed(
     error_type: str,
     message: str,
 ) -> Dict[str, Any]:
-    with _STORE_LOCK:
+    return fail_task(job_id, task_id, error_type=error_type, message=message).to_dict()
+
+
+@timed("orchestrator.mark_task_failed")
+def fail_task(
+    job_id: str,
+    task_id: str,
+    *,
+    error_type: str,
+    message: str,
+) -> TaskHandle:
+    if uses_db_dispatch():
+        _sync_task_from_db(job_id, task_id)
+    with _STORE_SECTION:
+        stopped = _stopped_task_handle(job_id, task_id)
+        if stopped is not None:
+            return stopped
         job, task = _get_job_and_task(job_id, task_id)
-        if job.locked_status:
-            return _task_to_dict(task)
-        now = datetime.utcnow()
-        task.updated_at = iso_now()
+        now = epoch_now()
+        task.updated_at = now
         task.last_error = {"code": error_type, "message": message}
         task.error = task.last_error
         retryable = error_type in {"UPSTREAM_ERROR", "INTERNAL_ERROR"}
@@ -501,22 +1122,23 @@ def mark_task_failed(
         if retryable and task.retries < max_retries:
             task.retries += 1
             delay = get_retry_base_seconds() * (2 ** (task.retries - 1))
-            task.next_run_at = now + timedelta(seconds=delay)
+            task.next_run_at = now + delay
             task.throttled = False
             task.progress = None
         else:
             task.status = "failed"
             task.throttled = False
             task.next_run_at = now
-        if _PERSISTENCE.enabled:
-            _PERSISTENCE.update_task(task)
+        _persist_task(job, task, release_slot=True)
         _activate_slots(job)
         _refresh_summary(job)
-        return _task_to_dict(task)
+        _WORK_READY.notify_all()
+        return TaskHandle(task)
 
 
 def get_job_status(job_id: str, owner_id: str) -> Dict[str, Any]:
-    with _STORE_LOCK:
+    _sync_from_db(job_id)
+    with _STORE_SECTION:
         job = _JOBS.get(job_id)
         if not job:
             raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
@@ -532,7 +1154,8 @@ def get_job_status(job_id: str, owner_id: str) -> Dict[str, Any]:
 
 
 def get_job_snapshot(job_id: str, owner_id: str) -> Dict[str, Any]:
-    with _STORE_LOCK:
+    _sync_from_db(job_id)
+    with _STORE_SECTION:
         job = _JOBS.get(job_id)
         if not job:
             raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
@@ -554,52 +1177,158 @@ def get_job_snapshot(job_id: str, owner_id: str) -> Dict[str, Any]:
             "status": job.status,
             "totalTasks": job.total_tasks,
             "summary": _summary_to_dict(job.summary),
-            "createdAt": job.created_at,
-            "updatedAt": job.updated_at,
+            "createdAt": format_ts(job.created_at),
+            "updatedAt": format_ts(job.updated_at),
             "sourceJobId": job.source_job_id,
+            "revision": job.revision,
+            "persistState": job.persist_state,
         }
 
 
+def get_job_revision(job_id: str, owner_id: str) -> int:
+    """Return the job's current revision after the usual access checks.
+
+    Deliberately lock-free: a dict lookup and two attribute reads are atomic
+    under the GIL, so cache validation never queues behind writers holding
+    the store lock.
+    """
+
+    job = _JOBS.get(job_id)
+    if not job:
+        raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
+    if job.owner_id != owner_id:
+        raise JobAccessError(
+            "job does not belong to current owner",
+            "E.FORBIDDEN",
+            403,
+            {"jobId": job_id, "ownerId": owner_id},
+        )
+    return job.revision
+
+
+def running_count(job_id: str) -> int:
+    """Running tasks in a job as of its last summary refresh; 0 for unknown jobs.
+
+    Lock-free like get_job_revision. Every dequeue and settle refreshes the
+    summary, so this is current for the worker's active_jobs metric without
+    the refresh and payload build of get_job_status.
+    """
+
+    job = _JOBS.get(job_id)
+    return job.summary.running if job else 0
+
+
 def list_jobs(owner_id: str, *, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
     """Return optimization jobs for an owner ordered by most recent update."""
 
+    items, _ = list_jobs_page(owner_id, limit=limit)
+    return items
+
+
+def list_jobs_page(
+    owner_id: str,
+    *,
+    limit: int = DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+    statuses: Optional[Collection[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of an owner's jobs (newest update first) and the next cursor.
+
+    Walks the per-owner index backwards from the cursor, so an unfiltered page
+    costs time proportional to its size rather than the owner's job count.
+    The index is not split by status: with a selective ``statuses`` filter the
+    walk skips non-matching jobs and can cover the owner's whole index before
+    the page fills. Jobs that live only in persistence (archived, hand-off or
+    other replicas) come from one bounded keyset query. ``fields`` projects each entry onto the named keys (see LIST_FIELDS) and
+    skips building the others.
+    """
+
     if limit <= 0:
         limit = 1
     limit = min(limit, DEFAULT_LIMIT)
+    before = _decode_cursor(cursor) if cursor else None
+    wanted = set(statuses) if statuses else None
+    builders = _list_field_builders(fields)
+
+    with _STORE_SECTION:
+        index = _OWNER_INDEX.get(owner_id, [])
+        pos = bisect.bisect_left(index, before) if before else len(index)
+        page: List[Tuple[Tuple[float, str], Dict[str, Any]]] = []
+        while pos > 0 and len(page) <= limit:
+            pos -= 1
+            key = index[pos]
+            job = _JOBS[key[1]]
+            if wanted and job.status not in wanted:
+                continue
+            page.append((key, _job_list_entry(job, builders)))
+        # With shared dispatch or sharding other replicas' jobs are only in the database.
+        shared = uses_db_dispatch() or _SHARD_ROUTER is not None
+        from_store = (owner_id in _PARTIAL_OWNERS or shared) and _PERSISTENCE.enabled
+    # Keys below a side's last key may be missing from the page when that side was cut off.
+    horizon = page[-1][0] if len(page) > limit else None
+    if from_store:
+        # Queried without the store lock; one bounded keyset read per page.
+        stored = _PERSISTENCE.query_jobs_page(owner_id, before=before, limit=limit + 1, statuses=wanted)
+        if len(stored) > limit:
+            last = (stored[-1].updated_at, stored[-1].id)
+            horizon = max(horizon, last) if horizon else last
+        with _STORE_SECTION:
+            # Resident jobs are listed from memory, where they are current;
+            # archived ones only keep a header there.
+            stored = [job for job in stored if job.id not in _JOBS or _JOBS[job.id].archived]
+        page.extend(((job.updated_at, job.id), _job_list_entry(job, builders)) for job in stored)
+        page.sort(key=lambda item: item[0], reverse=True)
+        if horizon:
+            page = [item for item in page if item[0] >= horizon]
+
+    if len(page) > limit:
+        return [entry for _, entry in page[:limit]], _encode_cursor(page[limit - 1][0])
+    return [entry for _, entry in page], _encode_cursor(horizon) if from_store and horizon else None
+
+
+def enforce_retention(now: Optional[float] = None) -> int:
+    """Archive terminal jobs outside the retention policy; returns how many.
+
+    A terminal job is archived once it is older than
+    OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS or falls outside its owner's
+    OPT_RETAIN_TERMINAL_PER_OWNER most recent terminal jobs. Archived jobs keep
+    their header and final summary (so status works), leave the dispatch order
+    and are listed and exported from persistence. Without persistence nothing
+    is archived, since the tasks would have nowhere to go.
+    """
 
-    with _STORE_LOCK:
-        candidates = [job for job in _JOBS.values() if job.owner_id == owner_id]
-        for job in candidates:
-            _refresh_summary(job, persist=False)
-
-        candidates.sort(
-            key=lambda job: (job.updated_at or job.created_at or ""),
-            reverse=True,
-        )
-
-        payload: List[Dict[str, Any]] = []
-        for job in candidates[:limit]:
-            payload.append(
-                {
-                    "id": job.id,
-                    "ownerId": job.owner_id,
-                    "versionId": job.version_id,
-                    "paramSpace": job.param_space,
-                    "concurrencyLimit": job.concurrency_limit,
-                    "earlyStopPolicy": _policy_to_dict(job.early_stop_policy),
-                    "status": job.status,
-                    "totalTasks": job.total_tasks,
-                    "summary": _summary_to_dict(job.summary),
-                    "createdAt": job.created_at,
-                    "updatedAt": job.updated_at,
-                    "sourceJobId": job.source_job_id,
-                }
-            )
-        return payload
+    if not _PERSISTENCE.enabled:
+        return 0
+    current = now if now is not None else epoch_now()
+    keep_per_owner = get_retain_terminal_per_owner()
+    max_age = get_retain_terminal_max_age_seconds()
+    cutoff = current - max_age if max_age else None
+    archived = 0
+    with _STORE_SECTION:
+        terminal: Dict[str, List[OptimizationJob]] = {}
+        for job_id in _JOB_ORDER:
+            job = _JOBS[job_id]
+            # pending jobs still need their task objects to replay deferred writes
+            if job.status in FINISHED_STATUSES and job.persist_state != "pending":
+                terminal.setdefault(job.owner_id, []).append(job)
+        for jobs in terminal.values():
+            jobs.sort(key=lambda job: (job.updated_at, job.id), reverse=True)
+            for rank, job in enumerate(jobs):
+                expired = cutoff is not None and job.updated_at < cutoff
+                if rank >= keep_per_owner or expired:
+                    _archive_job(job)
+                    archived += 1
+        if archived:
+            _JOB_ORDER[:] = [job_id for job_id in _JOB_ORDER if not _JOBS[job_id].archived]
+    if archived:
+        emit_metric("jobs_archived_total", float(archived))
+    return archived
 
 
 def cancel_job(job_id: str, owner_id: str, *, reason: Optional[str] = None) -> Dict[str, Any]:
-    with _STORE_LOCK:
+    _sync_from_db(job_id)
+    with _STORE_SECTION:
         job = _JOBS.get(job_id)
         if not job:
             raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
@@ -617,8 +1346,16 @@ def cancel_job(job_id: str, owner_id: str, *, reason: Optional[str] = None) -> D
         return _job_payload(job)
 
 
-def export_top_n_bundle(job_id: str, owner_id: str) -> Dict[str, Any]:
-    with _STORE_LOCK:
+def subscribe_job_events(
+    job_id: str,
+    owner_id: str,
+    *,
+    loop: Optional[Any] = None,
+) -> JobSubscription:
+    """Subscribe to revision changes of a job the owner can access."""
+
+    _sync_from_db(job_id)
+    with _STORE_SECTION:
         job = _JOBS.get(job_id)
         if not job:
             raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
@@ -629,13 +1366,43 @@ def export_top_n_bundle(job_id: str, owner_id: str) -> Dict[str, Any]:
                 403,
                 {"jobId": job_id, "ownerId": owner_id},
             )
+        # Subscribing under the store lock guarantees no revision is missed.
+        return _EVENTS.subscribe(job_id, job.revision, loop=loop)
+
+
+def export_top_n_bundle(job_id: str, owner_id: str) -> Dict[str, Any]:
+    _sync_from_db(job_id)
+    with _STORE_SECTION:
+        job = _owned_job(job_id, owner_id)
         _refresh_summary(job)
-        task_map = _TASKS.get(job_id, {})
+        archived = job.archived
+        top_n = [dict(entry) for entry in job.summary.top_n]
+        summary_payload = _summary_to_dict(job.summary)
+        status = job.status
+        missing = [
+            entry["resultSummaryId"]
+            for entry in top_n
+            if entry.get("resultSummaryId") and entry["resultSummaryId"] not in _RESULT_SUMMARIES
+        ]
+    # Task rows of archived jobs and summaries evicted from the LRU are read off the lock.
+    stored_tasks: Dict[str, OptimizationTask] = {}
+    if archived:
+        loaded = _PERSISTENCE.load_job(job_id)
+        if loaded is not None:
+            stored_tasks = {task.id: task for task in loaded[1]}
+    stored_summaries: Dict[str, Dict[str, Any]] = {}
+    if _PERSISTENCE.enabled:
+        for result_id in missing:
+            stored = _PERSISTENCE.load_result_summary(result_id)
+            if stored is not None:
+                stored_summaries[result_id] = stored
+    with _STORE_SECTION:
+        task_map = _TASKS.get(job_id) or stored_tasks
         items: List[Dict[str, Any]] = []
-        for entry in job.summary.top_n:
+        for entry in top_n:
             task_id = entry.get("taskId")
-            task = task_map.get(task_id) if isinstance(task_map, dict) else None
-            summary = _ensure_result_summary(task) if task else None
+            task = task_map.get(task_id)
+            summary = _ensure_result_summary(task, stored_summaries) if task else None
             items.append(
                 {
                     "taskId": task_id,
@@ -646,13 +1413,27 @@ def export_top_n_bundle(job_id: str, owner_id: str) -> Dict[str, Any]:
                     "artifacts": (summary or {}).get("artifacts"),
                 }
             )
-        return {
-            "jobId": job.id,
-            "status": job.status,
-            "generatedAt": iso_now(),
-            "summary": _summary_to_dict(job.summary),
-            "items": items,
-        }
+    return {
+        "jobId": job_id,
+        "status": status,
+        "generatedAt": iso_now(),
+        "summary": summary_payload,
+        "items": items,
+    }
+
+
+def _owned_job(job_id: str, owner_id: str) -> OptimizationJob:
+    job = _JOBS.get(job_id)
+    if not job:
+        raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
+    if job.owner_id != owner_id:
+        raise JobAccessError(
+            "job does not belong to current owner",
+            "E.FORBIDDEN",
+            403,
+            {"jobId": job_id, "ownerId": owner_id},
+        )
+    return job
 
 
 # ==== Internal helpers ====
@@ -668,7 +1449,7 @@ def _generate_tasks(
     if not combos:
         return
     cap = min(len(combos), MAX_TASK_CAP)
-    now = datetime.utcnow()
+    now = epoch_now()
     for index in range(cap):
         params = combos[index]
         throttled = index >= concurrency_limit
@@ -681,6 +1462,9 @@ def _generate_tasks(
             status=DEFAULT_STATUS,
             throttled=throttled,
             next_run_at=now,
+            created_at=now,
+            updated_at=now,
+            combo_index=index,
         )
 
 
@@ -695,32 +1479,64 @@ def _initial_summary(total: int, tasks: List[OptimizationTask]) -> OptimizationS
     )
 
 
-def _ensure_result_summary(task: OptimizationTask) -> Optional[Dict[str, Any]]:
+def _new_result_summary(task: OptimizationTask, result_id: str) -> Dict[str, Any]:
+    return {
+        "id": result_id,
+        "ownerId": task.owner_id,
+        "metrics": {"score": float(task.score)} if task.score is not None else {},
+        "artifacts": _build_artifacts(result_id),
+        "createdAt": iso_now(),
+        "equityCurveRef": f"/artifacts/{result_id}/equity.csv",
+        "tradesRef": f"/artifacts/{result_id}/trades.csv",
+    }
+
+
+def _ensure_result_summary(
+    task: OptimizationTask, stored: Mapping[str, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Look up a task's result summary: LRU, then ``stored`` (read from persistence
+    beforehand, off the store lock), then rebuild."""
+
     result_id = task.result_summary_id
     if not result_id:
         return None
     summary = _RESULT_SUMMARIES.get(result_id)
+    if summary is not None:
+        return summary
+    summary = stored.get(result_id)
     if summary is None:
-        summary = {
-            "id": result_id,
-            "ownerId": task.owner_id,
-            "metrics": {},
-            "artifacts": _build_artifacts(result_id),
-            "createdAt": iso_now(),
-            "equityCurveRef": f"/artifacts/{result_id}/equity.csv",
-            "tradesRef": f"/artifacts/{result_id}/trades.csv",
-        }
-        _RESULT_SUMMARIES[result_id] = summary
-    if task.score is not None:
-        metrics = summary.setdefault("metrics", {})
-        metrics["score"] = float(task.score)
+        summary = _new_result_summary(task, result_id)
+        if _PERSISTENCE.enabled:
+            _queue_write(_PERSISTENCE.save_result_summary, summary)
+    _RESULT_SUMMARIES.put(result_id, summary)
     return summary
 
 
-def _refresh_summary(job: OptimizationJob, *, persist: bool = True) -> None:
-    tasks = list(_TASKS[job.id].values())
-    prev_status = job.status
-    prev_summary = _summary_to_dict(job.summary)
+def _record_result_summary(task: OptimizationTask) -> None:
+    """Store the summary for a task that just succeeded."""
+
+    result_id = task.result_summary_id
+    if not result_id:
+        return
+    summary = _RESULT_SUMMARIES.get(result_id)
+    if summary is None:
+        summary = _new_result_summary(task, result_id)
+    elif task.score is not None:
+        summary = dict(summary, metrics=dict(summary.get("metrics") or {}, score=float(task.score)))
+    _RESULT_SUMMARIES.put(result_id, summary)
+    if _PERSISTENCE.enabled:
+        # Queued before the task row, which references it.
+        _queue_write(_PERSISTENCE.save_result_summary, summary)
+
+
+@timed("orchestrator.refresh_summary")
+def _refresh_summary(job: OptimizationJob, *, persist: bool = True) -> None:
+    if job.archived:
+        # Only the top-N tasks are left; the summary was frozen at archival.
+        return
+    tasks = list(_TASKS[job.id].values())
+    prev_status = job.status
+    prev_summary = _summary_to_dict(job.summary)
     finished = sum(1 for task in tasks if task.status in FINISHED_STATUSES)
     running = sum(1 for task in tasks if task.status == "running")
     throttled = sum(1 for task in tasks if task.throttled)
@@ -736,14 +1552,12 @@ def _refresh_summary(job: OptimizationJob, *, persist: bool = True) -> None:
         return float(task.score)
 
     scored.sort(key=_topn_key, reverse=mode != "min")
+    # Built from the tasks alone; summaries are only materialized on success and export.
     top_n = []
     for task in scored[:top_limit]:
-        summary = _ensure_result_summary(task)
         entry = {"taskId": task.id, "score": float(task.score)}
         if task.result_summary_id:
             entry["resultSummaryId"] = task.result_summary_id
-        if summary and "score" in summary.get("metrics", {}):
-            entry["score"] = float(summary["metrics"]["score"])
         top_n.append(entry)
     job.summary = OptimizationSummary(
         total=job.total_tasks,
@@ -770,16 +1584,21 @@ def _refresh_summary(job: OptimizationJob, *, persist: bool = True) -> None:
         or prev_summary != _summary_to_dict(job.summary)
     )
     if changed:
-        job.updated_at = iso_now()
+        _touch_job(job)
+        _publish_revision(job)
     if persist and changed:
-        _PERSISTENCE.update_job(job)
+        _persist_job(job)
 
 
-def _activate_slots(job: OptimizationJob) -> None:
+@timed("orchestrator.activate_slots")
+def _activate_slots(job: OptimizationJob) -> bool:
+    """Release throttled tasks into free capacity; True when any were released."""
+
     tasks = _TASKS.get(job.id)
-    if not tasks:
-        return
-    now = datetime.utcnow()
+    if not tasks or uses_db_dispatch():
+        # Shared dispatch enforces the limit with the job's slot row instead.
+        return False
+    now = epoch_now()
     running = _count_status(job.id, "running")
     ready = sum(
         1
@@ -788,7 +1607,8 @@ def _activate_slots(job: OptimizationJob) -> None:
     )
     capacity = max(job.concurrency_limit - running - ready, 0)
     if capacity <= 0:
-        return
+        return False
+    activated = False
     for task_id in _TASK_ORDER[job.id]:
         if capacity <= 0:
             break
@@ -796,10 +1616,11 @@ def _activate_slots(job: OptimizationJob) -> None:
         if task.status == "queued" and task.throttled:
             task.throttled = False
             task.next_run_at = min(task.next_run_at, now)
-            task.updated_at = iso_now()
-            if _PERSISTENCE.enabled:
-                _PERSISTENCE.update_task(task)
+            task.updated_at = now
+            _persist_task(job, task)
             capacity -= 1
+            activated = True
+    return activated
 
 
 def _count_status(job_id: str, status: JobStatus) -> int:
@@ -808,9 +1629,39 @@ def _count_status(job_id: str, status: JobStatus) -> int:
     return sum(1 for task in _TASKS[job_id].values() if task.status == status)
 
 
+def _stopped_task_handle(job_id: str, task_id: str) -> Optional[TaskHandle]:
+    """Handle for a settle that arrives after its job was stopped or archived.
+
+    Workers still report tasks that were running when the job was canceled or
+    early-stopped; retention may have dropped those task objects since, so the
+    outcome is acknowledged without a lookup and otherwise ignored.
+    """
+
+    job = _JOBS.get(job_id)
+    if job is None or not (job.locked_status or job.archived):
+        return None
+    task = _TASKS.get(job_id, {}).get(task_id)
+    if task is None:
+        task = OptimizationTask(
+            id=task_id,
+            job_id=job.id,
+            owner_id=job.owner_id,
+            version_id=job.version_id,
+            params={},
+            status=job.locked_status or job.status,
+            progress=1.0,
+        )
+    return TaskHandle(task)
+
+
 def _get_job_and_task(job_id: str, task_id: str) -> (OptimizationJob, OptimizationTask):
     job = _JOBS.get(job_id)
     if not job:
+        if not owns_job(job_id):
+            # handed off: the new owner requeued the task and runs it again
+            raise JobAccessError(
+                "optimization job moved to another replica", "E.JOB_MOVED", 409, {"jobId": job_id}
+            )
         raise JobAccessError("optimization job not found", "E.NOT_FOUND", 404, {"jobId": job_id})
     tasks = _TASKS.get(job_id)
     if not tasks or task_id not in tasks:
@@ -818,27 +1669,6 @@ def _get_job_and_task(job_id: str, task_id: str) -> (OptimizationJob, Optimizati
     return job, tasks[task_id]
 
 
-def _task_to_dict(task: OptimizationTask) -> Dict[str, Any]:
-    return {
-        "id": task.id,
-        "jobId": task.job_id,
-        "ownerId": task.owner_id,
-        "versionId": task.version_id,
-        "params": task.params,
-        "status": task.status,
-        "progress": task.progress,
-        "retries": task.retries,
-        "error": task.error,
-        "resultSummaryId": task.result_summary_id,
-        "score": task.score,
-        "throttled": task.throttled,
-        "nextRunAt": task.next_run_at.isoformat(),
-        "lastError": task.last_error,
-        "createdAt": task.created_at,
-        "updatedAt": task.updated_at,
-    }
-
-
 def _policy_to_dict(policy: Optional[EarlyStopPolicy]) -> Optional[Dict[str, Any]]:
     if not policy:
         return None
@@ -887,20 +1717,22 @@ def _lock_job(
     job.locked_status = status
     job.stop_reason = reason
     job.status = status
-    job.updated_at = iso_now()
+    _touch_job(job)
     tasks = _TASKS.get(job.id, {})
-    now = datetime.utcnow()
+    now = epoch_now()
+    # With shared dispatch other replicas settle tasks too, so local rows may be
+    # stale; the database stops whatever is still unfinished there instead.
+    stop_in_db = uses_db_dispatch() and job.persist_state != "pending"
     for task in tasks.values():
         if task.status not in FINISHED_STATUSES:
             task.status = status
             task.progress = 1.0
             task.throttled = False
-            task.next_run_at = now
-            task.updated_at = iso_now()
+            task.next_run_at = task.updated_at = now
             task.error = None
             task.last_error = None
-            if _PERSISTENCE.enabled:
-                _PERSISTENCE.update_task(task)
+            if not stop_in_db:
+                _persist_task(job, task)
     tags = {
         "jobId": job.id,
         "ownerId": job.owner_id,
@@ -915,9 +1747,360 @@ def _lock_job(
     if score_value is not None:
         emit_metric("job_stop_score", score_value, tags=tags)
     log_stop(job.id, job.owner_id, status, reason=reason)
+    revision = job.revision
+    _refresh_summary(job, persist=False)
+    if job.revision == revision:
+        # Nothing left to stop, so the summary is unchanged; the status still is.
+        _publish_revision(job)
+    _persist_job(job)
+    if stop_in_db:
+        _queue_write(_PERSISTENCE.stop_tasks, job.id, status, now)
+
+
+def _persist_task(job: OptimizationJob, task: OptimizationTask, *, release_slot: bool = False) -> None:
+    if not _PERSISTENCE.enabled:
+        return
+    if release_slot and uses_db_dispatch():
+        _queue_write(_PERSISTENCE.finish_task, _task_snapshot(task))
+        return
+    if job.persist_state == "pending":
+        _PERSIST_DIRTY.setdefault(job.id, set()).add(task.id)
+        return
+    _queue_write(_PERSISTENCE.update_task, _task_snapshot(task))
+
+
+def _persist_job(job: OptimizationJob) -> None:
+    if not _PERSISTENCE.enabled:
+        return
+    if job.persist_state == "pending":
+        _PERSIST_JOB_DIRTY.add(job.id)
+        return
+    _queue_write(_PERSISTENCE.update_job, _job_snapshot(job))
+
+
+def _on_job_persisted(job_id: str, ok: bool, backend: "PersistenceBackend") -> None:
+    """Mark a job durable and replay writes that raced with its bulk insert.
+
+    The writes go to ``backend``, the one that inserted the rows, even if
+    persistence was reconfigured meanwhile.
+    """
+
+    with _STORE_SECTION:
+        job = _JOBS.get(job_id)
+        dirty = _PERSIST_DIRTY.pop(job_id, set())
+        job_dirty = job_id in _PERSIST_JOB_DIRTY
+        _PERSIST_JOB_DIRTY.discard(job_id)
+        if job is None or job.persist_state != "pending":
+            return
+        if not ok:
+            job.persist_state = "failed"
+            emit_metric("persist_job_failures_total", 1.0, tags={"jobId": job_id, "ownerId": job.owner_id})
+            _publish_revision(job)
+            return
+        job.persist_state = "durable"
+        tasks = _TASKS.get(job_id, {})
+        for task_id in dirty:
+            task = tasks.get(task_id)
+            if task is not None:
+                _queue_write(backend.update_task, _task_snapshot(task))
+        if job_dirty:
+            _queue_write(backend.update_job, _job_snapshot(job))
+        _publish_revision(job)
+
+
+def _install_hydrated(loaded: Iterable[Tuple[OptimizationJob, List[OptimizationTask]]]) -> None:
+    """Replace the in-memory store with jobs recovered by a persistence backend."""
+
+    _clear_memory()
+    # Running tasks lost their runner (and lease) with the previous process.
+    # With sharding one may still belong to a replica that holds the job until
+    # its next heartbeat, so those jobs are fenced; see refresh_shard_membership.
+    fence = _SHARD_ROUTER is not None
+    fence_until = epoch_now() + get_shard_lease_ttl_seconds()
+    with _STORE_SECTION:
+        for job, tasks in loaded:
+            # Each replica only hydrates and schedules its own shard.
+            if not owns_job(job.id):
+                continue
+            _install_job(job, tasks)
+            if uses_db_dispatch() or not any(task.status == "running" for task in tasks):
+                continue
+            if fence:
+                _HANDOFF_FENCE[job.id] = fence_until
+            else:
+                _requeue_running(job)
+        _WORK_READY.notify_all()
+    # Keep restart memory bounded by the same policy as a long-running process.
+    enforce_retention()
+
+
+def _install_job(job: OptimizationJob, tasks: List[OptimizationTask]) -> None:
+    job.persist_state = "durable"
+    _JOBS[job.id] = job
+    _TASKS[job.id] = {task.id: task for task in tasks}
+    _TASK_ORDER[job.id] = [task.id for task in tasks]
+    if job.id not in _JOB_ORDER:
+        _JOB_ORDER.append(job.id)
+    job.revision = next(_REVISION_SEQ)
+    _index_job(job)
+    _refresh_summary(job, persist=False)
+
+
+def _claim_from_db(owner_id: str, job_id: Optional[str]) -> Optional[TaskHandle]:
+    persistence = _PERSISTENCE
+    row = persistence.claim_task(owner_id, job_id=job_id)
+    if row is None:
+        return None
+    handle = None
+    try:
+        _load_resident(row["job_id"])
+        with _STORE_SECTION:
+            job = _JOBS.get(row["job_id"])
+            task = _TASKS.get(row["job_id"], {}).get(row["id"]) if job else None
+            if job is not None and task is not None:
+                _apply_task_row(task, row)
+                job.status = "running"
+                _refresh_summary(job)
+                handle = TaskHandle(task)
+    finally:
+        if handle is None:
+            # Nobody will run or settle this claim: hand the row and its slot back.
+            persistence.release_claim(row["id"], row["job_id"])
+            emit_metric("db_claims_released_total", 1.0, tags={"jobId": row["job_id"]})
+    return handle
+
+
+def _load_resident(job_id: str) -> None:
+    """Load a job from the shared database unless it is already in memory.
+
+    Called without the store lock: the read runs unlocked and the job is
+    installed under the lock only if no other thread installed it meanwhile.
+    """
+
+    # An unlocked membership test is only a hint; the install re-checks it.
+    if not uses_db_dispatch() or job_id in _JOBS:
+        return
+    loaded = _PERSISTENCE.load_job(job_id)
+    if loaded is None:
+        return
+    with _STORE_SECTION:
+        if job_id not in _JOBS:
+            _install_job(*loaded)
+
+
+def _sync_from_db(job_id: str) -> None:
+    """Pull task state written by other replicas before serving a job."""
+
+    if not uses_db_dispatch():
+        return
+    loaded = _PERSISTENCE.load_job(job_id)
+    if loaded is None:
+        return
+    stored, tasks = loaded
+    with _STORE_SECTION:
+        job = _JOBS.get(job_id)
+        if job is None:
+            _install_job(stored, tasks)
+            return
+        resident = _TASKS.get(job_id, {})
+        for task in tasks:
+            current = resident.get(task.id)
+            if current is not None:
+                _copy_task_state(task, current)
+        if stored.status in _CLAIM_BLOCKED_STATUSES and not job.locked_status:
+            # canceled or early-stopped on another replica
+            job.locked_status = job.status = stored.status
+        _refresh_summary(job, persist=False)
+
+
+def _sync_task_from_db(job_id: str, task_id: str) -> None:
+    row = _PERSISTENCE.load_task_row(task_id)
+    _load_resident(job_id)
+    with _STORE_SECTION:
+        task = _TASKS.get(job_id, {}).get(task_id)
+        if row is not None and task is not None:
+            _apply_task_row(task, row)
+
+
+def _apply_task_row(task: OptimizationTask, row: Dict[str, Any]) -> None:
+    task.status = row.get("status") or task.status
+    task.progress = row.get("progress")
+    task.retries = row.get("retries") or 0
+    if row.get("next_run_at") is not None:
+        task.next_run_at = _to_epoch(row["next_run_at"])
+    task.throttled = bool(row.get("throttled"))
+    task.error = row.get("error")
+    task.last_error = row.get("last_error")
+    task.result_summary_id = row.get("result_summary_id")
+    task.score = row.get("score")
+    task.updated_at = _to_epoch(row.get("updated_at"))
+
+
+def _copy_task_state(source: OptimizationTask, target: OptimizationTask) -> None:
+    for name in (
+        "status",
+        "progress",
+        "retries",
+        "next_run_at",
+        "throttled",
+        "error",
+        "last_error",
+        "result_summary_id",
+        "score",
+        "updated_at",
+    ):
+        setattr(target, name, getattr(source, name))
+
+
+def _space_to_json(normalized: Dict[str, Sequence[Any]]) -> Optional[List[List[Any]]]:
+    # Stored as [key, values] pairs: JSONB does not keep object key order,
+    # and the combo index depends on it.
+    if not normalized:
+        return None
+    return [[key, list(values)] for key, values in normalized.items()]
+
+
+def _space_from_json(raw: Any) -> Dict[str, Sequence[Any]]:
+    if not raw:
+        return {}
+    if isinstance(raw, dict):
+        return {key: list(values) for key, values in raw.items()}
+    return {key: list(values) for key, values in raw}
+
+
+def _maybe_enforce_retention(now: float) -> None:
+    global _LAST_RETENTION_SWEEP
+    interval = get_retain_sweep_seconds()
+    tick = get_clock().monotonic()
+    if _LAST_RETENTION_SWEEP and tick - _LAST_RETENTION_SWEEP < interval:
+        return
+    _LAST_RETENTION_SWEEP = tick
+    enforce_retention(now)
+
+
+def _archive_job(job: OptimizationJob) -> None:
+    """Freeze a terminal job's summary and reduce it to a header.
+
+    Its tasks, result summaries and history index entry leave memory; the
+    persisted rows are untouched, so history, export and a restart read them
+    back. The header keeps what status payloads need. Callers remove the job
+    from _JOB_ORDER.
+    """
+
     _refresh_summary(job)
+    for task in _TASKS.pop(job.id, {}).values():
+        if task.result_summary_id:
+            _RESULT_SUMMARIES.pop(task.result_summary_id, None)
+    _TASK_ORDER.pop(job.id, None)
+    _unindex_job(job)
+    _PARTIAL_OWNERS.add(job.owner_id)
+    # The spaces are only needed to create, decode or list tasks.
+    job.param_space = {}
+    job.normalized_space = {}
+    job.archived = True
+
+
+def _touch_job(job: OptimizationJob) -> None:
+    job.updated_at = epoch_now()
+    _index_job(job)
+
+
+def _index_job(job: OptimizationJob) -> None:
+    """Insert or move a job in its owner's updated_at index."""
+
+    index = _OWNER_INDEX.setdefault(job.owner_id, [])
+    previous = _INDEX_KEYS.get(job.id)
+    key = (job.updated_at, job.id)
+    if previous == key:
+        return
+    if previous is not None:
+        pos = bisect.bisect_left(index, previous)
+        if pos < len(index) and index[pos] == previous:
+            del index[pos]
+    bisect.insort(index, key)
+    _INDEX_KEYS[job.id] = key
+
+
+def _forget_job(job_id: str) -> None:
+    """Drop a persisted job from memory; history keeps serving it from the DB."""
+
+    job = _JOBS.pop(job_id, None)
+    _TASKS.pop(job_id, None)
+    _TASK_ORDER.pop(job_id, None)
+    if job_id in _JOB_ORDER:
+        _JOB_ORDER.remove(job_id)
+    if job is None:
+        _INDEX_KEYS.pop(job_id, None)
+        return
+    _unindex_job(job)
     if _PERSISTENCE.enabled:
-        _PERSISTENCE.update_job(job)
+        _PARTIAL_OWNERS.add(job.owner_id)
+
+
+def _unindex_job(job: OptimizationJob) -> None:
+    key = _INDEX_KEYS.pop(job.id, None)
+    index = _OWNER_INDEX.get(job.owner_id, [])
+    if key is not None:
+        pos = bisect.bisect_left(index, key)
+        if pos < len(index) and index[pos] == key:
+            del index[pos]
+
+
+def _encode_cursor(key: Tuple[float, str]) -> str:
+    raw = json.dumps([format_ts(key[0]), key[1]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, job_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return parse_ts(updated_at), str(job_id)
+    except (ValueError, TypeError) as exc:
+        raise ParamInvalidError("invalid cursor", {"cursor": cursor}) from exc
+
+
+_LIST_FIELD_BUILDERS: Dict[str, Any] = {
+    "id": lambda job: job.id,
+    "ownerId": lambda job: job.owner_id,
+    "versionId": lambda job: job.version_id,
+    "paramSpace": lambda job: job.param_space,
+    "concurrencyLimit": lambda job: job.concurrency_limit,
+    "earlyStopPolicy": lambda job: _policy_to_dict(job.early_stop_policy),
+    "status": lambda job: job.status,
+    "totalTasks": lambda job: job.total_tasks,
+    "summary": lambda job: _summary_to_dict(job.summary),
+    "counts": lambda job: _summary_counts(job.summary),
+    "createdAt": lambda job: format_ts(job.created_at),
+    "updatedAt": lambda job: format_ts(job.updated_at),
+    "sourceJobId": lambda job: job.source_job_id,
+    "persistState": lambda job: job.persist_state,
+}
+LIST_FIELDS = tuple(_LIST_FIELD_BUILDERS)
+DEFAULT_LIST_FIELDS = tuple(name for name in LIST_FIELDS if name != "counts")
+COMPACT_LIST_FIELDS = ("id", "status", "totalTasks", "counts", "createdAt", "updatedAt", "sourceJobId")
+
+
+def _list_field_builders(fields: Optional[Sequence[str]]) -> List[Tuple[str, Any]]:
+    names = list(fields) if fields else list(DEFAULT_LIST_FIELDS)
+    unknown = [name for name in names if name not in _LIST_FIELD_BUILDERS]
+    if unknown:
+        raise ParamInvalidError(
+            "unknown list fields",
+            {"fields": unknown, "allowed": list(LIST_FIELDS)},
+        )
+    if "id" not in names:
+        names.insert(0, "id")
+    return [(name, _LIST_FIELD_BUILDERS[name]) for name in dict.fromkeys(names)]
+
+
+def _job_list_entry(job: OptimizationJob, builders: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    return {name: build(job) for name, build in builders}
+
+
+def _publish_revision(job: OptimizationJob) -> None:
+    job.revision = next(_REVISION_SEQ)
+    _EVENTS.publish(job.id, job.revision)
 
 
 def _build_artifacts(result_id: str) -> List[Dict[str, str]]:
@@ -954,6 +2137,17 @@ def _job_payload(job: OptimizationJob) -> Dict[str, Any]:
         "diagnostics": diagnostics,
         "earlyStopPolicy": _policy_to_dict(job.early_stop_policy),
         "sourceJobId": job.source_job_id,
+        "revision": job.revision,
+        "persistState": job.persist_state,
+    }
+
+
+def _summary_counts(summary: OptimizationSummary) -> Dict[str, int]:
+    return {
+        "total": summary.total,
+        "finished": summary.finished,
+        "running": summary.running,
+        "throttled": summary.throttled,
     }
 
 
@@ -967,6 +2161,18 @@ def _summary_to_dict(summary: OptimizationSummary) -> Dict[str, Any]:
     }
 
 
+def _dict_to_summary(data: Any, total: int) -> OptimizationSummary:
+    if not isinstance(data, dict):
+        return OptimizationSummary(total, 0, 0, 0)
+    return OptimizationSummary(
+        total=int(data.get("total", total or 0)),
+        finished=int(data.get("finished", 0)),
+        running=int(data.get("running", 0)),
+        throttled=int(data.get("throttled", 0)),
+        top_n=list(data.get("topN", [])),
+    )
+
+
 def _to_float(value: Any) -> Optional[float]:
     try:
         if value is None:
@@ -981,6 +2187,8 @@ def _to_datetime(value: Optional[Any]) -> Optional[datetime]:
         return None
     if isinstance(value, datetime):
         return value
+    if isinstance(value, (int, float)):
+        return _EPOCH + timedelta(seconds=value)
     if isinstance(value, str):
         try:
             return datetime.fromisoformat(value)
@@ -992,10 +2200,15 @@ def _to_datetime(value: Optional[Any]) -> Optional[datetime]:
     return None
 
 
-def _to_iso(value: Optional[datetime]) -> str:
-    if value is None:
-        return iso_now()
-    return value.replace(tzinfo=None).isoformat()
+def _to_epoch(value: Optional[Any]) -> float:
+    """Epoch seconds for a stored timestamp; the current time when it is missing."""
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    parsed = _to_datetime(value)
+    if parsed is None:
+        return epoch_now()
+    return (parsed.replace(tzinfo=None) - _EPOCH).total_seconds()
 
 
 def _dict_to_policy(data: Optional[Dict[str, Any]]) -> Optional[EarlyStopPolicy]:
@@ -1011,6 +2224,17 @@ def _dict_to_policy(data: Optional[Dict[str, Any]]) -> Optional[EarlyStopPolicy]
         return None
 
 
+def _sqlite_tune_connection(dbapi_connection: Any, _record: Any) -> None:
+    # WAL lets readers run alongside the writer; NORMAL skips the fsync per commit.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    finally:
+        cursor.close()
+
+
+@timed_methods("persistence")
 class TaskPersistence:
     """Optional persistence layer backed by SQLAlchemy.
 
@@ -1024,34 +2248,197 @@ class TaskPersistence:
         self.dsn = clean_dsn or None
         self.enabled = bool(self.dsn and create_engine is not None and _JOBS_TABLE is not None)
         self._engine: Optional[Engine] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
         if not self.enabled:
             return
-        self._engine = create_engine(self.dsn, future=True)
+        if get_persist_async() and get_dispatch_mode() != "db":
+            # A single writer thread keeps inserts ordered and off the request path.
+            # Shared dispatch needs the rows (and slot counter) before the job is visible.
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="opt-persist")
+        self._engine = create_engine(self.dsn, **self._engine_options())
+        if self._is_sqlite() and get_db_sqlite_wal():
+            event.listen(self._engine, "connect", _sqlite_tune_connection)
         if create_tables or self._is_sqlite():
             assert _METADATA is not None
             _METADATA.create_all(self._engine)
+            # Managed schemas (docs/schema.sql) carry their own ALTERs; DDL only runs when asked to.
+            self._ensure_columns()
+
+    def _ensure_columns(self) -> None:
+        """Add columns introduced after a table was created (create_all skips existing tables)."""
+
+        inspector = inspect(self._engine)
+        with self._engine.begin() as conn:
+            for table in (_JOBS_TABLE, _TASKS_TABLE):
+                if not inspector.has_table(table.name):
+                    continue
+                present = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in present:
+                        continue
+                    ddl_type = column.type.compile(dialect=self._engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {ddl_type}"))
+
+    def migrate_task_storage(self, *, compact: bool = True) -> int:
+        """Add and backfill normalized_space/combo_index for existing rows.
+
+        This is the explicit migration step for databases created before those
+        columns; it adds them when missing. With ``compact`` the per-task
+        param_set JSON is emptied once its combo index is known. Returns the
+        number of task rows rewritten.
+        """
+
+        if not self.enabled or not self._engine:
+            return 0
+        self._ensure_columns()
+        jobs = _JOBS_TABLE
+        tasks_table = _TASKS_TABLE
+        rewritten = 0
+        with self._engine.connect() as conn:
+            job_rows = conn.execute(select(jobs.c.id, jobs.c.param_space, jobs.c.normalized_space)).all()
+        for job_row in job_rows:
+            mapping = job_row._mapping
+            normalized = _space_from_json(mapping["normalized_space"])
+            if not normalized:
+                try:
+                    normalized, _ = summarize_param_space(mapping["param_space"] or {})
+                except ParamInvalidError:
+                    continue
+            with self._engine.begin() as conn:
+                if mapping["normalized_space"] is None:
+                    conn.execute(
+                        update(jobs)
+                        .where(jobs.c.id == mapping["id"])
+                        .values(normalized_space=_space_to_json(normalized))
+                    )
+                task_rows = conn.execute(
+                    select(tasks_table.c.id, tasks_table.c.param_set, tasks_table.c.combo_index).where(
+                        tasks_table.c.job_id == mapping["id"]
+                    )
+                ).all()
+                changes: List[Dict[str, Any]] = []
+                for task_row in task_rows:
+                    task_mapping = task_row._mapping
+                    params = task_mapping["param_set"] or {}
+                    combo_index = task_mapping["combo_index"]
+                    if combo_index is None:
+                        combo_index = encode_combo_index(normalized, params)
+                        if combo_index is None:
+                            continue
+                    elif not (compact and params):
+                        continue
+                    changes.append(
+                        {
+                            "b_id": task_mapping["id"],
+                            "b_combo_index": combo_index,
+                            "b_param_set": {} if compact else params,
+                        }
+                    )
+                if changes:
+                    conn.execute(
+                        update(tasks_table)
+                        .where(tasks_table.c.id == bindparam("b_id"))
+                        .values(
+                            combo_index=bindparam("b_combo_index"),
+                            param_set=bindparam("b_param_set", type_=tasks_table.c.param_set.type),
+                        ),
+                        changes,
+                    )
+                    rewritten += len(changes)
+        return rewritten
 
     def _is_sqlite(self) -> bool:
         return bool(self.dsn and self.dsn.lower().startswith("sqlite"))
 
-    def persist_job(self, job: OptimizationJob, tasks: Sequence[OptimizationTask]) -> None:
+    def _engine_options(self) -> Dict[str, Any]:
+        """Pool settings from OPT_DB_POOL_* (in-memory SQLite uses a singleton pool)."""
+
+        options: Dict[str, Any] = {"future": True, "pool_pre_ping": get_db_pool_pre_ping()}
+        if self._is_sqlite() and (":memory:" in self.dsn or self.dsn.rstrip("/").lower() == "sqlite:"):
+            return options
+        options["pool_size"] = get_db_pool_size()
+        options["max_overflow"] = get_db_max_overflow()
+        options["pool_recycle"] = get_db_pool_recycle_seconds()
+        return options
+
+    def persist_job(
+        self,
+        job: OptimizationJob,
+        tasks: Sequence[OptimizationTask],
+        *,
+        on_done: Optional[Callable[[bool], None]] = None,
+    ) -> Optional[Future]:
+        """Insert the job row and its task rows.
+
+        Rows are snapshotted on the calling thread. With OPT_PERSIST_ASYNC (the
+        default) the inserts run on the persistence thread and ``on_done``
+        receives the outcome there; otherwise everything happens inline.
+        """
+
         if not self.enabled or not self._engine:
-            return
-        summary_payload = _summary_to_dict(job.summary)
-        policy_payload = _policy_to_dict(job.early_stop_policy)
-        created_at = _to_datetime(job.created_at)
-        updated_at = _to_datetime(job.updated_at)
-        rows = [
+            return None
+        job_row, task_rows = self._job_rows(job, tasks)
+        if self._executor is None:
+            ok = self._insert_job_rows(job_row, task_rows)
+            if on_done:
+                on_done(ok)
+            return None
+
+        def _run() -> None:
+            ok = self._insert_job_rows(job_row, task_rows)
+            if on_done:
+                on_done(ok)
+
+        future = self._executor.submit(_run)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background inserts; True when none are left pending."""
+
+        pending = list(self._pending)
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    @staticmethod
+    def _job_rows(
+        job: OptimizationJob,
+        tasks: Sequence[OptimizationTask],
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        compact = get_task_storage() == "compact" and bool(job.normalized_space)
+        job_row = {
+            "id": job.id,
+            "owner_id": job.owner_id,
+            "strategy_version_id": job.version_id,
+            "param_space": job.param_space,
+            "normalized_space": _space_to_json(job.normalized_space),
+            "concurrency_limit": job.concurrency_limit,
+            "early_stop_policy": _policy_to_dict(job.early_stop_policy),
+            "status": job.status,
+            "total_tasks": job.total_tasks,
+            "estimate": job.estimate or job.total_tasks,
+            "summary": _summary_to_dict(job.summary),
+            "result_summary_id": None,
+            "created_at": _to_datetime(job.created_at),
+            "updated_at": _to_datetime(job.updated_at),
+        }
+        task_rows = [
             {
                 "id": task.id,
                 "job_id": task.job_id,
                 "owner_id": task.owner_id,
                 "strategy_version_id": task.version_id,
-                "param_set": task.params,
+                # compact rows keep the NOT NULL column but leave decoding to combo_index
+                "param_set": {} if compact and task.combo_index is not None else task.params,
+                "combo_index": task.combo_index,
                 "status": task.status,
                 "progress": task.progress,
                 "retries": task.retries,
-                "next_run_at": task.next_run_at,
+                "next_run_at": _to_datetime(task.next_run_at),
                 "throttled": task.throttled,
                 "error": task.error,
                 "last_error": task.last_error,
@@ -1062,73 +2449,285 @@ class TaskPersistence:
             }
             for task in tasks
         ]
+        return job_row, task_rows
+
+    def _insert_job_rows(self, job_row: Dict[str, Any], task_rows: List[Dict[str, Any]]) -> bool:
         try:
             with self._engine.begin() as conn:
+                conn.execute(insert(_JOBS_TABLE), [job_row])
                 conn.execute(
-                    insert(_JOBS_TABLE),
-                    [
-                        {
-                            "id": job.id,
-                            "owner_id": job.owner_id,
-                            "strategy_version_id": job.version_id,
-                            "param_space": job.param_space,
-                            "concurrency_limit": job.concurrency_limit,
-                            "early_stop_policy": policy_payload,
-                            "status": job.status,
-                            "total_tasks": job.total_tasks,
-                            "estimate": job.estimate or job.total_tasks,
-                            "summary": summary_payload,
-                            "result_summary_id": None,
-                            "created_at": created_at,
-                            "updated_at": updated_at,
-                        }
-                    ],
+                    insert(_JOB_SLOTS_TABLE),
+                    [{"job_id": job_row["id"], "running": 0, "concurrency_limit": job_row["concurrency_limit"]}],
                 )
-                if rows:
-                    conn.execute(insert(_TASKS_TABLE), rows)
+                if task_rows:
+                    self._bulk_insert_tasks(conn, task_rows)
+            return True
         except SQLAlchemyError:  # pragma: no cover - defensive fallback
             # In persistence failures we prefer to keep in-memory state working.
-            pass
+            return False
+
+    def _supports_copy(self) -> bool:
+        dialect = self._engine.dialect if self._engine else None
+        return bool(dialect and dialect.name == "postgresql" and dialect.driver == "psycopg")
+
+    def _bulk_insert_tasks(self, conn: Any, rows: List[Dict[str, Any]]) -> None:
+        if self._supports_copy():
+            self._copy_tasks(conn, rows)
+            return
+        chunk = get_db_bulk_chunk()
+        stmt = insert(_TASKS_TABLE)
+        for start in range(0, len(rows), chunk):
+            conn.execute(stmt, rows[start : start + chunk])
+
+    @staticmethod
+    def _copy_tasks(conn: Any, rows: List[Dict[str, Any]]) -> None:
+        from psycopg.types.json import Jsonb
+
+        columns = list(rows[0].keys())
+        json_columns = {"param_set", "error", "last_error"}
+        statement = f"COPY {_TASKS_TABLE.name} ({', '.join(columns)}) FROM STDIN"
+        driver_conn = conn.connection.driver_connection
+        with driver_conn.cursor() as cursor:
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row(
+                        [
+                            Jsonb(row[name]) if name in json_columns and row[name] is not None else row[name]
+                            for name in columns
+                        ]
+                    )
+
+    @staticmethod
+    def _task_params(task: OptimizationTask) -> Dict[str, Any]:
+        return {
+            "b_id": task.id,
+            "b_status": task.status,
+            "b_progress": task.progress,
+            "b_retries": task.retries,
+            "b_next_run_at": _to_datetime(task.next_run_at),
+            "b_throttled": task.throttled,
+            "b_error": task.error,
+            "b_last_error": task.last_error,
+            "b_result_summary_id": task.result_summary_id,
+            "b_score": task.score,
+            "b_updated_at": _to_datetime(task.updated_at),
+        }
 
     def update_task(self, task: OptimizationTask) -> None:
         if not self.enabled or not self._engine:
             return
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(_UPDATE_TASK_STMT, self._task_params(task))
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            pass
+
+    # ---- shared dispatch (OPT_DISPATCH_MODE=db) ----
+
+    def claim_task(
+        self,
+        owner_id: str,
+        *,
+        job_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically claim the next runnable task for an owner; returns its row.
+
+        A claim first takes a slot on the job's counter row (``running <
+        concurrency_limit``), then flips one queued task to running, in one
+        transaction. Postgres picks the task with FOR UPDATE SKIP LOCKED so
+        replicas never queue behind each other's candidate rows; SQLite
+        serializes writers and uses UPDATE ... RETURNING.
+        """
+
+        if not self.enabled or not self._engine:
+            return None
+        claimed_at = now or _to_datetime(epoch_now())
+        jobs, slots = _JOBS_TABLE, _JOB_SLOTS_TABLE
+        candidates = (
+            select(slots.c.job_id)
+            .join(jobs, jobs.c.id == slots.c.job_id)
+            .where(
+                jobs.c.owner_id == owner_id,
+                jobs.c.status.notin_(_CLAIM_BLOCKED_STATUSES),
+                slots.c.running < slots.c.concurrency_limit,
+            )
+            .order_by(jobs.c.created_at, jobs.c.id)
+        )
+        if job_id:
+            candidates = candidates.where(slots.c.job_id == job_id)
+        try:
+            with self._engine.connect() as conn:
+                job_ids = conn.execute(candidates).scalars().all()
+            for candidate in job_ids:
+                row = self._claim_in_job(candidate, claimed_at)
+                if row is not None:
+                    return row
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return None
+        return None
+
+    def _claim_in_job(self, job_id: str, now: datetime) -> Optional[Dict[str, Any]]:
+        slots, tasks = _JOB_SLOTS_TABLE, _TASKS_TABLE
+        pick = (
+            select(tasks.c.id)
+            .where(
+                tasks.c.job_id == job_id,
+                tasks.c.status == "queued",
+                or_(tasks.c.next_run_at.is_(None), tasks.c.next_run_at <= now),
+            )
+            .order_by(tasks.c.combo_index, tasks.c.created_at, tasks.c.id)
+            .limit(1)
+        )
+        claim = update(tasks).values(
+            status="running",
+            progress=0.0,
+            throttled=False,
+            last_error=None,
+            updated_at=now,
+        )
+        with self._engine.connect() as conn:
+            trans = conn.begin()
+            try:
+                reserved = conn.execute(
+                    update(slots)
+                    .where(slots.c.job_id == job_id, slots.c.running < slots.c.concurrency_limit)
+                    .values(running=slots.c.running + 1)
+                    .returning(slots.c.job_id)
+                ).first()
+                row = None
+                if reserved is not None:
+                    if conn.dialect.name == "postgresql":
+                        task_id = conn.execute(pick.with_for_update(skip_locked=True)).scalar()
+                        if task_id is not None:
+                            row = conn.execute(claim.where(tasks.c.id == task_id).returning(*tasks.c)).first()
+                    else:
+                        row = conn.execute(
+                            claim.where(tasks.c.id == pick.scalar_subquery()).returning(*tasks.c)
+                        ).first()
+                if row is None:
+                    # No slot, or nothing runnable: give the slot back.
+                    trans.rollback()
+                    return None
+                trans.commit()
+                return dict(row._mapping)
+            except BaseException:
+                trans.rollback()
+                raise
+
+    def finish_task(self, task: OptimizationTask) -> bool:
+        """Write a claimed task's outcome and release its slot; False if not claimed."""
+
+        if not self.enabled or not self._engine:
+            return False
+        slots = _JOB_SLOTS_TABLE
+        try:
+            with self._engine.begin() as conn:
+                finished = conn.execute(_FINISH_TASK_STMT, self._task_params(task)).rowcount
+                if finished:
+                    conn.execute(
+                        update(slots)
+                        .where(slots.c.job_id == task.job_id, slots.c.running > 0)
+                        .values(running=slots.c.running - 1)
+                    )
+            return bool(finished)
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return False
+
+    def release_claim(self, task_id: str, job_id: str) -> None:
+        """Undo a claim that was never handed out: requeue the row and free its slot."""
+
+        if not self.enabled or not self._engine:
+            return
+        slots, tasks = _JOB_SLOTS_TABLE, _TASKS_TABLE
+        try:
+            with self._engine.begin() as conn:
+                released = conn.execute(
+                    update(tasks)
+                    .where(tasks.c.id == task_id, tasks.c.status == "running")
+                    .values(status="queued", progress=None)
+                ).rowcount
+                if released:
+                    conn.execute(
+                        update(slots)
+                        .where(slots.c.job_id == job_id, slots.c.running > 0)
+                        .values(running=slots.c.running - 1)
+                    )
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            pass
+
+    def stop_tasks(self, job_id: str, status: str, now: float) -> None:
+        """Give every still-unfinished task of a job ``status`` and free its slots.
+
+        Matches on the stored status, so outcomes other replicas wrote are kept.
+        """
+
+        if not self.enabled or not self._engine:
+            return
+        slots, tasks = _JOB_SLOTS_TABLE, _TASKS_TABLE
+        stopped_at = _to_datetime(now)
         try:
             with self._engine.begin() as conn:
                 conn.execute(
-                    update(_TASKS_TABLE)
-                    .where(_TASKS_TABLE.c.id == task.id)
+                    update(tasks)
+                    .where(tasks.c.job_id == job_id, tasks.c.status.notin_(FINISHED_STATUSES))
                     .values(
-                        status=task.status,
-                        progress=task.progress,
-                        retries=task.retries,
-                        next_run_at=task.next_run_at,
-                        throttled=task.throttled,
-                        error=task.error,
-                        last_error=task.last_error,
-                        result_summary_id=task.result_summary_id,
-                        score=task.score,
-                        updated_at=_to_datetime(task.updated_at),
+                        status=status,
+                        progress=1.0,
+                        throttled=False,
+                        next_run_at=stopped_at,
+                        updated_at=stopped_at,
+                        error=None,
+                        last_error=None,
                     )
                 )
+                conn.execute(update(slots).where(slots.c.job_id == job_id).values(running=0))
         except SQLAlchemyError:  # pragma: no cover - defensive fallback
             pass
 
+    def load_job(self, job_id: str) -> Optional[Tuple[OptimizationJob, List[OptimizationTask]]]:
+        if not self.enabled or not self._engine:
+            return None
+        try:
+            with self._engine.connect() as conn:
+                job_row = conn.execute(select(_JOBS_TABLE).where(_JOBS_TABLE.c.id == job_id)).first()
+                if job_row is None:
+                    return None
+                task_rows = conn.execute(
+                    select(_TASKS_TABLE)
+                    .where(_TASKS_TABLE.c.job_id == job_id)
+                    .order_by(_TASKS_TABLE.c.created_at.nullslast(), _TASKS_TABLE.c.id)
+                ).all()
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return None
+        job = self._row_to_job(job_row)
+        return job, [self._row_to_task(row, job.normalized_space) for row in task_rows]
+
+    def load_task_row(self, task_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled or not self._engine:
+            return None
+        try:
+            with self._engine.connect() as conn:
+                row = conn.execute(select(_TASKS_TABLE).where(_TASKS_TABLE.c.id == task_id)).first()
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return None
+        return dict(row._mapping) if row is not None else None
+
     def update_job(self, job: OptimizationJob) -> None:
         if not self.enabled or not self._engine:
             return
         try:
             with self._engine.begin() as conn:
                 conn.execute(
-                    update(_JOBS_TABLE)
-                    .where(_JOBS_TABLE.c.id == job.id)
-                    .values(
-                        status=job.status,
-                        total_tasks=job.total_tasks,
-                        estimate=job.estimate,
-                        summary=_summary_to_dict(job.summary),
-                        updated_at=_to_datetime(job.updated_at),
-                    )
+                    _UPDATE_JOB_STMT,
+                    {
+                        "b_id": job.id,
+                        "b_status": job.status,
+                        "b_total_tasks": job.total_tasks,
+                        "b_estimate": job.estimate,
+                        "b_summary": _summary_to_dict(job.summary),
+                        "b_updated_at": _to_datetime(job.updated_at),
+                    },
                 )
         except SQLAlchemyError:  # pragma: no cover - defensive fallback
             pass
@@ -1136,42 +2735,140 @@ class TaskPersistence:
     def hydrate(self) -> None:
         if not self.enabled or not self._engine:
             return
+        _install_hydrated(self.load_jobs(owns_job))
+
+    def load_jobs(
+        self, include: Callable[[str], bool]
+    ) -> List[Tuple[OptimizationJob, List[OptimizationTask]]]:
+        """Jobs whose id passes ``include``, with their tasks, in creation order.
+
+        Only the id column is scanned for the whole table; rows of the
+        included jobs are then read LOAD_CHUNK ids at a time, which keeps
+        ``IN (...)`` lists under the drivers' bind-parameter limits.
+        """
+
+        if not self.enabled or not self._engine:
+            return []
+        jobs_table, tasks_table = _JOBS_TABLE, _TASKS_TABLE
+        loaded = []
         try:
             with self._engine.begin() as conn:
-                job_rows = conn.execute(
-                    select(_JOBS_TABLE).order_by(_JOBS_TABLE.c.created_at.nullslast())
-                ).all()
-                job_ids = [row._mapping["id"] for row in job_rows]
-                task_rows: List[Any] = []
-                if job_ids:
-                    task_rows = conn.execute(
-                        select(_TASKS_TABLE)
-                        .where(_TASKS_TABLE.c.job_id.in_(job_ids))
-                        .order_by(_TASKS_TABLE.c.created_at.nullslast(), _TASKS_TABLE.c.id)
-                    ).all()
+                job_ids = [
+                    job_id
+                    for job_id in conn.execute(
+                        select(jobs_table.c.id).order_by(jobs_table.c.created_at.nullslast(), jobs_table.c.id)
+                    ).scalars()
+                    if include(job_id)
+                ]
+                for start in range(0, len(job_ids), LOAD_CHUNK):
+                    chunk = job_ids[start : start + LOAD_CHUNK]
+                    job_rows = {
+                        row._mapping["id"]: row
+                        for row in conn.execute(select(jobs_table).where(jobs_table.c.id.in_(chunk)))
+                    }
+                    task_rows: Dict[str, List[Any]] = {job_id: [] for job_id in chunk}
+                    for row in conn.execute(
+                        select(tasks_table)
+                        .where(tasks_table.c.job_id.in_(chunk))
+                        .order_by(tasks_table.c.created_at.nullslast(), tasks_table.c.id)
+                    ):
+                        task_rows[row._mapping["job_id"]].append(row)
+                    for job_id in chunk:
+                        if job_id not in job_rows:
+                            continue
+                        job = self._row_to_job(job_rows[job_id])
+                        tasks = [self._row_to_task(row, job.normalized_space) for row in task_rows[job_id]]
+                        loaded.append((job, tasks))
         except SQLAlchemyError:  # pragma: no cover - defensive fallback
-            return
+            return []
+        return loaded
+
+    def query_jobs_page(
+        self,
+        owner_id: str,
+        *,
+        before: Optional[Tuple[float, str]],
+        limit: int,
+        statuses: Optional[Collection[str]] = None,
+    ) -> List[OptimizationJob]:
+        """Keyset query over idx_opt_jobs_owner_updated: at most ``limit`` jobs before ``before``."""
 
-        job_map: Dict[str, List[Any]] = {job_id: [] for job_id in job_ids}
-        for row in task_rows:
-            job_map[row._mapping["job_id"]].append(row)
+        if not self.enabled or not self._engine:
+            return []
+        table = _JOBS_TABLE
+        stmt = select(table).where(table.c.owner_id == owner_id)
+        if statuses:
+            stmt = stmt.where(table.c.status.in_(list(statuses)))
+        if before is not None:
+            cursor_at = _to_datetime(before[0])
+            stmt = stmt.where(
+                or_(
+                    table.c.updated_at < cursor_at,
+                    and_(table.c.updated_at == cursor_at, table.c.id < before[1]),
+                )
+            )
+        stmt = stmt.order_by(table.c.updated_at.desc(), table.c.id.desc()).limit(limit)
+        try:
+            with self._engine.connect() as conn:
+                rows = conn.execute(stmt).all()
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return []
+        return [self._row_to_job(row) for row in rows]
 
-        _clear_memory()
-        with _STORE_LOCK:
-            for job_row in job_rows:
-                job = self._row_to_job(job_row)
-                tasks = {}
-                order: List[str] = []
-                for task_row in job_map.get(job.id, []):
-                    task = self._row_to_task(task_row)
-                    tasks[task.id] = task
-                    order.append(task.id)
-                _JOBS[job.id] = job
-                _TASKS[job.id] = tasks
-                _TASK_ORDER[job.id] = order
-                if job.id not in _JOB_ORDER:
-                    _JOB_ORDER.append(job.id)
-                _refresh_summary(job, persist=False)
+    def load_result_summary(self, result_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled or not self._engine:
+            return None
+        table = _RESULTS_TABLE
+        try:
+            with self._engine.connect() as conn:
+                row = conn.execute(select(table).where(table.c.id == result_id)).first()
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            return None
+        if row is None:
+            return None
+        mapping = row._mapping
+        return {
+            "id": mapping["id"],
+            "ownerId": mapping["owner_id"],
+            "metrics": mapping.get("metrics") or {},
+            "artifacts": mapping.get("artifacts") or _build_artifacts(mapping["id"]),
+            "createdAt": format_ts(_to_epoch(mapping.get("created_at"))),
+            "equityCurveRef": mapping.get("equity_curve_ref"),
+            "tradesRef": mapping.get("trades_ref"),
+        }
+
+    def save_result_summary(self, summary: Dict[str, Any]) -> None:
+        if not self.enabled or not self._engine:
+            return
+        table = _RESULTS_TABLE
+        now = _to_datetime(epoch_now())
+        try:
+            with self._engine.begin() as conn:
+                updated = conn.execute(
+                    update(table).where(table.c.id == summary["id"]).values(metrics=summary["metrics"], updated_at=now)
+                ).rowcount
+                if not updated:
+                    conn.execute(
+                        insert(table).values(
+                            id=summary["id"],
+                            owner_id=summary["ownerId"],
+                            source="optimization_task",
+                            metrics=summary["metrics"],
+                            equity_curve_ref=summary.get("equityCurveRef"),
+                            trades_ref=summary.get("tradesRef"),
+                            artifacts=summary.get("artifacts"),
+                            created_at=_to_datetime(summary.get("createdAt")),
+                            updated_at=now,
+                        )
+                    )
+        except SQLAlchemyError:  # pragma: no cover - defensive fallback
+            pass
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._engine is not None:
+            self._engine.dispose()
 
     def reset(self) -> None:
         if not self.enabled or not self._engine:
@@ -1180,6 +2877,8 @@ class TaskPersistence:
             with self._engine.begin() as conn:
                 conn.execute(_TASKS_TABLE.delete())
                 conn.execute(_JOBS_TABLE.delete())
+                conn.execute(_RESULTS_TABLE.delete())
+                conn.execute(_JOB_SLOTS_TABLE.delete())
         except SQLAlchemyError:  # pragma: no cover - defensive fallback
             pass
 
@@ -1191,37 +2890,32 @@ class TaskPersistence:
             owner_id=mapping["owner_id"],
             version_id=mapping["strategy_version_id"],
             param_space=mapping.get("param_space") or {},
-            normalized_space={},
+            normalized_space=_space_from_json(mapping.get("normalized_space")),
             concurrency_limit=mapping.get("concurrency_limit") or 0,
             early_stop_policy=_dict_to_policy(mapping.get("early_stop_policy")),
             status=mapping.get("status") or DEFAULT_STATUS,
             total_tasks=mapping.get("total_tasks") or 0,
             estimate=mapping.get("estimate") or mapping.get("total_tasks") or 0,
         )
-        job.created_at = _to_iso(mapping.get("created_at"))
-        job.updated_at = _to_iso(mapping.get("updated_at"))
-        summary = mapping.get("summary") or {}
-        if isinstance(summary, dict):
-            job.summary = OptimizationSummary(
-                total=int(summary.get("total", job.total_tasks or 0)),
-                finished=int(summary.get("finished", 0)),
-                running=int(summary.get("running", 0)),
-                throttled=int(summary.get("throttled", 0)),
-                top_n=list(summary.get("topN", [])),
-            )
-        else:
-            job.summary = OptimizationSummary(job.total_tasks, 0, 0, 0)
+        job.created_at = _to_epoch(mapping.get("created_at"))
+        job.updated_at = _to_epoch(mapping.get("updated_at"))
+        job.summary = _dict_to_summary(mapping.get("summary"), job.total_tasks)
         return job
 
     @staticmethod
-    def _row_to_task(row: Any) -> OptimizationTask:
+    def _row_to_task(row: Any, normalized: Optional[Dict[str, Sequence[Any]]] = None) -> OptimizationTask:
         mapping = row._mapping
+        params = mapping.get("param_set") or {}
+        combo_index = mapping.get("combo_index")
+        if not params and combo_index is not None and normalized:
+            params = decode_combo_index(normalized, combo_index)
         return OptimizationTask(
             id=mapping["id"],
             job_id=mapping["job_id"],
             owner_id=mapping["owner_id"],
             version_id=mapping["strategy_version_id"],
-            params=mapping.get("param_set") or {},
+            params=params,
+            combo_index=combo_index,
             status=mapping.get("status") or DEFAULT_STATUS,
             progress=mapping.get("progress"),
             retries=mapping.get("retries") or 0,
@@ -1229,14 +2923,28 @@ class TaskPersistence:
             result_summary_id=mapping.get("result_summary_id"),
             score=mapping.get("score"),
             throttled=bool(mapping.get("throttled")),
-            next_run_at=mapping.get("next_run_at") or datetime.utcnow(),
+            next_run_at=_to_epoch(mapping.get("next_run_at")),
             last_error=mapping.get("last_error"),
-            created_at=_to_iso(mapping.get("created_at")),
-            updated_at=_to_iso(mapping.get("updated_at")),
+            created_at=_to_epoch(mapping.get("created_at")),
+            updated_at=_to_epoch(mapping.get("updated_at")),
         )
 
 
-_PERSISTENCE: TaskPersistence = TaskPersistence(None)
+# eventlog:// DSNs select the append-only backend; anything else goes to SQLAlchemy.
+PersistenceBackend = Union[TaskPersistence, "EventLogPersistence"]
+
+
+def _build_persistence(dsn: Optional[str], *, create_tables: bool = False) -> "PersistenceBackend":
+    clean_dsn = (dsn or os.getenv("OPTIMIZATION_DB_DSN") or "").strip()
+    if clean_dsn.lower().startswith(EVENTLOG_DSN_PREFIX):
+        from .eventlog import EventLogPersistence
+
+        return EventLogPersistence(clean_dsn)
+    return TaskPersistence(dsn, create_tables=create_tables)
+
+
+_SHARD_ROUTER: Optional[ShardRouter] = build_shard_router()
+_PERSISTENCE: "PersistenceBackend" = _build_persistence(None)
 if _PERSISTENCE.enabled:
     _PERSISTENCE.hydrate()
 
@@ -1245,17 +2953,165 @@ def configure_persistence(dsn: Optional[str], *, create_tables: bool = False) ->
     """Configure persistence backend (used by tests to switch stores)."""
 
     global _PERSISTENCE
-    _PERSISTENCE = TaskPersistence(dsn, create_tables=create_tables)
+    flush_persistence()
+    _PERSISTENCE.close()
+    _PERSISTENCE = _build_persistence(dsn, create_tables=create_tables)
     if _PERSISTENCE.enabled:
         _PERSISTENCE.hydrate()
     else:
         _clear_memory()
 
 
-def get_persistence() -> TaskPersistence:
+def get_persistence() -> "PersistenceBackend":
     return _PERSISTENCE
 
 
+def configure_sharding(router: Optional[ShardRouter]) -> None:
+    """Switch shard membership (used by tests); re-hydrates so memory holds only the local shard."""
+
+    global _SHARD_ROUTER
+    _SHARD_ROUTER = router
+    if _PERSISTENCE.enabled:
+        flush_persistence()
+        _PERSISTENCE.hydrate()
+
+
+def get_shard_router() -> Optional[ShardRouter]:
+    return _SHARD_ROUTER
+
+
+def owns_job(job_id: str) -> bool:
+    """True when this replica owns ``job_id`` (always, without sharding)."""
+
+    router = _SHARD_ROUTER
+    return router is None or router.is_local(job_id)
+
+
+def refresh_shard_membership() -> bool:
+    """Renew this replica's lease and hand off the jobs that moved if the ring changed.
+
+    The database is the hand-off point. Jobs that left this shard get their
+    running tasks requeued and are dropped from memory; jobs that joined it
+    are loaded on their own, without touching the rest of memory. A joined job
+    whose previous owner is still a member stays fenced (visible but not
+    dispatched) for one lease TTL: by then that replica has either renewed its
+    lease, and with it noticed the change and released the job, or dropped out
+    of the ring. The job is then reloaded and whatever is still running is
+    requeued.
+    """
+
+    router = _SHARD_ROUTER
+    if router is None:
+        return False
+    router.membership.heartbeat()
+    previous = router.ring()
+    changed = router.refresh()
+    if changed and _PERSISTENCE.enabled:
+        _hand_off_shard(previous, router.members())
+    if _HANDOFF_FENCE:
+        _finish_handoffs()
+    return changed
+
+
+def _hand_off_shard(previous: HashRing, members: Collection[str]) -> None:
+    with _STORE_SECTION:
+        moved_out = [job_id for job_id in _JOB_ORDER if not owns_job(job_id)]
+        for job_id in moved_out:
+            _HANDOFF_FENCE[job_id] = float("inf")
+            _requeue_running(_JOBS[job_id])
+    flush_persistence()
+    with _STORE_SECTION:
+        for job_id in moved_out:
+            _HANDOFF_FENCE.pop(job_id, None)
+            _forget_job(job_id)
+        resident = set(_JOBS)
+    loaded = _PERSISTENCE.load_jobs(lambda job_id: owns_job(job_id) and job_id not in resident)
+    fence_until = epoch_now() + get_shard_lease_ttl_seconds()
+    with _STORE_SECTION:
+        for job, tasks in loaded:
+            if job.id in _JOBS:
+                continue
+            _install_job(job, tasks)
+            if previous.node_for(job.id) in members and not uses_db_dispatch():
+                _HANDOFF_FENCE[job.id] = fence_until
+            else:
+                _requeue_running(job)
+        _WORK_READY.notify_all()
+    if moved_out or loaded:
+        emit_metric("shard_jobs_moved_total", float(len(moved_out)), tags={"direction": "out"})
+        emit_metric("shard_jobs_moved_total", float(len(loaded)), tags={"direction": "in"})
+    enforce_retention()
+
+
+def _finish_handoffs() -> None:
+    """Reload fenced jobs whose fence expired and start dispatching them."""
+
+    now = epoch_now()
+    with _STORE_SECTION:
+        due = [job_id for job_id, until in _HANDOFF_FENCE.items() if until <= now]
+    if not due:
+        return
+    # local changes made while fenced (e.g. a cancel) must reach the database first
+    flush_persistence()
+    wanted = set(due)
+    loaded = _PERSISTENCE.load_jobs(wanted.__contains__)
+    with _STORE_SECTION:
+        for job_id in due:
+            _HANDOFF_FENCE.pop(job_id, None)
+            _forget_job(job_id)
+        for job, tasks in loaded:
+            if owns_job(job.id):
+                _install_job(job, tasks)
+                _requeue_running(job)
+        _WORK_READY.notify_all()
+
+
+def _requeue_running(job: OptimizationJob) -> None:
+    """Put tasks whose runner belonged to another replica back in the queue."""
+
+    if uses_db_dispatch():
+        # claims live in the shared database and finish from any replica
+        return
+    now = epoch_now()
+    requeued = False
+    for task in _TASKS.get(job.id, {}).values():
+        if task.status != "running":
+            continue
+        task.status = "queued"
+        task.progress = None
+        task.throttled = False
+        task.next_run_at = task.updated_at = now
+        _persist_task(job, task)
+        requeued = True
+    if requeued:
+        _refresh_summary(job)
+
+
+def _new_job_id() -> str:
+    # New jobs always land in the local shard, so creation never needs a hop.
+    while True:
+        job_id = str(uuid.uuid4())
+        if owns_job(job_id):
+            return job_id
+
+
+def uses_db_dispatch() -> bool:
+    """True when tasks are claimed from the shared database (OPT_DISPATCH_MODE=db)."""
+
+    return get_dispatch_mode() == "db" and isinstance(_PERSISTENCE, TaskPersistence) and _PERSISTENCE.enabled
+
+
+def flush_persistence(timeout: Optional[float] = None) -> bool:
+    """Block until queued writes and background job inserts have finished (never call with the store lock held)."""
+
+    _drain_writes()
+    return _PERSISTENCE.flush(timeout)
+
+
+def get_event_bus() -> JobEventBus:
+    return _EVENTS
+
+
 # ==== Debug helpers ====
 
 def debug_reset():
@@ -1265,17 +3121,18 @@ def debug_reset():
 def debug_reset_persistent():
     """Test helper to clear both memory cache and persistent storage."""
 
+    flush_persistence()
     _clear_memory()
     if _PERSISTENCE.enabled:
         _PERSISTENCE.reset()
 
 
 def debug_jobs() -> Dict[str, OptimizationJob]:
-    with _STORE_LOCK:
+    with _STORE_SECTION:
         return dict(_JOBS)
 
 
 def debug_tasks(job_id: str) -> List[OptimizationTask]:
-    with _STORE_LOCK:
+    with _STORE_SECTION:
         tasks = _TASKS.get(job_id, {})
         return list(tasks.values())
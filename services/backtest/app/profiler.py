@@ -0,0 +1,99 @@
+"""In-process sampling profiler for the live service.
+
+Samples every thread's stack with ``sys._current_frames()`` at a fixed
+interval and aggregates them into collapsed stacks (``root;caller;callee N``),
+the input format of flamegraph.pl, speedscope and inferno. Only one session
+runs at a time.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILE_INTERVAL_MS = 10
+MAX_PROFILE_SECONDS = 60.0
+MAX_STACK_DEPTH = 128
+
+_SESSION_LOCK = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    """Another profiling session is already running."""
+
+    code = "E.PROFILER_BUSY"
+    status = 409
+
+
+def get_profile_interval_ms() -> int:
+    raw = os.getenv("OPT_PROFILE_INTERVAL_MS")
+    if not raw:
+        return DEFAULT_PROFILE_INTERVAL_MS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_PROFILE_INTERVAL_MS
+    return max(1, value)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(thread_name: str, frame) -> str:
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    labels.reverse()
+    return ";".join(label.replace(";", ":") for label in labels)
+
+
+def sample_stacks(seconds: float, *, interval_ms: Optional[int] = None) -> Dict[str, object]:
+    """Sample all threads for ``seconds`` and return collapsed-stack counts.
+
+    Raises ProfilerBusyError when a session is already in progress.
+    """
+
+    if not _SESSION_LOCK.acquire(blocking=False):
+        raise ProfilerBusyError("a profiling session is already running")
+    try:
+        duration = max(0.0, min(float(seconds), MAX_PROFILE_SECONDS))
+        interval = max(1, interval_ms or get_profile_interval_ms()) / 1000.0
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + duration
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stacks[_collapse(names.get(ident, f"thread-{ident}"), frame)] += 1
+            samples += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        return {
+            "samples": samples,
+            "seconds": round(time.perf_counter() - started, 3),
+            "intervalMs": interval * 1000.0,
+            "stacks": dict(stacks),
+        }
+    finally:
+        _SESSION_LOCK.release()
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    """Render stack counts as collapsed-stack text, heaviest first."""
+
+    ordered = sorted(stacks.items(), key=lambda item: (-item[1], item[0]))
+    return "".join(f"{stack} {count}\n" for stack, count in ordered)
@@ -0,0 +1,183 @@
+"""Worker loop that runs tasks leased over HTTP from /internal/tasks/*.
+
+Lets backtest compute run on machines separate from the API replicas:
+
+    python -m services.backtest.app.remote_worker --url http://backtest:8000 \\
+        --owner owner-1 --runner mypkg.runners:run_backtest
+
+The runner receives the task dict (``params`` etc.) and returns what
+``worker.process_next`` runners return: a score, a dict with
+``score``/``resultSummaryId``, or a ``(score, resultSummaryId)`` pair.
+Leases are renewed from a background thread while tasks run. A
+``worker.WarmRunner`` also asks for tasks of its already loaded versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from .worker import WarmRunner, WorkerError, _map_kind, _normalize_result
+
+
+class RemoteWorker:
+    """Lease, run and settle tasks against one orchestrator replica."""
+
+    def __init__(
+        self,
+        base_url: str,
+        owner_id: str,
+        runner: Callable[[Dict[str, Any]], Optional[Any]],
+        *,
+        worker_id: Optional[str] = None,
+        secret: Optional[str] = None,
+        max_tasks: int = 1,
+        wait_seconds: float = 20.0,
+        lease_seconds: Optional[float] = None,
+        client: Optional[httpx.Client] = None,
+    ) -> None:
+        self.owner_id = owner_id
+        self.runner = runner
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.max_tasks = max_tasks
+        self.wait_seconds = wait_seconds
+        self.lease_seconds = lease_seconds
+        headers = {"x-owner-id": owner_id}
+        secret = secret if secret is not None else os.getenv("OPTIMIZATION_ORCHESTRATOR_SECRET")
+        if secret:
+            headers["x-opt-shared-secret"] = secret
+        self._client = client or httpx.Client(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=wait_seconds + 30.0,
+        )
+        self._held: Dict[str, float] = {}
+        self._held_lock = threading.Lock()
+        self.processed = 0
+
+    def run(self, *, exit_when_idle: bool = False) -> int:
+        """Process leases until an empty long-poll (with ``exit_when_idle``) or forever."""
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(stop,), daemon=True)
+        heartbeat.start()
+        try:
+            while True:
+                if self.run_once() == 0 and exit_when_idle:
+                    return self.processed
+        finally:
+            stop.set()
+            heartbeat.join(timeout=1.0)
+
+    def run_once(self) -> int:
+        """Lease one batch and run it; returns how many tasks were leased."""
+
+        response = self._client.post(
+            "/internal/tasks/lease",
+            json={
+                "workerId": self.worker_id,
+                "ownerId": self.owner_id,
+                "maxTasks": self.max_tasks,
+                "waitSeconds": self.wait_seconds,
+                "leaseSeconds": self.lease_seconds,
+                "preferVersions": sorted(self.runner.warm_versions()) if isinstance(self.runner, WarmRunner) else [],
+            },
+        )
+        response.raise_for_status()
+        leases: List[Dict[str, Any]] = response.json()["leases"]
+        with self._held_lock:
+            for lease in leases:
+                self._held[lease["leaseId"]] = float(lease["leaseSeconds"])
+        for lease in leases:
+            try:
+                self._execute(lease)
+            finally:
+                with self._held_lock:
+                    self._held.pop(lease["leaseId"], None)
+        return len(leases)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _execute(self, lease: Dict[str, Any]) -> None:
+        try:
+            score, result_summary_id = _normalize_result(self.runner(lease["task"]))
+        except WorkerError as exc:
+            self._settle("fail", lease, code=_map_kind(exc.kind), message=str(exc))
+            return
+        except Exception as exc:  # pragma: no cover - defensive
+            self._settle("fail", lease, code="INTERNAL_ERROR", message=str(exc)[:200])
+            return
+        self._settle("complete", lease, score=score, resultSummaryId=result_summary_id)
+        self.processed += 1
+
+    def _settle(self, action: str, lease: Dict[str, Any], **body: Any) -> None:
+        response = self._client.post(
+            f"/internal/tasks/{action}",
+            json={"workerId": self.worker_id, "leaseId": lease["leaseId"], **body},
+        )
+        # 404/409: the lease expired, its replica restarted or the job moved;
+        # either way the task went back to the queue and this result is dropped.
+        if response.status_code not in (404, 409):
+            response.raise_for_status()
+
+    def _heartbeat_loop(self, stop: threading.Event) -> None:
+        while True:
+            with self._held_lock:
+                lease_ids = list(self._held)
+                ttl = min(self._held.values(), default=None)
+            if stop.wait((ttl or self.lease_seconds or 30.0) / 3.0):
+                return
+            if not lease_ids:
+                continue
+            try:
+                self._client.post(
+                    "/internal/tasks/heartbeat",
+                    json={"workerId": self.worker_id, "leaseIds": lease_ids},
+                )
+            except httpx.HTTPError:  # pragma: no cover - retried on the next beat
+                continue
+
+
+def _load_runner(path: str) -> Callable[[dict], Optional[Any]]:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--owner", required=True)
+    parser.add_argument("--runner", required=True, help="module:function")
+    parser.add_argument("--worker-id")
+    parser.add_argument("--max-tasks", type=int, default=1)
+    parser.add_argument("--wait-seconds", type=float, default=20.0)
+    parser.add_argument("--lease-seconds", type=float)
+    parser.add_argument("--exit-when-idle", action="store_true")
+    args = parser.parse_args()
+    worker = RemoteWorker(
+        args.url,
+        args.owner,
+        _load_runner(args.runner),
+        worker_id=args.worker_id,
+        max_tasks=args.max_tasks,
+        wait_seconds=args.wait_seconds,
+        lease_seconds=args.lease_seconds,
+    )
+    try:
+        processed = worker.run(exit_when_idle=args.exit_when_idle)
+    finally:
+        worker.close()
+    print(json.dumps({"workerId": worker.worker_id, "processed": processed}))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,112 @@
+"""JSON encoding for the internal API.
+
+Uses orjson when it is installed (the ``fast`` extra) and falls back to the
+stdlib encoder, so the service keeps working without it. Both write
+non-finite floats as null.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+DEFAULT_PAYLOAD_CACHE_SIZE = 1024
+
+
+def get_payload_cache_size() -> int:
+    raw = os.getenv("OPT_PAYLOAD_CACHE_SIZE")
+    if not raw:
+        return DEFAULT_PAYLOAD_CACHE_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_PAYLOAD_CACHE_SIZE
+    return max(0, value)
+
+
+def _null_non_finite(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _null_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_null_non_finite(item) for item in value]
+    return value
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        # NaN/Infinity are not JSON; write null like orjson does.
+        body = json.dumps(_null_non_finite(payload), ensure_ascii=False, separators=(",", ":"))
+    return body.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that skips re-encoding when handed pre-serialized bytes."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
+
+
+class PayloadCache:
+    """LRU of serialized job payloads keyed by (kind, job id).
+
+    Each entry remembers the job revision it was built for; a lookup with a
+    different revision is a miss, so invalidation needs no explicit hooks.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, bytes]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, job_id: str, revision: int) -> Optional[bytes]:
+        if not self.max_entries:
+            return None
+        key = (kind, job_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != revision:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, kind: str, job_id: str, revision: int, body: bytes) -> None:
+        if not self.max_entries:
+            return
+        key = (kind, job_id)
+        with self._lock:
+            self._entries[key] = (revision, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
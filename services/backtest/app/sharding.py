@@ -0,0 +1,231 @@
+"""Consistent-hash sharding of optimization jobs across orchestrator replicas.
+
+Each replica owns the jobs whose id hashes onto it in a ring of virtual nodes,
+hydrates only those and schedules only those; the HTTP layer redirects or
+forwards requests for foreign jobs to their owner. Membership comes either from
+static config (OPT_SHARD_NODES) or from a lease table in a SQLite file shared by
+the replicas (OPT_SHARD_LEASE_DB), where every replica renews its own lease and
+expired leases drop out of the ring.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_SHARD_VNODES = 64
+DEFAULT_SHARD_LEASE_TTL_SECONDS = 30
+SHARD_ROUTING_MODES = ("redirect", "proxy")
+
+
+def get_shard_nodes() -> Dict[str, str]:
+    """Parse OPT_SHARD_NODES (``id=url,id=url``) into an ordered node map."""
+
+    raw = os.getenv("OPT_SHARD_NODES", "")
+    nodes: Dict[str, str] = {}
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        node_id, _, url = item.partition("=")
+        nodes[node_id.strip()] = url.strip().rstrip("/")
+    return nodes
+
+
+def get_shard_self() -> Optional[str]:
+    value = os.getenv("OPT_SHARD_SELF", "").strip()
+    return value or None
+
+
+def get_shard_self_url() -> str:
+    return os.getenv("OPT_SHARD_SELF_URL", "").strip().rstrip("/")
+
+
+def get_shard_lease_db() -> Optional[str]:
+    value = os.getenv("OPT_SHARD_LEASE_DB", "").strip()
+    return value or None
+
+
+def get_shard_vnodes() -> int:
+    raw = os.getenv("OPT_SHARD_VNODES")
+    if not raw:
+        return DEFAULT_SHARD_VNODES
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_SHARD_VNODES
+    return max(1, value)
+
+
+def get_shard_lease_ttl_seconds() -> int:
+    raw = os.getenv("OPT_SHARD_LEASE_TTL_SECONDS")
+    if not raw:
+        return DEFAULT_SHARD_LEASE_TTL_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_SHARD_LEASE_TTL_SECONDS
+    return max(1, value)
+
+
+def get_shard_routing() -> str:
+    """``redirect`` answers 307 with the owner's URL; ``proxy`` forwards the request."""
+
+    value = os.getenv("OPT_SHARD_ROUTING", "redirect").strip().lower()
+    return value if value in SHARD_ROUTING_MODES else "redirect"
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Ring of ``vnodes`` points per node; a key belongs to the next point clockwise."""
+
+    def __init__(self, nodes: Iterable[str], *, vnodes: int = DEFAULT_SHARD_VNODES) -> None:
+        self.nodes: Tuple[str, ...] = tuple(sorted(set(nodes)))
+        points = sorted((_hash(f"{node}#{index}"), node) for node in self.nodes for index in range(vnodes))
+        self._hashes: List[int] = [point for point, _ in points]
+        self._owners: List[str] = [node for _, node in points]
+
+    def node_for(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        pos = bisect.bisect(self._hashes, _hash(key))
+        return self._owners[pos % len(self._owners)]
+
+
+class StaticMembership:
+    """Fixed node map from configuration."""
+
+    def __init__(self, nodes: Dict[str, str]) -> None:
+        self._nodes = dict(nodes)
+
+    def members(self) -> Dict[str, str]:
+        return dict(self._nodes)
+
+    def heartbeat(self) -> None:
+        return None
+
+    def leave(self) -> None:
+        return None
+
+
+class LeaseMembership:
+    """Live members are the replicas whose lease in a shared SQLite file has not expired."""
+
+    def __init__(self, path: str, *, node_id: str, url: str, ttl_seconds: int) -> None:
+        self.path = path
+        self.node_id = node_id
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shard_leases ("
+            " node_id TEXT PRIMARY KEY, url TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.heartbeat()
+
+    def heartbeat(self, now: Optional[float] = None) -> None:
+        expires_at = (time.time() if now is None else now) + self.ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shard_leases (node_id, url, expires_at) VALUES (?, ?, ?)",
+                (self.node_id, self.url, expires_at),
+            )
+
+    def members(self, now: Optional[float] = None) -> Dict[str, str]:
+        cutoff = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node_id, url FROM shard_leases WHERE expires_at >= ? ORDER BY node_id",
+                (cutoff,),
+            ).fetchall()
+        return {node_id: url for node_id, url in rows}
+
+    def leave(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM shard_leases WHERE node_id = ?", (self.node_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+Membership = Union[StaticMembership, LeaseMembership]
+
+
+class ShardRouter:
+    """Maps job ids to the replica that owns them, rebuilding the ring when membership changes."""
+
+    def __init__(self, self_id: str, membership: Membership, *, vnodes: int = DEFAULT_SHARD_VNODES) -> None:
+        self.self_id = self_id
+        self.membership = membership
+        self.vnodes = vnodes
+        self._lock = Lock()
+        self._members: Dict[str, str] = {}
+        self._ring = HashRing((), vnodes=vnodes)
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Re-read membership; True when the set of nodes changed."""
+
+        members = self.membership.members()
+        # A replica always counts itself, even before its first lease is visible.
+        members.setdefault(self.self_id, "")
+        with self._lock:
+            changed = set(members) != set(self._members)
+            self._members = members
+            if changed:
+                self._ring = HashRing(members, vnodes=self.vnodes)
+        return changed
+
+    def ring(self) -> HashRing:
+        """Current ring; rings are immutable, so this is a stable snapshot."""
+
+        with self._lock:
+            return self._ring
+
+    def owner(self, job_id: str) -> str:
+        with self._lock:
+            return self._ring.node_for(job_id) or self.self_id
+
+    def is_local(self, job_id: str) -> bool:
+        return self.owner(job_id) == self.self_id
+
+    def url_for(self, node_id: str) -> Optional[str]:
+        with self._lock:
+            return self._members.get(node_id) or None
+
+    def members(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._members)
+
+
+def build_shard_router() -> Optional[ShardRouter]:
+    """Router from the environment, or None when sharding is not configured."""
+
+    self_id = get_shard_self()
+    if not self_id:
+        return None
+    lease_db = get_shard_lease_db()
+    if lease_db:
+        membership: Membership = LeaseMembership(
+            lease_db,
+            node_id=self_id,
+            url=get_shard_self_url(),
+            ttl_seconds=get_shard_lease_ttl_seconds(),
+        )
+    else:
+        nodes = get_shard_nodes()
+        if not nodes:
+            return None
+        membership = StaticMembership(nodes)
+    return ShardRouter(self_id, membership, vnodes=get_shard_vnodes())
@@ -0,0 +1,182 @@
+"""Job timer context store backing /internal/backtest/start|end.
+
+Timers are bounded by a TTL and a maximum entry count so a `start` whose `end`
+never arrives cannot leak. The SQLite backend shares timers between uvicorn
+workers (or hosts on a shared volume) so `end` measures the real duration even
+when it lands on a different process than `start`.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from .clock import get_clock
+from .observability import Timer, emit_metric
+
+DEFAULT_TIMER_TTL_SECONDS = 6 * 3600
+DEFAULT_TIMER_MAX_ENTRIES = 10_000
+
+
+def get_timer_ttl_seconds() -> int:
+    raw = os.getenv("BACKTEST_TIMER_TTL_SECONDS")
+    if not raw:
+        return DEFAULT_TIMER_TTL_SECONDS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_TIMER_TTL_SECONDS
+    return max(1, value)
+
+
+def get_timer_max_entries() -> int:
+    raw = os.getenv("BACKTEST_TIMER_MAX_ENTRIES")
+    if not raw:
+        return DEFAULT_TIMER_MAX_ENTRIES
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_TIMER_MAX_ENTRIES
+    return max(1, value)
+
+
+def _emit_dropped(expired: int, evicted: int) -> None:
+    if expired:
+        emit_metric("timer_expired_total", float(expired))
+    if evicted:
+        emit_metric("timer_evicted_total", float(evicted))
+
+
+class LocalTimerStore:
+    """Per-process store ordered by start time; oldest entries expire first."""
+
+    def __init__(self, *, ttl_seconds: int, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._timers: "OrderedDict[str, Timer]" = OrderedDict()
+        self._lock = Lock()
+
+    def put(self, job_id: str, timer: Timer) -> None:
+        with self._lock:
+            self._timers.pop(job_id, None)
+            self._timers[job_id] = timer
+            expired = self._purge_locked(get_clock().time())
+            evicted = 0
+            while len(self._timers) > self.max_entries:
+                self._timers.popitem(last=False)
+                evicted += 1
+        _emit_dropped(expired, evicted)
+
+    def pop(self, job_id: str) -> Optional[Timer]:
+        with self._lock:
+            timer = self._timers.pop(job_id, None)
+        if timer is not None and get_clock().time() - timer.started_at > self.ttl_seconds:
+            _emit_dropped(1, 0)
+            return None
+        return timer
+
+    def purge(self) -> int:
+        with self._lock:
+            expired = self._purge_locked(get_clock().time())
+        _emit_dropped(expired, 0)
+        return expired
+
+    def _purge_locked(self, now: float) -> int:
+        cutoff = now - self.ttl_seconds
+        expired = 0
+        while self._timers:
+            job_id, timer = next(iter(self._timers.items()))
+            if timer.started_at >= cutoff:
+                break
+            del self._timers[job_id]
+            expired += 1
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+
+class SqliteTimerStore:
+    """Timer store in a SQLite file shared by every process that opens it."""
+
+    def __init__(self, path: str, *, ttl_seconds: int, max_entries: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_timers (job_id TEXT PRIMARY KEY, started_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_job_timers_started ON job_timers(started_at)")
+
+    def put(self, job_id: str, timer: Timer) -> None:
+        cutoff = get_clock().time() - self.ttl_seconds
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO job_timers (job_id, started_at) VALUES (?, ?)",
+                    (job_id, timer.started_at),
+                )
+                expired = conn.execute("DELETE FROM job_timers WHERE started_at < ?", (cutoff,)).rowcount
+                evicted = conn.execute(
+                    "DELETE FROM job_timers WHERE job_id IN ("
+                    " SELECT job_id FROM job_timers ORDER BY started_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        _emit_dropped(max(expired, 0), max(evicted, 0))
+
+    def pop(self, job_id: str) -> Optional[Timer]:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT started_at FROM job_timers WHERE job_id = ?", (job_id,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM job_timers WHERE job_id = ?", (job_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        started_at = float(row[0])
+        if get_clock().time() - started_at > self.ttl_seconds:
+            _emit_dropped(1, 0)
+            return None
+        return Timer(started_at=started_at)
+
+    def purge(self) -> int:
+        cutoff = get_clock().time() - self.ttl_seconds
+        with self._lock:
+            expired = self._conn.execute("DELETE FROM job_timers WHERE started_at < ?", (cutoff,)).rowcount
+        _emit_dropped(max(expired, 0), 0)
+        return max(expired, 0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM job_timers").fetchone()[0])
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def build_timer_store(url: Optional[str] = None):
+    """Build the store named by BACKTEST_TIMER_STORE (``memory`` or ``sqlite:///path``)."""
+
+    raw = (url if url is not None else os.getenv("BACKTEST_TIMER_STORE", "")).strip()
+    ttl = get_timer_ttl_seconds()
+    max_entries = get_timer_max_entries()
+    if raw.lower().startswith("sqlite:///"):
+        return SqliteTimerStore(raw[len("sqlite:///"):], ttl_seconds=ttl, max_entries=max_entries)
+    return LocalTimerStore(ttl_seconds=ttl, max_entries=max_entries)
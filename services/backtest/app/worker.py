@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Callable, Dict, Optional, Tuple
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple
 
 from . import orchestrator
+from .clock import get_clock
 from .observability import emit_metric, log_end, log_error, log_start
 
+DEFAULT_WARM_CACHE_SIZE = 8
+_MISSING = object()
+
 
 class WorkerError(Exception):
     """Exception raised by worker runners with explicit classification."""
@@ -17,32 +23,186 @@ class WorkerError(Exception):
         self.kind = kind
 
 
+def get_warm_cache_size() -> int:
+    raw = os.getenv("OPT_WORKER_WARM_CACHE_SIZE")
+    if not raw:
+        return DEFAULT_WARM_CACHE_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_WARM_CACHE_SIZE
+    return max(1, value)
+
+
+class WarmRunner:
+    """Runner that keeps loaded strategy versions and price data between tasks.
+
+    ``load(task)`` does the expensive part once per key -- the task's
+    ``versionId`` plus ``data_range(task)`` when given -- and ``run(task,
+    context)`` executes one task against the loaded context. Contexts live in
+    an LRU bounded by ``max_entries`` (OPT_WORKER_WARM_CACHE_SIZE, read on every
+    insert, when omitted); evicted contexts are closed if they have
+    ``close()``, but only once no task checked out by ``context_for`` still
+    uses them. ``process_next`` and ``RemoteWorker`` ask for tasks of the
+    warm versions first.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Mapping[str, Any]], Any],
+        run: Callable[[Mapping[str, Any], Any], Optional[Any]],
+        *,
+        data_range: Optional[Callable[[Mapping[str, Any]], Hashable]] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.load = load
+        self.run = run
+        self.data_range = data_range
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        self._lock = Lock()
+        # id(context) -> checkouts not yet released, and evicted contexts waiting on them
+        self._in_use: Dict[int, int] = {}
+        self._retired: Dict[int, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, task: Mapping[str, Any]) -> Optional[Any]:
+        context = self.context_for(task)
+        try:
+            return self.run(task, context)
+        finally:
+            self.release(context)
+
+    def context_for(self, task: Mapping[str, Any]) -> Any:
+        """Check out the loaded context for ``task``, loading it on a miss.
+
+        Pair every call with ``release(context)``; an evicted context is
+        closed when its last checkout is released.
+        """
+
+        key = (task["versionId"], self.data_range(task) if self.data_range else None)
+        with self._lock:
+            context = self._entries.get(key, _MISSING)
+            if context is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._in_use[id(context)] = self._in_use.get(id(context), 0) + 1
+        hit = context is not _MISSING
+        stale: List[Any] = []
+        evicted = 0
+        if not hit:
+            # Loaded outside the lock so other versions keep being served meanwhile.
+            loaded = self.load(task)
+            with self._lock:
+                self.misses += 1
+                context = self._entries.setdefault(key, loaded)
+                if context is not loaded:
+                    # another thread loaded the same key first; keep its copy
+                    stale.append(loaded)
+                self._in_use[id(context)] = self._in_use.get(id(context), 0) + 1
+                limit = self.max_entries or get_warm_cache_size()
+                while len(self._entries) > limit:
+                    stale.extend(self._retire(self._entries.popitem(last=False)[1]))
+                    evicted += 1
+                self.evictions += evicted
+        for old in stale:
+            _close_quietly(old)
+        tags = {"versionId": key[0], "ownerId": task.get("ownerId")}
+        emit_metric("runner_cache_hit_total" if hit else "runner_cache_miss_total", 1.0, tags=tags)
+        if evicted:
+            emit_metric("runner_cache_evictions_total", float(evicted), tags=tags)
+        emit_metric("runner_cache_hit_ratio", self.stats()["hitRatio"], tags={"ownerId": tags["ownerId"]})
+        return context
+
+    def release(self, context: Any) -> None:
+        """Give back a context from ``context_for``; closes it if it was evicted meanwhile."""
+
+        with self._lock:
+            count = self._in_use.get(id(context), 0) - 1
+            if count > 0:
+                self._in_use[id(context)] = count
+                return
+            self._in_use.pop(id(context), None)
+            retired = self._retired.pop(id(context), _MISSING)
+        if retired is not _MISSING:
+            _close_quietly(retired)
+
+    def _retire(self, context: Any) -> List[Any]:
+        # Called under the lock: contexts still checked out are closed by release().
+        if id(context) in self._in_use:
+            self._retired[id(context)] = context
+            return []
+        return [context]
+
+    def warm_versions(self) -> Set[str]:
+        with self._lock:
+            return {version_id for version_id, _ in self._entries}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRatio": self._hit_ratio(),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            stale = [old for context in self._entries.values() for old in self._retire(context)]
+            self._entries.clear()
+        for context in stale:
+            _close_quietly(context)
+
+    def _hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _close_quietly(context: Any) -> None:
+    close = getattr(context, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:  # pragma: no cover - defensive
+            pass
+
+
 def process_next(
     owner_id: str,
-    runner: Callable[[dict], Optional[Any]],
+    runner: Callable[[Dict[str, Any]], Optional[Any]],
+    *,
+    timeout: Optional[float] = None,
 ) -> Optional[dict]:
     """Fetch the next task, execute runner, and record metrics.
 
-    Returns a dict with task outcome or None if no task available.
+    Returns a dict with task outcome or None if no task available. With
+    ``timeout`` an idle worker blocks until work is ready instead of polling.
+    The runner receives the task dict, the same payload remote workers get;
+    it is built from the dequeued ``orchestrator.TaskHandle`` outside the
+    store lock. A WarmRunner gets tasks of its already loaded versions first.
     """
 
-    task = orchestrator.dequeue_next(owner_id)
-    if not task:
+    prefer = runner.warm_versions() if isinstance(runner, WarmRunner) else None
+    task = orchestrator.dequeue_task(owner_id, timeout=timeout, prefer_versions=prefer)
+    if task is None:
         emit_metric("active_jobs", 0.0, tags={"ownerId": owner_id})
         return None
 
-    job_id = task["jobId"]
-    task_id = task["id"]
-    created_at = _parse_iso(task.get("createdAt"))
-    wait_seconds = max((datetime.utcnow() - created_at).total_seconds(), 0.0)
+    job_id = task.job_id
+    task_id = task.id
+    wait_seconds = max(get_clock().time() - task.created_at, 0.0)
     tags = {"jobId": job_id, "taskId": task_id, "ownerId": owner_id}
     emit_metric("queue_wait_seconds", wait_seconds, tags=tags)
 
-    timer = log_start(job_id, owner_id, retry=task.get("retries", 0))
+    timer = log_start(job_id, owner_id, retry=task.retries)
     try:
-        result = runner(task)
+        result = runner(task.to_dict())
         score, result_summary_id = _normalize_result(result)
-        payload = orchestrator.mark_task_succeeded(
+        payload = orchestrator.complete_task(
             job_id,
             task_id,
             score=score,
@@ -50,19 +210,25 @@ def process_next(
         )
         duration_seconds = timer.ms() / 1000.0
         log_end(job_id, owner_id, timer)
-        _emit_metrics(duration_seconds, payload.get("retries"), tags)
+        _emit_metrics(duration_seconds, payload.retries, tags)
         _emit_active_jobs(job_id, owner_id)
         return {
             "status": "succeeded",
             "taskId": task_id,
-            "taskStatus": payload.get("status"),
-            "score": payload.get("score"),
-            "resultSummaryId": payload.get("resultSummaryId"),
-            "retries": payload.get("retries"),
+            "taskStatus": payload.status,
+            "score": payload.score,
+            "resultSummaryId": payload.result_summary_id,
+            "retries": payload.retries,
         }
+    except orchestrator.JobAccessError as exc:
+        if exc.code != "E.JOB_MOVED":
+            raise
+        # The job changed replicas mid-run; its new owner requeued the task.
+        emit_metric("task_handoff_dropped_total", 1.0, tags=tags)
+        return {"status": "handed-off", "taskId": task_id}
     except WorkerError as exc:
         error_code = _map_kind(exc.kind)
-        failure = orchestrator.mark_task_failed(
+        failure = orchestrator.fail_task(
             job_id,
             task_id,
             error_type=error_code,
@@ -74,20 +240,20 @@ def process_next(
             owner_id,
             code=error_code,
             message=str(exc),
-            retry=failure.get("retries", 0),
+            retry=failure.retries,
         )
-        _emit_metrics(duration_seconds, failure.get("retries"), tags)
+        _emit_metrics(duration_seconds, failure.retries, tags)
         _emit_active_jobs(job_id, owner_id)
         return {
             "status": "failed",
             "taskId": task_id,
-            "taskStatus": failure.get("status"),
+            "taskStatus": failure.status,
             "error": error_code,
-            "retries": failure.get("retries"),
+            "retries": failure.retries,
         }
     except Exception as exc:  # pragma: no cover - defensive
         error_code = "INTERNAL_ERROR"
-        failure = orchestrator.mark_task_failed(
+        failure = orchestrator.fail_task(
             job_id,
             task_id,
             error_type=error_code,
@@ -99,16 +265,16 @@ def process_next(
             owner_id,
             code=error_code,
             message=str(exc),
-            retry=failure.get("retries", 0),
+            retry=failure.retries,
         )
-        _emit_metrics(duration_seconds, failure.get("retries"), tags)
+        _emit_metrics(duration_seconds, failure.retries, tags)
         _emit_active_jobs(job_id, owner_id)
         return {
             "status": "failed",
             "taskId": task_id,
-            "taskStatus": failure.get("status"),
+            "taskStatus": failure.status,
             "error": error_code,
-            "retries": failure.get("retries"),
+            "retries": failure.retries,
         }
 
 
@@ -139,11 +305,9 @@ def _normalize_result(result: Any) -> Tuple[Optional[float], Optional[str]]:
 
 
 def _emit_active_jobs(job_id: str, owner_id: str) -> None:
-    snapshot = orchestrator.get_job_status(job_id, owner_id)
-    running = snapshot["summary"]["running"]
     emit_metric(
         "active_jobs",
-        running,
+        orchestrator.running_count(job_id),
         tags={"jobId": job_id, "ownerId": owner_id},
     )
 
@@ -155,13 +319,3 @@ def _map_kind(kind: Optional[str]) -> str:
         "internal": "INTERNAL_ERROR",
     }
     return mapping.get((kind or "internal").lower(), "INTERNAL_ERROR")
-
-
-def _parse_iso(value: Optional[str]) -> datetime:
-    if not value:
-        return datetime.utcnow()
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        # fallback for timestamps missing microseconds
-        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,77 @@
+"""Task update throughput and restart time: SQLite (WAL) vs the event log.
+
+    python -m services.backtest.benchmarks.bench_eventlog --updates 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from services.backtest.app import orchestrator
+from services.backtest.app.eventlog import EventLogPersistence
+from services.backtest.app.orchestrator import TaskPersistence
+
+PARAM_SPACE = {"x": list(range(100))}
+
+
+def _measure(build: Callable[[], Any], updates: int) -> Dict[str, float]:
+    persistence = build()
+    normalized, _ = orchestrator.summarize_param_space(PARAM_SPACE)
+    tasks = list(orchestrator._generate_tasks("bench-job", "bench-owner", "v", normalized, 4))
+    job = orchestrator.OptimizationJob(
+        id="bench-job",
+        owner_id="bench-owner",
+        version_id="v",
+        param_space=PARAM_SPACE,
+        normalized_space=normalized,
+        total_tasks=len(tasks),
+    )
+    persistence.persist_job(job, tasks)
+    persistence.flush()
+    started = time.perf_counter()
+    for index in range(updates):
+        task = tasks[index % len(tasks)]
+        task.retries = index
+        task.updated_at = orchestrator.epoch_now()
+        persistence.update_task(task)
+    elapsed = time.perf_counter() - started
+    persistence.close()
+
+    started = time.perf_counter()
+    reader = build()
+    reader.hydrate()
+    restart = time.perf_counter() - started
+    reader.close()
+    orchestrator.debug_reset()
+    return {"ups": updates / elapsed, "restart_ms": restart * 1000.0}
+
+
+def run(updates: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"updates": updates}
+    with tempfile.TemporaryDirectory() as workdir:
+        sqlite_dsn = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        eventlog_dsn = f"eventlog://{os.path.join(workdir, 'log')}"
+        for name, build in (
+            ("sqlite_wal", lambda: TaskPersistence(sqlite_dsn, create_tables=True)),
+            ("eventlog", lambda: EventLogPersistence(eventlog_dsn)),
+        ):
+            measured = _measure(build, updates)
+            results[f"{name}_ups"] = measured["ups"]
+            results[f"{name}_restart_ms"] = measured["restart_ms"]
+    return results
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.updates), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
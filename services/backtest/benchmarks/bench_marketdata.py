@@ -0,0 +1,128 @@
+"""OHLCV load time: per-symbol CSV parsing vs the memory-mapped columnar store.
+
+Writes ``--symbols`` synthetic daily series of ``--rows`` bars both as one CSV
+per symbol and as a marketdata store, then times what a runner does per
+task: load one symbol's full history (CSV into NumPy arrays vs ``bars()``
+views, with and without touching every close) and a one-year range.
+
+    python -m services.backtest.benchmarks.bench_marketdata --symbols 200 --rows 2500
+
+The store side runs against a warm page cache, which is the steady state of
+a worker host; the first task after boot also pays the disk read.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from services.backtest.app import marketdata
+
+START = date(2014, 1, 1)
+
+
+def _series(rng: random.Random, rows: int) -> List[List[Any]]:
+    price = rng.uniform(10.0, 500.0)
+    bars = []
+    for day in range(rows):
+        close = max(1.0, price * (1.0 + rng.gauss(0.0, 0.02)))
+        high = max(price, close) * (1.0 + abs(rng.gauss(0.0, 0.005)))
+        low = min(price, close) * (1.0 - abs(rng.gauss(0.0, 0.005)))
+        bars.append([(START + timedelta(days=day)).isoformat(), price, high, low, close, rng.randrange(10**4, 10**7)])
+        price = close
+    return bars
+
+
+def _write_inputs(workdir: str, symbols: int, rows: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    csv_dir = os.path.join(workdir, "csv")
+    os.makedirs(csv_dir)
+    paths = []
+    for index in range(symbols):
+        path = os.path.join(csv_dir, f"SYM{index:04d}.csv")
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["date", "open", "high", "low", "close", "volume"])
+            writer.writerows(_series(rng, rows))
+        paths.append(path)
+    return paths
+
+
+def _load_csv(path: str) -> Dict[str, Any]:
+    columns = marketdata.read_csv(path)
+    return {
+        "ts": np.asarray([marketdata.to_epoch_seconds(value) for value in columns["ts"]], dtype=np.int64),
+        **{name: np.asarray(columns[name], dtype=marketdata.COLUMNS[name]) for name in columns if name != "ts"},
+    }
+
+
+def _median_ms(names: List[str], load: Callable[[str], Any]) -> float:
+    samples = []
+    for name in names:
+        started = time.perf_counter()
+        load(name)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def run(symbols: int, rows: int, *, seed: int = 7) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_paths = _write_inputs(workdir, symbols, rows, seed)
+        store_path = os.path.join(workdir, "store")
+        started = time.perf_counter()
+        marketdata.import_csv(store_path, csv_paths)
+        import_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store = marketdata.ColumnarStore(store_path)
+        open_ms = (time.perf_counter() - started) * 1000.0
+        names = store.symbols()
+        by_name = dict(zip(names, csv_paths))
+        year_start = START + timedelta(days=rows // 2)
+        year_end = year_start + timedelta(days=365)
+
+        csv_ms = _median_ms(names, lambda name: _load_csv(by_name[name]))
+        view_ms = _median_ms(names, store.bars)
+        touch_ms = _median_ms(names, lambda name: float(store.bars(name).close.sum()))
+        range_ms = _median_ms(names, lambda name: float(store.bars(name, year_start, year_end).close.sum()))
+        csv_bytes = sum(os.path.getsize(path) for path in csv_paths)
+        store_bytes = sum(
+            os.path.getsize(os.path.join(store_path, name)) for name in os.listdir(store_path)
+        )
+        store.close()
+    return {
+        "symbols": symbols,
+        "rows_per_symbol": rows,
+        "import_seconds": round(import_seconds, 3),
+        "csv_bytes": csv_bytes,
+        "store_bytes": store_bytes,
+        "store_open_ms": round(open_ms, 4),
+        "csv_load_ms_per_symbol": round(csv_ms, 4),
+        "store_bars_ms_per_symbol": round(view_ms, 4),
+        "store_bars_sum_ms_per_symbol": round(touch_ms, 4),
+        "store_one_year_sum_ms_per_symbol": round(range_ms, 4),
+        "speedup_vs_csv": round(csv_ms / touch_ms, 1) if touch_ms else None,
+    }
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.symbols, args.rows, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
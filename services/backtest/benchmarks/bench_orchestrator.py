@@ -0,0 +1,254 @@
+"""Orchestrator scaling scenarios with machine-readable results and regression checks.
+
+Scenarios, each run against the in-memory store and SQLite persistence:
+job creation at 10/100/1000 tasks, dequeue+complete throughput with 1/8/32
+threads, status polling latency while workers drain a job, cancel of a
+1000-task job, and hydrate of a large history (SQLite only).
+
+    python -m services.backtest.benchmarks.bench_orchestrator --output current.json
+    python -m services.backtest.benchmarks.bench_orchestrator --baseline main.json --threshold 0.2
+
+With ``--baseline`` the run exits non-zero when any metric is worse than the
+baseline by more than ``--threshold`` (a fraction; 0.2 = 20%).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from services.backtest.app import orchestrator
+
+BACKENDS = ("memory", "sqlite")
+CREATE_SIZES = (10, 100, 1000)
+THREAD_COUNTS = (1, 8, 32)
+ENV_OVERRIDES = {
+    "OPT_PARAM_SPACE_MAX": str(orchestrator.MAX_TASK_CAP),
+    "OPT_CONCURRENCY_LIMIT_MAX": "64",
+    "OPT_RETAIN_TERMINAL_PER_OWNER": str(10**9),
+    "OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS": "0",
+}
+OWNER = "bench-owner"
+
+
+def _metric(value: float, unit: str, higher_is_better: bool) -> Dict[str, Any]:
+    return {"value": round(value, 4), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _create(tasks: int, concurrency: int = 64) -> str:
+    return orchestrator.create_optimization_job(
+        owner_id=OWNER,
+        version_id="bench",
+        param_space={"x": list(range(tasks))},
+        concurrency_limit=concurrency,
+    )["id"]
+
+
+def _drain(threads: int) -> int:
+    done = [0]
+    guard = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            task = orchestrator.dequeue_next(OWNER)
+            if task is None:
+                return
+            orchestrator.mark_task_succeeded(task["jobId"], task["id"], score=float(task["params"]["x"]))
+            with guard:
+                done[0] += 1
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return done[0]
+
+
+def _scenario_create(tasks: int, repeats: int) -> Dict[str, Any]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        _create(tasks)
+        samples.append((time.perf_counter() - started) * 1000.0)
+        orchestrator.flush_persistence()
+    return _metric(statistics.median(samples), "ms", False)
+
+
+def _scenario_throughput(threads: int, tasks: int) -> Dict[str, Any]:
+    # Concurrency at least the thread count, so threads compete for tasks rather than slots.
+    _create(tasks, concurrency=max(threads, 8))
+    orchestrator.flush_persistence()
+    started = time.perf_counter()
+    done = _drain(threads)
+    elapsed = time.perf_counter() - started
+    return _metric(done / elapsed, "tasks/s", True)
+
+
+def _scenario_status_under_load(tasks: int) -> Dict[str, Dict[str, Any]]:
+    job_id = _create(tasks, concurrency=8)
+    orchestrator.flush_persistence()
+    samples: List[float] = []
+    drainer = threading.Thread(target=_drain, args=(8,))
+    drainer.start()
+    while drainer.is_alive() or not samples:
+        started = time.perf_counter()
+        orchestrator.get_job_status(job_id, OWNER)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    drainer.join()
+    return {
+        "status_poll_p50": _metric(_percentile(samples, 50), "ms", False),
+        "status_poll_p99": _metric(_percentile(samples, 99), "ms", False),
+    }
+
+
+def _scenario_cancel(repeats: int) -> Dict[str, Any]:
+    samples = []
+    for _ in range(repeats):
+        job_id = _create(orchestrator.MAX_TASK_CAP)
+        orchestrator.flush_persistence()
+        started = time.perf_counter()
+        orchestrator.cancel_job(job_id, OWNER, reason="bench")
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return _metric(statistics.median(samples), "ms", False)
+
+
+def _scenario_hydrate(dsn: str, jobs: int) -> Dict[str, Any]:
+    for _ in range(jobs):
+        _create(200)
+    orchestrator.flush_persistence()
+    started = time.perf_counter()
+    orchestrator.configure_persistence(dsn)
+    return _metric((time.perf_counter() - started) * 1000.0, "ms", False)
+
+
+@contextmanager
+def _backend(name: str) -> Iterator[Optional[str]]:
+    if name == "memory":
+        orchestrator.configure_persistence(None)
+        try:
+            yield None
+        finally:
+            orchestrator.debug_reset()
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        dsn = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        orchestrator.configure_persistence(dsn, create_tables=True)
+        try:
+            yield dsn
+        finally:
+            orchestrator.debug_reset_persistent()
+            orchestrator.configure_persistence(None)
+
+
+def _isolated(backend: str, scenario: Callable[[Optional[str]], Any]) -> Any:
+    with _backend(backend) as dsn:
+        return scenario(dsn)
+
+
+def run(*, quick: bool = False, backends: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run every scenario and return ``{"meta": ..., "metrics": {name: metric}}``."""
+
+    scale = 0.1 if quick else 1.0
+    repeats = 3 if quick else 10
+    drain_tasks = int(orchestrator.MAX_TASK_CAP * scale) or 1
+    history_jobs = int(200 * scale) or 1
+    previous = {key: os.environ.get(key) for key in ENV_OVERRIDES}
+    os.environ.update(ENV_OVERRIDES)
+    metrics: Dict[str, Dict[str, Any]] = {}
+    try:
+        for backend in backends or BACKENDS:
+            for size in CREATE_SIZES:
+                metrics[f"{backend}.create_{size}"] = _isolated(
+                    backend, lambda _dsn, size=size: _scenario_create(size, repeats)
+                )
+            for threads in THREAD_COUNTS:
+                metrics[f"{backend}.dequeue_complete_{threads}t"] = _isolated(
+                    backend, lambda _dsn, threads=threads: _scenario_throughput(threads, drain_tasks)
+                )
+            for name, metric in _isolated(backend, lambda _dsn: _scenario_status_under_load(drain_tasks)).items():
+                metrics[f"{backend}.{name}"] = metric
+            metrics[f"{backend}.cancel_{orchestrator.MAX_TASK_CAP}"] = _isolated(
+                backend, lambda _dsn: _scenario_cancel(repeats)
+            )
+            if backend != "memory":
+                metrics[f"{backend}.hydrate_{history_jobs}x200"] = _isolated(
+                    backend, lambda dsn: _scenario_hydrate(dsn, history_jobs)
+                )
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "ts": orchestrator.iso_now(),
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Metrics present in both runs that got worse by more than ``threshold``."""
+
+    regressions = []
+    for name, metric in current["metrics"].items():
+        before = baseline.get("metrics", {}).get(name)
+        if not before or not before["value"]:
+            continue
+        change = (metric["value"] - before["value"]) / before["value"]
+        worse = -change if metric["higher_is_better"] else change
+        if worse > threshold:
+            regressions.append(
+                {
+                    "metric": name,
+                    "baseline": before["value"],
+                    "current": metric["value"],
+                    "worse_by": round(worse, 4),
+                }
+            )
+    return regressions
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    parser.add_argument("--backend", action="append", choices=BACKENDS)
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    results = run(quick=args.quick, backends=args.backend)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            results["regressions"] = compare(json.load(handle), results, args.threshold)
+    body = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(body)
+    print(body)
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
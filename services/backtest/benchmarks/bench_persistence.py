@@ -0,0 +1,99 @@
+"""TaskPersistence update throughput (updates/second) per configuration.
+
+Compares SQLite with and without WAL + synchronous=NORMAL, and the prepared
+update statement against rebuilding the UPDATE construct on every call.
+
+    python -m services.backtest.benchmarks.bench_persistence --updates 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from services.backtest.app import orchestrator
+from services.backtest.app.orchestrator import OptimizationTask, TaskPersistence
+
+
+def _legacy_update_task(persistence: TaskPersistence, task: OptimizationTask) -> None:
+    # The pre-tuning write path: a fresh construct (and compile-cache lookup) per call.
+    table = orchestrator._TASKS_TABLE
+    with persistence._engine.begin() as conn:
+        conn.execute(
+            orchestrator.update(table)
+            .where(table.c.id == task.id)
+            .values(
+                status=task.status,
+                progress=task.progress,
+                retries=task.retries,
+                next_run_at=orchestrator._to_datetime(task.next_run_at),
+                throttled=task.throttled,
+                error=task.error,
+                last_error=task.last_error,
+                result_summary_id=task.result_summary_id,
+                score=task.score,
+                updated_at=orchestrator._to_datetime(task.updated_at),
+            )
+        )
+
+
+def _measure(wal: bool, prepared: bool, updates: int, workdir: str) -> float:
+    os.environ["OPT_DB_SQLITE_WAL"] = "true" if wal else "false"
+    path = os.path.join(workdir, f"bench-{int(wal)}-{int(prepared)}.sqlite")
+    persistence = TaskPersistence(f"sqlite:///{path}", create_tables=True)
+    job_space = {"x": list(range(100))}
+    normalized, _ = orchestrator.summarize_param_space(job_space)
+    tasks: List[OptimizationTask] = list(
+        orchestrator._generate_tasks("bench-job", "bench-owner", "v", normalized, 4)
+    )
+    job = orchestrator.OptimizationJob(
+        id="bench-job",
+        owner_id="bench-owner",
+        version_id="v",
+        param_space=job_space,
+        total_tasks=len(tasks),
+    )
+    persistence.persist_job(job, tasks)
+    persistence.flush()
+    write = persistence.update_task if prepared else (lambda task: _legacy_update_task(persistence, task))
+    started = time.perf_counter()
+    for index in range(updates):
+        task = tasks[index % len(tasks)]
+        task.retries = index
+        task.updated_at = orchestrator.epoch_now()
+        write(task)
+    elapsed = time.perf_counter() - started
+    persistence._engine.dispose()
+    return updates / elapsed
+
+
+def run(updates: int) -> Dict[str, Any]:
+    previous = os.environ.get("OPT_DB_SQLITE_WAL")
+    results: Dict[str, Any] = {"updates": updates}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for wal in (False, True):
+                for prepared in (False, True):
+                    name = f"{'wal' if wal else 'rollback'}_{'prepared' if prepared else 'rebuilt'}_ups"
+                    results[name] = _measure(wal, prepared, updates, workdir)
+    finally:
+        if previous is None:
+            os.environ.pop("OPT_DB_SQLITE_WAL", None)
+        else:
+            os.environ["OPT_DB_SQLITE_WAL"] = previous
+    return results
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.updates), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
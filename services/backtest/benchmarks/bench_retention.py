@@ -0,0 +1,88 @@
+"""Orchestrator memory over time with and without terminal-job retention.
+
+Simulates a long-running process: each round creates ``--jobs-per-round``
+jobs of ``--tasks`` tasks, runs them to completion and sweeps retention.
+Both runs persist to a throwaway SQLite file, since retention only archives
+to persistence. Traced memory (tracemalloc) is sampled after every round.
+
+    python -m services.backtest.benchmarks.bench_retention --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from typing import Any, Dict, List
+
+from services.backtest.app import orchestrator
+
+ENV_KEYS = ("OPT_RETAIN_TERMINAL_PER_OWNER", "OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS", "OPT_PARAM_SPACE_MAX")
+
+
+def _simulate(rounds: int, jobs_per_round: int, tasks: int) -> List[float]:
+    workdir = tempfile.mkdtemp(prefix="bench-retention-")
+    orchestrator.configure_persistence(f"sqlite:///{os.path.join(workdir, 'jobs.sqlite')}", create_tables=True)
+    orchestrator.debug_reset()
+    samples: List[float] = []
+    tracemalloc.start()
+    try:
+        for round_index in range(rounds):
+            for job_index in range(jobs_per_round):
+                job_id = orchestrator.create_optimization_job(
+                    owner_id=f"owner-{job_index % 4}",
+                    version_id=f"v-{round_index}",
+                    param_space={"x": list(range(tasks))},
+                    concurrency_limit=orchestrator.get_concurrency_limit_max(),
+                )["id"]
+                owner_id = orchestrator.debug_jobs()[job_id].owner_id
+                while True:
+                    task = orchestrator.dequeue_next(owner_id, job_id)
+                    if task is None:
+                        break
+                    orchestrator.mark_task_succeeded(job_id, task["id"], score=float(task["params"]["x"]))
+            orchestrator.flush_persistence()
+            orchestrator.enforce_retention()
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append(round(current / 1024.0 / 1024.0, 2))
+    finally:
+        tracemalloc.stop()
+        orchestrator.debug_reset_persistent()
+        orchestrator.configure_persistence(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return samples
+
+
+def run(rounds: int, jobs_per_round: int, tasks: int) -> Dict[str, Any]:
+    previous = {key: os.environ.get(key) for key in ENV_KEYS}
+    os.environ["OPT_PARAM_SPACE_MAX"] = str(max(tasks, orchestrator.DEFAULT_LIMIT))
+    results: Dict[str, Any] = {"rounds": rounds, "jobs_per_round": jobs_per_round, "tasks": tasks}
+    try:
+        os.environ["OPT_RETAIN_TERMINAL_PER_OWNER"] = str(10**9)
+        os.environ["OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS"] = "0"
+        results["unbounded_mib"] = _simulate(rounds, jobs_per_round, tasks)
+        os.environ["OPT_RETAIN_TERMINAL_PER_OWNER"] = "5"
+        results["retained_mib"] = _simulate(rounds, jobs_per_round, tasks)
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return results
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--jobs-per-round", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rounds, args.jobs_per_round, args.tasks)))
+
+
+if __name__ == "__main__":
+    main_cli()
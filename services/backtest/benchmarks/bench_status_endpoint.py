@@ -0,0 +1,121 @@
+"""Requests/second on GET /internal/optimizations/{id}/status.
+
+Compares the pre-cache handler (dict -> FastAPI encoder -> stdlib json) with
+the serialized-payload path, with and without orjson and the revision cache.
+
+    python -m services.backtest.benchmarks.bench_status_endpoint --tasks 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+import httpx
+from fastapi import Depends, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from services.backtest.app import main, orchestrator, serialization
+from services.backtest.app.serialization import PayloadCache
+
+OWNER = "bench-owner"
+
+
+async def _legacy_status(
+    job_id: str,
+    _secret: None = Depends(main.require_internal_secret),
+    owner_header: Optional[str] = Header(None, alias="x-owner-id"),
+):
+    # Mirrors the handler before the fast path: return the dict, let FastAPI encode it.
+    return orchestrator.get_job_status(job_id, owner_header)
+
+
+def _measure_handler(build, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    return iterations / (time.perf_counter() - started)
+
+
+async def _measure(path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    headers = {"x-owner-id": OWNER}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(20):
+            await client.get(path, headers=headers)
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+        elapsed = time.perf_counter() - started
+    return requests / elapsed
+
+
+def run(tasks: int, requests: int) -> Dict[str, Any]:
+    os.environ.pop("OPTIMIZATION_ORCHESTRATOR_SECRET", None)
+    os.environ["OPT_PARAM_SPACE_MAX"] = str(max(tasks, 1))
+    orchestrator.configure_persistence(None)
+    orchestrator.debug_reset()
+    job = orchestrator.create_optimization_job(
+        owner_id=OWNER,
+        version_id="bench-version",
+        param_space={"x": list(range(tasks))},
+        concurrency_limit=4,
+    )
+    job_id = job["id"]
+    for _ in range(4):
+        task = orchestrator.dequeue_next(OWNER, job_id)
+        orchestrator.mark_task_succeeded(job_id, task["id"], score=1.0, result_summary_id=f"s-{task['id']}")
+
+    main.app.add_api_route(
+        "/bench/legacy-status/{job_id}",
+        _legacy_status,
+        methods=["GET"],
+        response_class=JSONResponse,
+    )
+    results: Dict[str, Any] = {"tasks": tasks, "requests": requests, "orjson": serialization.orjson is not None}
+    saved_orjson = serialization.orjson
+    saved_cache = main.PAYLOAD_CACHE
+    try:
+        # Handler work alone, without the ASGI/HTTP client overhead.
+        results["legacy_handler_ops"] = _measure_handler(
+            lambda: JSONResponse(jsonable_encoder(orchestrator.get_job_status(job_id, OWNER))).body,
+            requests,
+        )
+        main.PAYLOAD_CACHE = PayloadCache(1024)
+        results["cached_handler_ops"] = _measure_handler(
+            lambda: main._cached_job_response("status", job_id, OWNER, orchestrator.get_job_status).body,
+            requests,
+        )
+        results["legacy_rps"] = asyncio.run(_measure(f"/bench/legacy-status/{job_id}", requests))
+        status_path = f"/internal/optimizations/{job_id}/status"
+        main.PAYLOAD_CACHE = PayloadCache(0)
+        serialization.orjson = None
+        results["stdlib_nocache_rps"] = asyncio.run(_measure(status_path, requests))
+        serialization.orjson = saved_orjson
+        results["fast_nocache_rps"] = asyncio.run(_measure(status_path, requests))
+        main.PAYLOAD_CACHE = PayloadCache(1024)
+        results["fast_cached_rps"] = asyncio.run(_measure(status_path, requests))
+    finally:
+        serialization.orjson = saved_orjson
+        main.PAYLOAD_CACHE = saved_cache
+        orchestrator.debug_reset()
+    return results
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.tasks, args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,90 @@
+"""Task table size and hydrate time for json vs compact task storage.
+
+Persists ``--jobs`` jobs of 1000 tasks each into SQLite under both
+OPT_TASK_STORAGE modes and reports the database size and hydrate latency.
+
+    python -m services.backtest.benchmarks.bench_task_storage --jobs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict
+
+from services.backtest.app import orchestrator
+from services.backtest.app.orchestrator import TaskPersistence
+
+# 10 x 10 x 10 = 1000 tasks, which is MAX_TASK_CAP.
+PARAM_SPACE = {
+    "fast_window": list(range(5, 55, 5)),
+    "slow_window": {"start": 20, "end": 110, "step": 10},
+    "stop_loss": [round(0.01 * step, 2) for step in range(1, 11)],
+}
+
+
+def _measure(mode: str, jobs: int, workdir: str) -> Dict[str, float]:
+    os.environ["OPT_TASK_STORAGE"] = mode
+    path = os.path.join(workdir, f"tasks-{mode}.sqlite")
+    dsn = f"sqlite:///{path}"
+    persistence = TaskPersistence(dsn, create_tables=True)
+    normalized, _ = orchestrator.summarize_param_space(PARAM_SPACE)
+    for index in range(jobs):
+        job_id = f"bench-job-{index}"
+        tasks = list(orchestrator._generate_tasks(job_id, "bench-owner", "v", normalized, 4))
+        job = orchestrator.OptimizationJob(
+            id=job_id,
+            owner_id="bench-owner",
+            version_id="v",
+            param_space=PARAM_SPACE,
+            normalized_space=normalized,
+            total_tasks=len(tasks),
+        )
+        persistence.persist_job(job, tasks)
+    persistence.flush()
+    persistence._engine.dispose()
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    size = os.path.getsize(path)
+
+    reader = TaskPersistence(dsn)
+    started = time.perf_counter()
+    reader.hydrate()
+    elapsed = time.perf_counter() - started
+    reader._engine.dispose()
+    orchestrator.debug_reset()
+    return {"bytes": float(size), "hydrate_ms": elapsed * 1000.0}
+
+
+def run(jobs: int) -> Dict[str, Any]:
+    previous = os.environ.get("OPT_TASK_STORAGE")
+    results: Dict[str, Any] = {"jobs": jobs, "tasks_per_job": orchestrator.MAX_TASK_CAP}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in orchestrator.TASK_STORAGE_MODES:
+                measured = _measure(mode, jobs, workdir)
+                results[f"{mode}_bytes"] = measured["bytes"]
+                results[f"{mode}_hydrate_ms"] = measured["hydrate_ms"]
+    finally:
+        if previous is None:
+            os.environ.pop("OPT_TASK_STORAGE", None)
+        else:
+            os.environ["OPT_TASK_STORAGE"] = previous
+    return results
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,334 @@
+"""Deterministic load generation against the orchestrator on a virtual clock.
+
+Owners create jobs as Poisson arrivals, a pool of workers loops around
+``worker.process_next`` with a synthetic runner (sampled runtimes and injected
+``WorkerError`` failures per kind) and status polls arrive at a fixed rate.
+Time is simulated: a discrete-event loop advances a virtual clock between
+events, so hours of queueing, including retry backoff, run in seconds and the
+same seed always produces the same report.
+
+    python -m services.backtest.benchmarks.loadgen --hours 4 --owners 20 --workers 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from services.backtest.app import orchestrator, worker
+from services.backtest.app.clock import VirtualClock, set_clock
+from services.backtest.app.worker import WorkerError
+
+FAILURE_KINDS = ("param", "upstream", "internal")
+
+
+@dataclass
+class LoadConfig:
+    hours: float = 1.0
+    owners: int = 10
+    workers: int = 16
+    jobs_per_owner_per_hour: float = 2.0
+    tasks_per_job: int = 50
+    concurrency_limit: int = 4
+    runtime_mean_seconds: float = 30.0
+    runtime_distribution: str = "exponential"  # exponential | lognormal | constant
+    failure_rates: Dict[str, float] = field(
+        default_factory=lambda: {"param": 0.01, "upstream": 0.03, "internal": 0.01}
+    )
+    polls_per_minute: float = 60.0
+    idle_poll_seconds: float = 5.0
+    seed: int = 7
+
+
+@contextmanager
+def _simulated(clock: VirtualClock, metrics: Dict[str, List[float]]) -> Iterator[None]:
+    """Install the virtual clock and capture the orchestrator's and worker's metrics."""
+
+    def capture(name: str, value: float, *, tags: Optional[Dict[str, Any]] = None) -> None:
+        metrics.setdefault(name, []).append(float(value))
+
+    patched = {
+        (orchestrator, "emit_metric"): capture,
+        (worker, "emit_metric"): capture,
+    }
+    saved = {key: getattr(*key) for key in patched}
+    env = {
+        "OBS_ENABLED": "false",
+        "OPT_PARAM_SPACE_MAX": str(orchestrator.MAX_TASK_CAP),
+        "OPT_CONCURRENCY_LIMIT_MAX": str(max(orchestrator.get_concurrency_limit_max(), 64)),
+        "OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS": "0",
+    }
+    saved_env = {key: os.environ.get(key) for key in env}
+    for (module, name), value in patched.items():
+        setattr(module, name, value)
+    os.environ.update(env)
+    previous_clock = set_clock(clock)
+    try:
+        yield
+    finally:
+        set_clock(previous_clock)
+        for (module, name), value in saved.items():
+            setattr(module, name, value)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class _SimWorker:
+    """A real thread that only runs while the simulator has handed it control."""
+
+    def __init__(self, sim: "Simulation", index: int) -> None:
+        self.sim = sim
+        self.index = index
+        self.token = 0
+        self.idle = False
+        self.busy_seconds = 0.0
+        self._go = threading.Event()
+        self.thread = threading.Thread(target=self._loop, name=f"sim-worker-{index}", daemon=True)
+
+    def resume(self) -> None:
+        self.sim.parked.clear()
+        self._go.set()
+        self.sim.parked.wait()
+
+    def _park(self) -> None:
+        self.sim.parked.set()
+        self._go.wait()
+        self._go.clear()
+
+    def _loop(self) -> None:
+        self._park()
+        while not self.sim.stopping:
+            outcome = None
+            for owner_id in self.sim.owner_rotation(self.index):
+                outcome = worker.process_next(owner_id, self._run)
+                if outcome is not None:
+                    break
+            self.idle = outcome is None
+            delay = self.sim.config.idle_poll_seconds if self.idle else 0.0
+            self.sim.schedule_wake(self, delay)
+            self._park()
+        self.sim.parked.set()
+
+    def _run(self, task: dict) -> float:
+        runtime = self.sim.sample_runtime()
+        self.sim.schedule_wake(self, runtime)
+        self._park()
+        self.busy_seconds += runtime
+        if self.sim.stopping:
+            raise WorkerError("simulation stopped", kind="internal")
+        kind = self.sim.sample_failure()
+        if kind:
+            self.sim.failures[kind] += 1
+            raise WorkerError(f"synthetic {kind} failure", kind=kind)
+        return float(sum(value for value in task["params"].values() if isinstance(value, (int, float))))
+
+
+class Simulation:
+    def __init__(self, config: LoadConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.clock = VirtualClock(datetime(2024, 1, 1))
+        self.start = self.clock.time()
+        self.parked = threading.Event()
+        self.stopping = False
+        self.failures = {kind: 0 for kind in FAILURE_KINDS}
+        self.metrics: Dict[str, List[float]] = {}
+        self.jobs: Dict[str, List[str]] = {f"owner-{index}": [] for index in range(config.owners)}
+        self.poll_ms: List[float] = []
+        self._events: List[Any] = []
+        self._seq = itertools.count()
+        self.workers = [_SimWorker(self, index) for index in range(config.workers)]
+
+    # -- event queue --------------------------------------------------------
+    def _push(self, at: float, kind: str, payload: Any = None) -> None:
+        heapq.heappush(self._events, (at, next(self._seq), kind, payload))
+
+    def schedule_wake(self, sim_worker: _SimWorker, delay: float) -> None:
+        sim_worker.token += 1
+        self._push(self.clock.time() + delay, "wake", (sim_worker, sim_worker.token))
+
+    def _wake_idle(self) -> None:
+        for sim_worker in self.workers:
+            if sim_worker.idle:
+                sim_worker.idle = False
+                self.schedule_wake(sim_worker, 0.0)
+
+    # -- sampling -----------------------------------------------------------
+    def sample_runtime(self) -> float:
+        mean = self.config.runtime_mean_seconds
+        if self.config.runtime_distribution == "constant":
+            return mean
+        if self.config.runtime_distribution == "lognormal":
+            sigma = 0.75
+            return self.rng.lognormvariate(0.0, sigma) * mean / (2.718281828459045 ** (sigma * sigma / 2))
+        return self.rng.expovariate(1.0 / mean)
+
+    def sample_failure(self) -> Optional[str]:
+        roll = self.rng.random()
+        for kind in FAILURE_KINDS:
+            rate = self.config.failure_rates.get(kind, 0.0)
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def owner_rotation(self, index: int) -> List[str]:
+        owners = list(self.jobs)
+        offset = index % len(owners)
+        return owners[offset:] + owners[:offset]
+
+    # -- event handlers -----------------------------------------------------
+    def _create_job(self, owner_id: str) -> None:
+        job_id = orchestrator.create_optimization_job(
+            owner_id=owner_id,
+            version_id="loadgen",
+            param_space={"x": list(range(self.config.tasks_per_job))},
+            concurrency_limit=self.config.concurrency_limit,
+        )["id"]
+        self.jobs[owner_id].append(job_id)
+        rate = self.config.jobs_per_owner_per_hour / 3600.0
+        self._push(self.clock.time() + self.rng.expovariate(rate), "create", owner_id)
+        self._wake_idle()
+
+    def _poll(self) -> None:
+        owner_id = self.rng.choice(list(self.jobs))
+        if self.jobs[owner_id]:
+            job_id = self.rng.choice(self.jobs[owner_id][-5:])
+            started = time.perf_counter()
+            orchestrator.get_job_status(job_id, owner_id)
+            self.poll_ms.append((time.perf_counter() - started) * 1000.0)
+        self._push(self.clock.time() + 60.0 / self.config.polls_per_minute, "poll")
+
+    def run(self) -> Dict[str, Any]:
+        config = self.config
+        end = self.start + config.hours * 3600.0
+        orchestrator.debug_reset()
+        wall_started = time.perf_counter()
+        with _simulated(self.clock, self.metrics):
+            for sim_worker in self.workers:
+                sim_worker.thread.start()
+                self.parked.wait()
+                self.schedule_wake(sim_worker, 0.0)
+            if config.jobs_per_owner_per_hour > 0:
+                rate = config.jobs_per_owner_per_hour / 3600.0
+                for owner_id in self.jobs:
+                    self._push(self.start + self.rng.expovariate(rate), "create", owner_id)
+            if config.polls_per_minute > 0:
+                self._push(self.start, "poll")
+            finished_before = 0
+            while self._events and self._events[0][0] <= end:
+                at, _, kind, payload = heapq.heappop(self._events)
+                self.clock.advance_to(at)
+                if kind == "create":
+                    self._create_job(payload)
+                elif kind == "poll":
+                    self._poll()
+                else:
+                    sim_worker, token = payload
+                    if token == sim_worker.token:
+                        sim_worker.resume()
+                finished = len(self.metrics.get("job_exec_seconds", []))
+                if finished != finished_before:
+                    # a slot was freed; idle workers may now find work
+                    finished_before = finished
+                    self._wake_idle()
+            self.clock.advance_to(end)
+            report = self._report(time.perf_counter() - wall_started)
+            self.stopping = True
+            for sim_worker in self.workers:
+                sim_worker.resume()
+        orchestrator.debug_reset()
+        return report
+
+    def _report(self, wall_seconds: float) -> Dict[str, Any]:
+        config = self.config
+        duration = config.hours * 3600.0
+        statuses: Dict[str, int] = {}
+        retries = 0
+        for tasks in (orchestrator.debug_tasks(job_id) for jobs in self.jobs.values() for job_id in jobs):
+            for task in tasks:
+                statuses[task.status] = statuses.get(task.status, 0) + 1
+                retries += task.retries
+        waits = sorted(self.metrics.get("queue_wait_seconds", []))
+        busy = sum(sim_worker.busy_seconds for sim_worker in self.workers)
+        return {
+            "config": asdict(config),
+            "simulated_seconds": duration,
+            "wall_seconds": round(wall_seconds, 3),
+            "speedup": round(duration / wall_seconds, 1) if wall_seconds else None,
+            "jobs_created": sum(len(jobs) for jobs in self.jobs.values()),
+            "tasks": statuses,
+            "retries": retries,
+            "injected_failures": dict(self.failures),
+            "throughput_tasks_per_hour": round(statuses.get("succeeded", 0) / config.hours, 2),
+            "queue_wait_seconds": _percentiles(waits),
+            "worker_utilization": round(busy / (duration * config.workers), 4) if config.workers else 0.0,
+            "status_polls": len(self.poll_ms),
+            "status_poll_ms": _percentiles(sorted(self.poll_ms)),
+        }
+
+
+def _percentiles(ordered: List[float]) -> Dict[str, Optional[float]]:
+    if not ordered:
+        return {"p50": None, "p95": None, "p99": None, "mean": None}
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))], 4)
+
+    return {"p50": pick(50), "p95": pick(95), "p99": pick(99), "mean": round(statistics.fmean(ordered), 4)}
+
+
+def run(config: LoadConfig) -> Dict[str, Any]:
+    return Simulation(config).run()
+
+
+def main_cli() -> None:
+    defaults = LoadConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=defaults.hours)
+    parser.add_argument("--owners", type=int, default=defaults.owners)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument("--jobs-per-owner-per-hour", type=float, default=defaults.jobs_per_owner_per_hour)
+    parser.add_argument("--tasks-per-job", type=int, default=defaults.tasks_per_job)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency_limit)
+    parser.add_argument("--runtime-mean", type=float, default=defaults.runtime_mean_seconds)
+    parser.add_argument(
+        "--runtime-dist", choices=("exponential", "lognormal", "constant"), default=defaults.runtime_distribution
+    )
+    for kind in FAILURE_KINDS:
+        parser.add_argument(f"--fail-{kind}", type=float, default=defaults.failure_rates[kind])
+    parser.add_argument("--polls-per-minute", type=float, default=defaults.polls_per_minute)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+    config = LoadConfig(
+        hours=args.hours,
+        owners=args.owners,
+        workers=args.workers,
+        jobs_per_owner_per_hour=args.jobs_per_owner_per_hour,
+        tasks_per_job=args.tasks_per_job,
+        concurrency_limit=args.concurrency,
+        runtime_mean_seconds=args.runtime_mean,
+        runtime_distribution=args.runtime_dist,
+        failure_rates={kind: getattr(args, f"fail_{kind}") for kind in FAILURE_KINDS},
+        polls_per_minute=args.polls_per_minute,
+        seed=args.seed,
+    )
+    print(json.dumps(run(config), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from services.backtest.app import main, orchestrator
+from services.backtest.app.async_orchestrator import AsyncOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    prev_secret = os.environ.pop("OPTIMIZATION_ORCHESTRATOR_SECRET", None)
+    orchestrator.configure_persistence(None)
+    orchestrator.debug_reset()
+    main.PAYLOAD_CACHE.clear()
+    yield
+    orchestrator.debug_reset_persistent()
+    orchestrator.configure_persistence(None)
+    main.PAYLOAD_CACHE.clear()
+    if prev_secret is not None:
+        os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = prev_secret
+
+
+def _blocking_sqlite(tmp_path):
+    """SQLite stand-in for a stuck database: UPDATEs wait for ``release`` while armed."""
+
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    orchestrator.configure_persistence(f"sqlite:///{tmp_path/'slow.sqlite'}", create_tables=True)
+    engine = orchestrator.get_persistence()._engine
+    state = {"armed": False, "entered": threading.Event(), "release": threading.Event()}
+
+    @sqlalchemy.event.listens_for(engine, "before_cursor_execute")
+    def _block(conn, cursor, statement, parameters, context, executemany):
+        if state["armed"] and statement.lstrip().upper().startswith("UPDATE"):
+            state["entered"].set()
+            state["release"].wait(10)
+
+    return state
+
+
+def test_facade_runs_orchestrator_calls_off_the_event_loop():
+    facade = AsyncOrchestrator(max_workers=2)
+
+    async def scenario():
+        created = await facade.create_optimization_job(
+            owner_id="owner-1",
+            version_id="v-1",
+            param_space={"x": [1, 2]},
+            concurrency_limit=1,
+        )
+        status = await facade.get_job_status(created["id"], "owner-1")
+        page, _ = await facade.list_jobs_page("owner-1", limit=5)
+        return created, status, page
+
+    try:
+        created, status, page = asyncio.run(scenario())
+    finally:
+        facade.shutdown()
+    assert status["id"] == created["id"]
+    assert [entry["id"] for entry in page] == [created["id"]]
+
+
+def test_blocked_database_write_does_not_hold_the_store_lock(tmp_path):
+    state = _blocking_sqlite(tmp_path)
+    watched = orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    doomed = orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-2", param_space={"x": [1, 2, 3]}, concurrency_limit=1
+    )["id"]
+    orchestrator.flush_persistence()
+
+    state["armed"] = True
+    cancel = threading.Thread(target=orchestrator.cancel_job, args=(doomed, "owner-1"))
+    cancel.start()
+    try:
+        assert state["entered"].wait(5)
+        # Straight to the orchestrator, so no payload cache can answer for it.
+        reads = {}
+        reader = threading.Thread(
+            target=lambda: reads.update(
+                watched=orchestrator.get_job_status(watched, "owner-1"),
+                doomed=orchestrator.get_job_status(doomed, "owner-1"),
+            )
+        )
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+        assert cancel.is_alive()  # the cancel is still stuck in its write
+        assert reads["watched"]["status"] == "queued"
+        assert reads["doomed"]["status"] == "canceled"
+    finally:
+        state["release"].set()
+        cancel.join(5)
+    assert not cancel.is_alive()
@@ -0,0 +1,203 @@
+import threading
+
+import pytest
+
+from services.backtest.app import orchestrator
+from services.backtest.app.orchestrator import (
+    TaskPersistence,
+    cancel_job,
+    configure_persistence,
+    create_optimization_job,
+    debug_reset_persistent,
+    dequeue_next,
+    get_job_status,
+    mark_task_succeeded,
+)
+
+pytest.importorskip("sqlalchemy")
+
+
+@pytest.fixture
+def shared_dsn(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPT_DISPATCH_MODE", "db")
+    dsn = f"sqlite:///{tmp_path/'shared.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    yield dsn
+    debug_reset_persistent()
+    configure_persistence(None)
+
+
+def _replica(dsn):
+    # A second orchestrator process, reduced to its persistence layer.
+    return TaskPersistence(dsn)
+
+
+def _finish(persistence, row, before_release=None):
+    job, tasks = persistence.load_job(row["job_id"])
+    task = next(task for task in tasks if task.id == row["id"])
+    task.status = "succeeded"
+    task.score = 1.0
+    task.updated_at = orchestrator.epoch_now()
+    if before_release:
+        before_release()
+    assert persistence.finish_task(task)
+
+
+def test_replicas_share_queue_without_double_claims(shared_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": list(range(24))}, concurrency_limit=3
+    )["id"]
+    replicas = [_replica(shared_dsn) for _ in range(4)]
+    claimed = []
+    running = {"now": 0, "peak": 0}
+    guard = threading.Lock()
+
+    def worker(persistence):
+        while True:
+            row = persistence.claim_task("owner-1", job_id=job_id)
+            if row is None:
+                with guard:
+                    if len(claimed) >= 24:
+                        return
+                continue
+            with guard:
+                claimed.append(row["id"])
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            _finish(persistence, row, before_release=release)
+
+    def release():
+        # Counted down before the slot is released, so the count never exceeds the DB's.
+        with guard:
+            running["now"] -= 1
+
+    threads = [threading.Thread(target=worker, args=(replica,)) for replica in replicas]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    for replica in replicas:
+        replica.close()
+
+    assert len(claimed) == 24
+    assert len(set(claimed)) == 24
+    assert running["peak"] <= 3
+    assert get_job_status(job_id, "owner-1")["summary"]["finished"] == 24
+
+
+def test_slot_row_enforces_concurrency_across_replicas(shared_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=1
+    )["id"]
+    other = _replica(shared_dsn)
+    try:
+        first = dequeue_next("owner-1", job_id)
+        assert first is not None
+        assert dequeue_next("owner-1", job_id) is None
+        assert other.claim_task("owner-1", job_id=job_id) is None
+
+        mark_task_succeeded(job_id, first["id"], score=0.5)
+        row = other.claim_task("owner-1", job_id=job_id)
+        assert row is not None and row["id"] != first["id"]
+        _finish(other, row)
+
+        status = get_job_status(job_id, "owner-1")
+        assert status["summary"]["finished"] == 2
+    finally:
+        other.close()
+
+
+def test_jobs_created_elsewhere_are_claimable(shared_dsn, monkeypatch):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=2
+    )["id"]
+    # Forget it locally, as if another replica had created it.
+    with orchestrator._STORE_LOCK:
+        orchestrator._forget_job(job_id)
+    persistence = orchestrator.get_persistence()
+    load_job = persistence.load_job
+    lock_free = []
+
+    def _try_lock():
+        acquired = orchestrator._STORE_LOCK.acquire(timeout=1)
+        if acquired:
+            orchestrator._STORE_LOCK.release()
+        lock_free.append(acquired)
+
+    def _probed(job_id):
+        # the claim path reads the job without holding the store lock
+        probe = threading.Thread(target=_try_lock)
+        probe.start()
+        probe.join()
+        return load_job(job_id)
+
+    monkeypatch.setattr(persistence, "load_job", _probed)
+    task = dequeue_next("owner-1")
+    assert task is not None and task["jobId"] == job_id
+    assert job_id in orchestrator.debug_jobs()
+    assert lock_free and all(lock_free)
+
+
+def test_cancel_stops_claims_on_every_replica(shared_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=1
+    )["id"]
+    other = _replica(shared_dsn)
+    try:
+        assert dequeue_next("owner-1", job_id) is not None
+        cancel_job(job_id, "owner-1")
+        assert other.claim_task("owner-1", job_id=job_id) is None
+    finally:
+        other.close()
+
+
+@pytest.mark.parametrize("failure", ["missing", "error"])
+def test_claim_that_cannot_be_handed_out_is_released(shared_dsn, monkeypatch, failure):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    orchestrator.flush_persistence()
+    load_resident = orchestrator._load_resident
+
+    def _broken(_job_id):
+        if failure == "error":
+            raise RuntimeError("load failed")
+
+    with orchestrator._STORE_SECTION:
+        orchestrator._forget_job(job_id)
+    monkeypatch.setattr(orchestrator, "_load_resident", _broken)
+    if failure == "error":
+        with pytest.raises(RuntimeError):
+            dequeue_next("owner-1", job_id)
+    else:
+        assert dequeue_next("owner-1", job_id) is None
+    monkeypatch.setattr(orchestrator, "_load_resident", load_resident)
+
+    _, tasks = orchestrator.get_persistence().load_job(job_id)
+    assert {task.status for task in tasks} == {"queued"}
+    # the slot came back too, so the concurrency-1 job is still claimable
+    assert dequeue_next("owner-1", job_id) is not None
+
+
+def test_cancel_keeps_outcomes_other_replicas_wrote(shared_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=2
+    )["id"]
+    other = _replica(shared_dsn)
+    try:
+        assert dequeue_next("owner-1", job_id) is not None
+        row = other.claim_task("owner-1", job_id=job_id)
+        _finish(other, row)
+
+        # this replica still holds the finished task as queued
+        (local,) = [task for task in orchestrator.debug_tasks(job_id) if task.id == row["id"]]
+        assert local.status == "queued"
+        cancel_job(job_id, "owner-1")
+
+        _, tasks = other.load_job(job_id)
+        statuses = {task.id: task.status for task in tasks}
+        assert statuses.pop(row["id"]) == "succeeded"
+        assert set(statuses.values()) == {"canceled"}
+        assert other.claim_task("owner-1", job_id=job_id) is None
+    finally:
+        other.close()
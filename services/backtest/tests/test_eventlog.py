@@ -0,0 +1,199 @@
+import os
+
+import pytest
+
+from services.backtest.app import orchestrator
+from services.backtest.app.eventlog import SNAPSHOT_DIR, SNAPSHOT_NAME, EventLogError, EventLogPersistence
+from services.backtest.app.orchestrator import (
+    configure_persistence,
+    create_optimization_job,
+    debug_reset_persistent,
+    debug_tasks,
+    dequeue_next,
+    get_job_status,
+    list_jobs_page,
+    mark_task_failed,
+    mark_task_succeeded,
+)
+
+
+@pytest.fixture
+def eventlog_dsn(tmp_path):
+    dsn = f"eventlog://{tmp_path/'log'}"
+    configure_persistence(dsn)
+    yield dsn
+    debug_reset_persistent()
+    configure_persistence(None)
+
+
+def _segments(dsn):
+    path = dsn[len("eventlog://") :]
+    return sorted(name for name in os.listdir(path) if name.startswith("segment-"))
+
+
+def test_eventlog_dsn_selects_append_only_backend(eventlog_dsn):
+    assert isinstance(orchestrator.get_persistence(), EventLogPersistence)
+    result = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )
+    assert result["persistState"] == "durable"
+
+
+def test_eventlog_recovers_state_after_restart(eventlog_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=1
+    )["id"]
+    first = dequeue_next("owner-1", job_id)
+    mark_task_succeeded(job_id, first["id"], score=0.9)
+    second = dequeue_next("owner-1", job_id)
+    mark_task_failed(job_id, second["id"], error_type="runtime", message="boom")
+    before = {task.id: (task.status, task.score, task.retries, task.params) for task in debug_tasks(job_id)}
+    summary = get_job_status(job_id, "owner-1")["summary"]
+
+    configure_persistence(eventlog_dsn)
+
+    after = {task.id: (task.status, task.score, task.retries, task.params) for task in debug_tasks(job_id)}
+    assert after == before
+    status = get_job_status(job_id, "owner-1")
+    assert status["summary"] == summary
+    assert status["persistState"] == "durable"
+    assert dequeue_next("owner-1", job_id) is not None
+
+
+def test_eventlog_snapshot_compacts_segments(eventlog_dsn, monkeypatch):
+    monkeypatch.setenv("OPT_EVENTLOG_SNAPSHOT_EVERY", "4")
+    configure_persistence(eventlog_dsn)
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3, 4]}, concurrency_limit=2
+    )["id"]
+    for _ in range(4):
+        task = dequeue_next("owner-1", job_id)
+        mark_task_succeeded(job_id, task["id"], score=1.0)
+    # snapshots are written in the background
+    assert orchestrator.flush_persistence()
+
+    path = eventlog_dsn[len("eventlog://") :]
+    assert os.path.exists(os.path.join(path, SNAPSHOT_NAME))
+    assert len(_segments(eventlog_dsn)) == 1
+
+    configure_persistence(eventlog_dsn)
+    status = get_job_status(job_id, "owner-1")
+    assert status["status"] == "succeeded"
+    assert status["summary"]["finished"] == 4
+
+
+def test_eventlog_snapshot_rewrites_only_changed_jobs(eventlog_dsn, monkeypatch):
+    monkeypatch.setenv("OPT_EVENTLOG_SNAPSHOT_EVERY", "4")
+    configure_persistence(eventlog_dsn)
+    busy, idle = (
+        create_optimization_job(
+            owner_id="owner-1", version_id=f"v-{idx}", param_space={"x": [1, 2, 3, 4]}, concurrency_limit=4
+        )["id"]
+        for idx in range(2)
+    )
+    dequeue_next("owner-1", idle)
+    for _ in range(2):
+        dequeue_next("owner-1", busy)
+    assert orchestrator.flush_persistence()
+    path = eventlog_dsn[len("eventlog://") :]
+    assert sorted(os.listdir(os.path.join(path, SNAPSHOT_DIR))) == sorted([f"{busy}.json", f"{idle}.json"])
+
+    written = []
+    original = EventLogPersistence._write_entry
+
+    def _spy(self, entry):
+        written.append(entry["job"]["id"])
+        original(self, entry)
+
+    monkeypatch.setattr(EventLogPersistence, "_write_entry", _spy)
+    for _ in range(4):
+        task = dequeue_next("owner-1", busy)
+        if task is None:
+            break
+        mark_task_succeeded(busy, task["id"], score=1.0)
+    assert orchestrator.flush_persistence()
+    assert written and set(written) == {busy}
+
+    monkeypatch.setattr(EventLogPersistence, "_write_entry", original)
+    configure_persistence(eventlog_dsn)
+    assert get_job_status(idle, "owner-1")["summary"]["finished"] == 0
+    assert get_job_status(busy, "owner-1")["summary"]["finished"] >= 2
+
+
+def test_eventlog_ignores_torn_tail(eventlog_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    task = dequeue_next("owner-1", job_id)
+    mark_task_succeeded(job_id, task["id"], score=0.5)
+    path = eventlog_dsn[len("eventlog://") :]
+    with open(os.path.join(path, _segments(eventlog_dsn)[-1]), "a", encoding="utf-8") as handle:
+        handle.write('{"e":"task","j":')
+
+    configure_persistence(eventlog_dsn)
+    assert get_job_status(job_id, "owner-1")["summary"]["finished"] == 1
+
+
+def test_eventlog_failed_write_leaves_memory_and_disk_in_step(eventlog_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    persistence = orchestrator.get_persistence()
+    task = dequeue_next("owner-1", job_id)
+
+    class _TornFile:
+        def __init__(self, handle):
+            self.handle = handle
+
+        def write(self, line):
+            self.handle.write(line[:10])
+            self.handle.flush()
+            raise OSError("disk full")
+
+        def close(self):
+            self.handle.close()
+
+    persistence._file = _TornFile(persistence._file)
+    mark_task_succeeded(job_id, task["id"], score=0.5)
+    (record,) = [entry for entry in persistence._tasks[job_id] if entry["id"] == task["id"]]
+    assert record["s"] == "running"
+
+    # the next event goes to a fresh segment, after the torn line
+    second = dequeue_next("owner-1", job_id)
+    assert len(_segments(eventlog_dsn)) == 2
+    configure_persistence(eventlog_dsn)
+    statuses = {entry.id: entry.status for entry in debug_tasks(job_id)}
+    # both were running when the process went away, so hydration requeued them
+    assert statuses == {task["id"]: "queued", second["id"]: "queued"}
+
+
+def test_eventlog_refuses_segment_damaged_before_its_end(eventlog_dsn):
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    dequeue_next("owner-1", job_id)
+    path = eventlog_dsn[len("eventlog://") :]
+    segment = os.path.join(path, _segments(eventlog_dsn)[-1])
+    with open(segment, encoding="utf-8") as handle:
+        lines = handle.readlines()
+    lines[0] = lines[0][: len(lines[0]) // 2] + "\n"
+    with open(segment, "w", encoding="utf-8") as handle:
+        handle.writelines(lines)
+
+    with pytest.raises(EventLogError):
+        EventLogPersistence(eventlog_dsn)
+
+
+def test_eventlog_serves_history_for_non_resident_jobs(eventlog_dsn):
+    ids = [
+        create_optimization_job(
+            owner_id="owner-1", version_id=f"v-{idx}", param_space={"x": [idx]}, concurrency_limit=1
+        )["id"]
+        for idx in range(3)
+    ]
+    with orchestrator._STORE_LOCK:
+        orchestrator._forget_job(ids[0])
+    first_page, cursor = list_jobs_page("owner-1", limit=2)
+    second_page, tail = list_jobs_page("owner-1", limit=2, cursor=cursor)
+    assert [entry["id"] for entry in first_page + second_page] == [ids[2], ids[1], ids[0]]
+    assert tail is None
@@ -0,0 +1,39 @@
+import asyncio
+
+from services.backtest.app.events import JobEventBus
+
+
+def test_subscription_coalesces_bursts():
+    async def scenario():
+        bus = JobEventBus()
+        subscription = bus.subscribe("job-1", 0)
+        bus.publish("job-1", 1)
+        first = await subscription.next_revision(timeout=1.0, interval=0.05)
+        for revision in range(2, 6):
+            bus.publish("job-1", revision)
+        second = await subscription.next_revision(timeout=1.0, interval=0.05)
+        idle = await subscription.next_revision(timeout=0.05, interval=0.05)
+        subscription.close()
+        return first, second, idle, bus.subscriber_count("job-1")
+
+    first, second, idle, remaining = asyncio.run(scenario())
+    assert first == 1
+    assert second == 5  # burst collapses into the latest revision
+    assert idle is None
+    assert remaining == 0
+
+
+def test_wait_for_wakes_on_publish_from_other_thread():
+    async def scenario():
+        bus = JobEventBus()
+        subscription = bus.subscribe("job-1", 3)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.02, lambda: loop.run_in_executor(None, bus.publish, "job-1", 4))
+        reached = await subscription.wait_for(4, timeout=1.0)
+        missed = await subscription.wait_for(10, timeout=0.02)
+        subscription.close()
+        return reached, missed
+
+    reached, missed = asyncio.run(scenario())
+    assert reached is True
+    assert missed is False
@@ -1,10 +1,13 @@
+import json
 import os
+import threading
 
 import pytest
 from fastapi.testclient import TestClient
 
+from services.backtest.app import main, orchestrator
+from services.backtest.app.clock import VirtualClock, use_clock
 from services.backtest.app.main import app
-from services.backtest.app import orchestrator
 
 client = TestClient(app)
 
@@ -27,6 +30,7 @@ def reset_state():
     prev_limit = os.environ.get("OPT_PARAM_SPACE_MAX")
     orchestrator.configure_persistence(None)
     orchestrator.debug_reset()
+    main.PAYLOAD_CACHE.clear()
     if prev_limit is None:
         os.environ["OPT_PARAM_SPACE_MAX"] = "16"
     yield
@@ -214,3 +218,148 @@ def test_export_endpoint_returns_topn_bundle():
     assert bundle["jobId"] == job_id
     assert len(bundle["items"]) >= 1
     assert bundle["items"][0]["artifacts"][0]["type"] == "metrics"
+
+
+def test_export_is_stamped_per_request():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    clock = VirtualClock(1_700_000_000.0)
+    with use_clock(clock):
+        job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+        first = client.post(f"/internal/optimizations/{job_id}/export", headers=headers).json()
+        clock.advance(60)
+        # same job revision, so a cached body would repeat the old timestamp
+        second = client.post(f"/internal/optimizations/{job_id}/export", headers=headers).json()
+    assert first["generatedAt"] != second["generatedAt"]
+
+
+def test_status_long_poll_returns_after_revision_change():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+    current = client.get(f"/internal/optimizations/{job_id}/status", headers=headers).json()["revision"]
+
+    timer = threading.Timer(0.05, lambda: orchestrator.dequeue_next("owner-1", job_id))
+    timer.start()
+    try:
+        resp = client.get(
+            f"/internal/optimizations/{job_id}/status?waitForRevision={current + 1}&timeoutSeconds=5",
+            headers=headers,
+        )
+    finally:
+        timer.join()
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["revision"] >= current + 1
+    assert body["summary"]["running"] == 1
+
+
+def test_status_long_poll_times_out_with_current_payload():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+    resp = client.get(
+        f"/internal/optimizations/{job_id}/status?waitForRevision=99&timeoutSeconds=0.05",
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["revision"] < 99
+
+
+def test_events_stream_emits_final_status_and_closes():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+    client.post(f"/internal/optimizations/{job_id}/cancel", json={"reason": "done"}, headers=headers)
+
+    with client.stream("GET", f"/internal/optimizations/{job_id}/events", headers=headers) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = "".join(resp.iter_text())
+    events = [chunk for chunk in body.split("\n\n") if chunk.startswith("id:")]
+    assert len(events) == 1
+    data = json.loads(events[0].split("data: ", 1)[1])
+    assert data["status"] == "canceled"
+    assert orchestrator.get_event_bus().subscriber_count(job_id) == 0
+
+
+def test_events_stream_rejects_foreign_owner():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+    resp = client.get(
+        f"/internal/optimizations/{job_id}/events",
+        headers={"x-opt-shared-secret": "secret", "x-owner-id": "other"},
+    )
+    assert resp.status_code == 403
+
+
+def test_history_endpoint_pages_with_cursor_header():
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    ids = [client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"] for _ in range(3)]
+
+    first = client.get("/internal/optimizations?limit=2", headers=headers)
+    assert first.status_code == 200
+    cursor = first.headers["x-next-cursor"]
+    second = client.get(f"/internal/optimizations?limit=2&cursor={cursor}", headers=headers)
+    assert second.status_code == 200
+    assert "x-next-cursor" not in second.headers
+    paged = [job["id"] for job in first.json() + second.json()]
+    assert sorted(paged) == sorted(ids)
+
+    bad = client.get("/internal/optimizations?cursor=%%%", headers=headers)
+    assert bad.status_code == 400
+    filtered = client.get("/internal/optimizations?status=canceled", headers=headers)
+    assert filtered.json() == []
+
+
+def test_history_endpoint_compact_view_emits_size_metrics(monkeypatch):
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    client.post("/internal/optimizations", json=payload(), headers=headers)
+    metrics = []
+    monkeypatch.setattr(
+        "services.backtest.app.main.emit_metric",
+        lambda name, value, tags=None: metrics.append((name, value, tags)),
+    )
+
+    compact = client.get("/internal/optimizations?view=compact", headers=headers)
+    assert compact.status_code == 200
+    entry = compact.json()[0]
+    assert "paramSpace" not in entry and "summary" not in entry
+    assert entry["counts"]["total"] == 2
+
+    projected = client.get("/internal/optimizations?fields=status,updatedAt", headers=headers)
+    assert set(projected.json()[0]) == {"id", "status", "updatedAt"}
+    assert client.get("/internal/optimizations?fields=nope", headers=headers).status_code == 400
+
+    sizes = [m for m in metrics if m[0] == "history_response_bytes"]
+    assert sizes and sizes[0][1] == float(len(compact.content))
+    assert sizes[0][2] == {"view": "compact"}
+    assert any(m[0] == "history_serialize_ms" for m in metrics)
+
+
+def test_status_endpoint_serves_cached_bytes_until_revision_changes(monkeypatch):
+    os.environ["OPTIMIZATION_ORCHESTRATOR_SECRET"] = "secret"
+    headers = {"x-opt-shared-secret": "secret", "x-owner-id": "owner-1"}
+    job_id = client.post("/internal/optimizations", json=payload(), headers=headers).json()["id"]
+
+    builds = []
+    real_status = orchestrator.get_job_status
+
+    def counting_status(*args, **kwargs):
+        builds.append(args)
+        return real_status(*args, **kwargs)
+
+    monkeypatch.setattr(orchestrator, "get_job_status", counting_status)
+    first = client.get(f"/internal/optimizations/{job_id}/status", headers=headers)
+    second = client.get(f"/internal/optimizations/{job_id}/status", headers=headers)
+    assert first.content == second.content
+    assert len(builds) == 1
+
+    orchestrator.dequeue_next("owner-1", job_id)
+    third = client.get(f"/internal/optimizations/{job_id}/status", headers=headers)
+    assert len(builds) == 2
+    assert third.json()["summary"]["running"] == 1
+    assert third.json()["revision"] > first.json()["revision"]
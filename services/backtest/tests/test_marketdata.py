@@ -0,0 +1,97 @@
+import csv
+import os
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.backtest.app import marketdata  # noqa: E402
+
+
+def _columns(days, base):
+    return {
+        "ts": [date(2024, 1, day) for day in days],
+        "open": [base + day for day in days],
+        "high": [base + day + 0.5 for day in days],
+        "low": [base + day - 0.5 for day in days],
+        "close": [base + day + 0.25 for day in days],
+        "volume": [1000 * day for day in days],
+    }
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = str(tmp_path / "ohlcv")
+    # AAA is written out of order on purpose; rows are sorted by ts
+    marketdata.write_store(path, {"AAA": _columns([3, 1, 2, 5], 10.0), "BBB": _columns([1, 2], 100.0)})
+    yield path
+    marketdata.close_stores()
+
+
+def test_bars_are_sorted_zero_copy_views(store_path):
+    store = marketdata.ColumnarStore(store_path)
+    assert store.symbols() == ["AAA", "BBB"] and "AAA" in store
+
+    bars = store.bars("AAA")
+    assert bars.close.tolist() == [11.25, 12.25, 13.25, 15.25]
+    assert bars.volume.dtype == np.int64
+    assert bars.ts[0] == marketdata.to_epoch_seconds("2024-01-01")
+    assert isinstance(bars.close, np.memmap)
+    assert np.shares_memory(bars.close, store.bars("AAA", start="2024-01-02").close)
+    with pytest.raises(ValueError):
+        bars.close[0] = 0.0
+
+    assert store.bars("BBB").open.tolist() == [101.0, 102.0]
+    with pytest.raises(marketdata.MarketDataError):
+        store.bars("CCC")
+
+
+def test_date_range_lookup_is_inclusive(store_path):
+    store = marketdata.open_store(store_path)
+    assert marketdata.open_store(store_path) is store
+
+    assert store.bars("AAA", start=date(2024, 1, 2), end="2024-01-04").open.tolist() == [12.0, 13.0]
+    assert store.bars("AAA", start="2024-01-05").open.tolist() == [15.0]
+    assert len(store.bars("AAA", start="2024-02-01").ts) == 0
+    assert store.row_range("BBB", end="2024-01-01") == (4, 5)
+
+
+def test_import_csv_and_env_path(tmp_path, monkeypatch):
+    csv_path = tmp_path / "XYZ.csv"
+    with open(csv_path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["date", "open", "high", "low", "close", "volume"])
+        writer.writerow(["2024-01-02", "1.5", "2", "1", "1.75", "300"])
+        writer.writerow(["2024-01-01", "1", "1.5", "0.5", "1.25", "200"])
+    path = tmp_path / "store"
+    marketdata.import_csv(str(path), [str(csv_path)])
+
+    monkeypatch.setenv("OPT_MARKETDATA_PATH", str(path))
+    try:
+        bars = marketdata.open_store().bars("XYZ")
+        assert bars.close.tolist() == [1.25, 1.75]
+        assert bars.volume.tolist() == [200, 300]
+    finally:
+        marketdata.close_stores()
+
+
+def test_rewrite_swaps_versions_without_a_gap(tmp_path):
+    path = str(tmp_path / "ohlcv")
+    # a store from before versioning is a plain directory
+    legacy = tmp_path / "legacy"
+    marketdata.write_store(str(legacy), {"AAA": _columns([1], 1.0)})
+    os.rename(os.path.realpath(legacy), path)
+    old = marketdata.ColumnarStore(path)
+
+    marketdata.write_store(path, {"AAA": _columns([1, 2], 2.0)})
+    assert os.path.islink(path)
+    # readers that opened the previous version keep reading it
+    assert old.bars("AAA").open.tolist() == [2.0]
+    assert marketdata.ColumnarStore(path).bars("AAA").open.tolist() == [3.0, 4.0]
+
+    marketdata.write_store(path, {"BBB": _columns([1], 3.0)})
+    marketdata.write_store(path, {"CCC": _columns([1], 4.0)})
+    assert marketdata.ColumnarStore(path).symbols() == ["CCC"]
+    versions = [name for name in os.listdir(tmp_path) if name.startswith(".ohlcv.v-")]
+    assert len(versions) == 2 and os.path.basename(os.path.realpath(path)) in versions
@@ -38,3 +38,102 @@ def test_emit_metric_respects_toggle(monkeypatch):
     monkeypatch.setenv("OBS_METRICS_ENABLED", "false")
     obs.emit_metric("queue_wait_seconds", 1.5, tags={"jobId": "job-1"})
     assert not events
+
+
+def test_latency_histogram_quantiles():
+    histogram = obs.LatencyHistogram()
+    for ms in [0.2] * 98 + [30.0, 400.0]:
+        histogram.observe(ms)
+    stats = histogram.snapshot()
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == 0.25
+    assert stats["p99_ms"] == 50.0
+    assert stats["max_ms"] == 400.0
+
+    # a quantile never reports more than the slowest observation
+    single = obs.LatencyHistogram()
+    single.observe(0.3)
+    assert single.quantile(0.5) == single.quantile(0.99) == 0.3
+
+
+def test_instrumented_lock_records_wait_and_hold_and_supports_condition(monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setattr(obs, "_PROFILING", True)
+    obs.reset_latency()
+    lock = obs.InstrumentedLock("test.lock")
+    ready = threading.Condition(lock)
+    woke = []
+
+    def waiter():
+        with lock:
+            with lock:  # recursion: wait() must release both levels
+                woke.append(ready.wait(timeout=5))
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    with lock:
+        time.sleep(0.02)
+        ready.notify_all()
+    thread.join(timeout=5)
+
+    assert woke == [True]
+    stats = obs.latency_snapshot()
+    assert stats["test.lock.hold"]["max_ms"] >= 20.0
+    assert stats["test.lock.wait"]["count"] >= 2
+    obs.reset_latency()
+
+
+def test_timed_records_only_while_profiling(monkeypatch):
+    from services.backtest.app import orchestrator
+
+    orchestrator.configure_persistence(None)
+    orchestrator.debug_reset()
+    obs.reset_latency()
+    monkeypatch.setattr(obs, "_PROFILING", False)
+    job_id = orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    first = orchestrator.dequeue_next("owner-1")
+    assert obs.latency_snapshot() == {}
+
+    monkeypatch.setattr(obs, "_PROFILING", True)
+    orchestrator.mark_task_succeeded(job_id, first["id"], score=1.0)
+    orchestrator.dequeue_next("owner-1", job_id)
+    stats = obs.latency_snapshot()
+    for name in ("orchestrator.dequeue_next", "orchestrator.mark_task_succeeded", "orchestrator.refresh_summary"):
+        assert stats[name]["count"] >= 1
+
+    # an idle long-poll records its scans, not the time spent waiting for work
+    obs.reset_latency()
+    assert orchestrator.dequeue_next("owner-1", timeout=0.3) is None
+    stats = obs.latency_snapshot()["orchestrator.dequeue_next"]
+    assert stats["count"] >= 1
+    assert stats["max_ms"] < 150.0
+    obs.reset_latency()
+    orchestrator.debug_reset()
+
+
+def test_service_emits_latency_summaries_while_profiling(monkeypatch):
+    import time
+
+    from fastapi.testclient import TestClient
+
+    from services.backtest.app.main import app
+
+    events = []
+    monkeypatch.setattr(obs, "_write", events.append)
+    monkeypatch.setattr(obs, "_PROFILING", True)
+    monkeypatch.setenv("OBS_METRICS_ENABLED", "true")
+    monkeypatch.setenv("OBS_LATENCY_EMIT_SECONDS", "0.05")
+    obs.reset_latency()
+    obs.observe_latency("orchestrator.dequeue_next", 0.2)
+    with TestClient(app):
+        deadline = time.monotonic() + 5
+        while not any(event.get("name") == "latency_ms" for event in events) and time.monotonic() < deadline:
+            time.sleep(0.02)
+    emitted = {event["tags"]["stat"] for event in events if event.get("name") == "latency_ms"}
+    assert {"count", "p50_ms", "p99_ms"} <= emitted
+    obs.reset_latency()
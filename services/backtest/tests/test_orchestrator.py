@@ -1,5 +1,6 @@
 import os
 import threading
+import time
 from datetime import datetime, timedelta
 
 import pytest
@@ -21,7 +22,10 @@ from services.backtest.app.orchestrator import (
     mark_task_failed,
     mark_task_succeeded,
     list_jobs,
+    list_jobs_page,
 )
+from services.backtest.app import orchestrator
+from services.backtest.app.clock import VirtualClock, use_clock
 
 
 @pytest.fixture(autouse=True)
@@ -192,7 +196,7 @@ def test_mark_task_failed_applies_retry_backoff():
     # Fast-forward original task and ensure it can be retried later
     for stored_task in debug_tasks(job_id):
         if stored_task.id == task["id"]:
-            stored_task.next_run_at = datetime.utcnow() - timedelta(seconds=1)
+            stored_task.next_run_at = time.time() - 1
             break
     retry_task = dequeue_next("owner-1", job_id)
     assert retry_task is not None
@@ -201,6 +205,25 @@ def test_mark_task_failed_applies_retry_backoff():
     assert failed_again["retries"] == 2
 
 
+def test_virtual_clock_fast_forwards_retry_backoff():
+    clock = VirtualClock(datetime(2024, 1, 1))
+    with use_clock(clock):
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+        )["id"]
+        task = dequeue_next("owner-1", job_id)
+        assert task["updatedAt"] == "2024-01-01T00:00:00"
+        failed = mark_task_failed(job_id, task["id"], error_type="UPSTREAM_ERROR", message="timeout")
+        assert datetime.fromisoformat(failed["nextRunAt"]) >= datetime(2024, 1, 1, 0, 0, 2)
+        assert dequeue_next("owner-1", job_id) is None
+        clock.advance(10)
+        retry_task = dequeue_next("owner-1", job_id)
+    assert retry_task["id"] == task["id"]
+    assert retry_task["updatedAt"] == "2024-01-01T00:00:10"
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+
 def test_summary_topn_includes_result_summary_id():
     result = create_optimization_job(
         owner_id="owner-1",
@@ -242,6 +265,91 @@ def test_export_top_n_bundle_contains_artifacts():
     assert "score" in first["metrics"]
 
 
+def test_result_summary_cache_is_bounded_and_untouched_by_refresh(monkeypatch):
+    monkeypatch.setenv("OPT_RESULT_CACHE_SIZE", "2")
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=3
+    )["id"]
+    for index, task in enumerate(debug_tasks(job_id)):
+        mark_task_succeeded(job_id, task.id, score=float(index), result_summary_id=f"summary-{index}")
+    cache = orchestrator._RESULT_SUMMARIES
+    assert len(cache) == 2
+    assert "summary-0" not in cache
+
+    lookups = (cache.hits, cache.misses)
+    get_job_status(job_id, "owner-1")
+    assert (cache.hits, cache.misses) == lookups
+
+    bundle = export_top_n_bundle(job_id, "owner-1")
+    assert [item["metrics"] for item in bundle["items"]] == [{"score": 2.0}, {"score": 1.0}, {"score": 0.0}]
+    assert len(cache) == 2
+
+
+def test_result_summaries_survive_restart(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_results.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+        )["id"]
+        orchestrator.flush_persistence()
+        task = dequeue_next("owner-1", job_id)
+        mark_task_succeeded(job_id, task["id"], score=0.7, result_summary_id="summary-1")
+        before = export_top_n_bundle(job_id, "owner-1")["items"][0]
+        stored = orchestrator.get_persistence().load_result_summary("summary-1")
+        assert stored["metrics"] == {"score": 0.7}
+
+        configure_persistence(dsn, create_tables=False)
+        assert len(orchestrator._RESULT_SUMMARIES) == 0
+        item = export_top_n_bundle(job_id, "owner-1")["items"][0]
+        assert item == before
+        assert orchestrator._RESULT_SUMMARIES.get("summary-1")["createdAt"] == stored["createdAt"]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_export_loads_evicted_summaries_without_the_store_lock(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    configure_persistence(f"sqlite:///{tmp_path/'opt_export.sqlite'}", create_tables=True)
+    try:
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=2
+        )["id"]
+        orchestrator.flush_persistence()
+        for index in range(2):
+            task = dequeue_next("owner-1", job_id)
+            mark_task_succeeded(job_id, task["id"], score=float(index), result_summary_id=f"summary-{index}")
+        orchestrator.flush_persistence()
+        orchestrator._RESULT_SUMMARIES.clear()
+        persistence = orchestrator.get_persistence()
+        load = persistence.load_result_summary
+        lock_free = []
+
+        def _try_lock():
+            acquired = orchestrator._STORE_LOCK.acquire(timeout=1)
+            if acquired:
+                orchestrator._STORE_LOCK.release()
+            lock_free.append(acquired)
+
+        def _probe(result_id):
+            # another thread can take the store lock only if this one does not hold it
+            probe = threading.Thread(target=_try_lock)
+            probe.start()
+            probe.join()
+            return load(result_id)
+
+        monkeypatch.setattr(persistence, "load_result_summary", _probe)
+        items = export_top_n_bundle(job_id, "owner-1")["items"]
+        assert [item["metrics"] for item in items] == [{"score": 1.0}, {"score": 0.0}]
+        assert lock_free == [True, True]
+    finally:
+        monkeypatch.undo()
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
 def test_get_job_snapshot_reports_source_job():
     result = create_optimization_job(
         owner_id="owner-1",
@@ -507,6 +615,368 @@ def test_sqlite_persistence_round_trip(tmp_path):
         configure_persistence(None)
 
 
+def test_epoch_timestamps_serialize_identically_after_restart(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_ts.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        with use_clock(VirtualClock(datetime(2024, 1, 1, 9, 30, 0, 123456))):
+            job_id = create_optimization_job(
+                owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+            )["id"]
+            task = dequeue_next("owner-1", job_id)
+            # settled, so the restart has no running task to requeue
+            done = mark_task_succeeded(job_id, task["id"], score=1.0)
+        (stored,) = [t for t in debug_tasks(job_id) if t.id == task["id"]]
+        assert isinstance(stored.updated_at, float)
+        assert task["createdAt"] == task["nextRunAt"] == "2024-01-01T09:30:00.123456"
+        before = get_job_snapshot(job_id, "owner-1")
+        orchestrator.flush_persistence()
+
+        configure_persistence(dsn, create_tables=False)
+        after = get_job_snapshot(job_id, "owner-1")
+        assert (after["createdAt"], after["updatedAt"]) == (before["createdAt"], before["updatedAt"])
+        (reloaded,) = [t for t in debug_tasks(job_id) if t.id == task["id"]]
+        assert orchestrator.TaskHandle(reloaded)["updatedAt"] == done["updatedAt"]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_job_is_schedulable_while_bulk_insert_is_pending(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_bulk.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    persistence = orchestrator.get_persistence()
+    gate = threading.Event()
+    insert_rows = persistence._insert_job_rows
+
+    def _gated(job_row, task_rows):
+        gate.wait(5)
+        return insert_rows(job_row, task_rows)
+
+    monkeypatch.setattr(persistence, "_insert_job_rows", _gated)
+    try:
+        result = create_optimization_job(
+            owner_id="owner-1",
+            version_id="v-1",
+            param_space={"x": [1, 2, 3]},
+            concurrency_limit=1,
+        )
+        job_id = result["id"]
+        assert result["persistState"] == "pending"
+        # Work proceeds before the rows exist; the writes are replayed afterwards.
+        first = dequeue_next("owner-1", job_id)
+        mark_task_succeeded(job_id, first["id"], score=0.5)
+        assert get_job_status(job_id, "owner-1")["persistState"] == "pending"
+
+        gate.set()
+        assert orchestrator.flush_persistence(timeout=5)
+        assert get_job_status(job_id, "owner-1")["persistState"] == "durable"
+
+        configure_persistence(dsn, create_tables=False)
+        status = get_job_status(job_id, "owner-1")
+        assert status["persistState"] == "durable"
+        assert status["summary"]["finished"] == 1
+    finally:
+        gate.set()
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_bulk_insert_chunks_large_jobs(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    monkeypatch.setenv("OPT_DB_BULK_CHUNK", "3")
+    monkeypatch.setenv("OPT_PERSIST_ASYNC", "false")
+    dsn = f"sqlite:///{tmp_path/'opt_chunks.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        result = create_optimization_job(
+            owner_id="owner-1",
+            version_id="v-1",
+            param_space={"x": list(range(5)), "y": list(range(4))},
+            concurrency_limit=2,
+        )
+        assert result["persistState"] == "durable"
+        configure_persistence(dsn, create_tables=False)
+        assert get_job_status(result["id"], "owner-1")["summary"]["total"] == 20
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_racing_writes_replay_to_the_backend_that_inserted_the_job(tmp_path, monkeypatch):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_first.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    persistence = orchestrator.get_persistence()
+    gate = threading.Event()
+    insert_rows = persistence._insert_job_rows
+
+    def _gated(job_row, task_rows):
+        gate.wait(5)
+        return insert_rows(job_row, task_rows)
+
+    monkeypatch.setattr(persistence, "_insert_job_rows", _gated)
+    try:
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+        )["id"]
+        task = dequeue_next("owner-1", job_id)
+        mark_task_succeeded(job_id, task["id"], score=0.5)
+        # persistence is repointed before the first backend finishes the insert
+        other = orchestrator.TaskPersistence(f"sqlite:///{tmp_path/'opt_other.sqlite'}", create_tables=True)
+        monkeypatch.setattr(orchestrator, "_PERSISTENCE", other)
+
+        gate.set()
+        assert persistence.flush(timeout=5)
+        orchestrator.flush_persistence(timeout=5)
+        with persistence._engine.connect() as conn:
+            rows = conn.execute(sqlalchemy.text("SELECT status, score FROM optimization_tasks")).all()
+        assert [tuple(row) for row in rows] == [("succeeded", 0.5)]
+    finally:
+        gate.set()
+        monkeypatch.undo()
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_postgres_bulk_insert_streams_rows_through_copy(monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    Jsonb = pytest.importorskip("psycopg.types.json").Jsonb
+    written = {"rows": []}
+
+    class Cursor:
+        # psycopg's cursor and its copy() are both context managers
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def copy(self, statement):
+            written["statement"] = statement
+            return self
+
+        def write_row(self, row):
+            written["rows"].append(row)
+
+    class Connection:
+        class connection:
+            class driver_connection:
+                cursor = Cursor
+
+        def execute(self, *args):  # pragma: no cover - the COPY path must not fall back
+            raise AssertionError("executemany used instead of COPY")
+
+    persistence = orchestrator.TaskPersistence(None)
+    monkeypatch.setattr(persistence, "_supports_copy", lambda: True)
+    rows = [
+        {"id": "t-1", "param_set": {"x": 1}, "error": None, "score": None},
+        {"id": "t-2", "param_set": {}, "error": {"type": "internal"}, "score": 0.5},
+    ]
+    persistence._bulk_insert_tasks(Connection(), rows)
+
+    assert written["statement"] == "COPY optimization_tasks (id, param_set, error, score) FROM STDIN"
+    first, second = written["rows"]
+    assert first[0] == "t-1" and isinstance(first[1], Jsonb) and first[1].obj == {"x": 1}
+    assert first[2] is None and first[3] is None
+    assert isinstance(second[2], Jsonb) and second[2].obj == {"type": "internal"} and second[3] == 0.5
+
+
+def test_combo_index_round_trips_expansion_order():
+    normalized, _ = orchestrator.summarize_param_space(
+        {"fast": [5, 10], "slow": {"start": 20, "end": 40, "step": 10}, "mode": ["a", "b"]}
+    )
+    for index, params in enumerate(orchestrator.expand_param_space(normalized)):
+        assert orchestrator.decode_combo_index(normalized, index) == params
+        assert orchestrator.encode_combo_index(normalized, params) == index
+    assert orchestrator.encode_combo_index(normalized, {"fast": 7, "slow": 20.0, "mode": "a"}) is None
+
+
+def test_compact_task_storage_decodes_params_on_hydrate(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    monkeypatch.setenv("OPT_TASK_STORAGE", "compact")
+    dsn = f"sqlite:///{tmp_path/'opt_compact.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        result = create_optimization_job(
+            owner_id="owner-1",
+            version_id="v-1",
+            param_space={"x": [1, 2, 3], "y": ["a", "b"]},
+            concurrency_limit=1,
+        )
+        expected = {task.id: task.params for task in debug_tasks(result["id"])}
+        orchestrator.flush_persistence()
+        engine = orchestrator.get_persistence()._engine
+        with engine.connect() as conn:
+            stored = conn.execute(orchestrator.select(orchestrator._TASKS_TABLE.c.param_set)).scalars().all()
+        assert stored == [{}] * 6
+
+        configure_persistence(dsn, create_tables=False)
+        assert {task.id: task.params for task in debug_tasks(result["id"])} == expected
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_migrate_task_storage_compacts_legacy_rows(tmp_path, monkeypatch):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    path = tmp_path / "opt_legacy.sqlite"
+    dsn = f"sqlite:///{path}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        result = create_optimization_job(
+            owner_id="owner-1",
+            version_id="v-1",
+            param_space={"x": [1, 2], "y": [0.5, 1.5]},
+            concurrency_limit=1,
+        )
+        expected = {task.id: task.params for task in debug_tasks(result["id"])}
+        orchestrator.flush_persistence()
+        # Rows written before the compact columns existed.
+        engine = orchestrator.get_persistence()._engine
+        with engine.begin() as conn:
+            conn.execute(sqlalchemy.text("UPDATE optimization_jobs SET normalized_space = NULL"))
+            conn.execute(sqlalchemy.text("UPDATE optimization_tasks SET combo_index = NULL"))
+
+        assert orchestrator.get_persistence().migrate_task_storage(compact=True) == 4
+        assert orchestrator.get_persistence().migrate_task_storage(compact=True) == 0
+        configure_persistence(dsn, create_tables=False)
+        tasks = debug_tasks(result["id"])
+        assert {task.id: task.params for task in tasks} == expected
+        assert sorted(task.combo_index for task in tasks) == [0, 1, 2, 3]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_compact_columns_are_added_only_by_an_explicit_migration(tmp_path, monkeypatch):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_managed.sqlite'}"
+    orchestrator.TaskPersistence(dsn, create_tables=True)._engine.dispose()
+    engine = sqlalchemy.create_engine(dsn)
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("ALTER TABLE optimization_tasks DROP COLUMN combo_index"))
+
+    def columns():
+        return {column["name"] for column in sqlalchemy.inspect(engine).get_columns("optimization_tasks")}
+
+    # a managed (non-SQLite) database opened without create_tables gets no DDL
+    monkeypatch.setattr(orchestrator.TaskPersistence, "_is_sqlite", lambda self: False)
+    persistence = orchestrator.TaskPersistence(dsn)
+    assert "combo_index" not in columns()
+    assert persistence.migrate_task_storage() == 0
+    assert "combo_index" in columns()
+    persistence._engine.dispose()
+    engine.dispose()
+
+
+def _run_to_completion(job_id, owner_id="owner-1"):
+    while True:
+        task = dequeue_next(owner_id, job_id)
+        if task is None:
+            return
+        mark_task_succeeded(job_id, task["id"], score=task["params"]["x"])
+
+
+@pytest.fixture
+def archive_store(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    configure_persistence(f"sqlite:///{tmp_path/'opt_archive.sqlite'}", create_tables=True)
+    yield
+    debug_reset_persistent()
+    configure_persistence(None)
+
+
+def test_retention_needs_persistence(monkeypatch):
+    monkeypatch.setenv("OPT_RETAIN_TERMINAL_PER_OWNER", "0")
+    done = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+    )["id"]
+    _run_to_completion(done)
+
+    # a memory-only store has nowhere to archive the tasks to
+    assert orchestrator.enforce_retention() == 0
+    assert not debug_jobs()[done].archived and len(debug_tasks(done)) == 1
+
+
+def test_retention_archives_terminal_jobs_beyond_owner_limit(monkeypatch, archive_store):
+    monkeypatch.setenv("OPT_RETAIN_TERMINAL_PER_OWNER", "1")
+    monkeypatch.setenv("OPT_TOP_N_LIMIT", "2")
+    old = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3, 4]}, concurrency_limit=4
+    )["id"]
+    _run_to_completion(old)
+    recent = create_optimization_job(
+        owner_id="owner-1", version_id="v-2", param_space={"x": [5, 6]}, concurrency_limit=2
+    )["id"]
+    _run_to_completion(recent)
+    active = create_optimization_job(
+        owner_id="owner-1", version_id="v-3", param_space={"x": [7]}, concurrency_limit=1
+    )["id"]
+    orchestrator.flush_persistence()
+
+    assert orchestrator.enforce_retention() == 1
+    assert orchestrator._JOB_ORDER == [recent, active]
+    archived = debug_jobs()[old]
+    assert archived.archived and archived.param_space == {}
+    assert debug_tasks(old) == [] and old not in orchestrator._INDEX_KEYS
+
+    status = get_job_status(old, "owner-1")
+    assert status["status"] == "succeeded"
+    assert status["summary"]["finished"] == 4
+    bundle = export_top_n_bundle(old, "owner-1")
+    assert [item["params"] for item in bundle["items"]] == [{"x": 4}, {"x": 3}]
+    listed = {entry["id"]: entry for entry in list_jobs("owner-1")}
+    assert set(listed) == {old, recent, active}
+    assert listed[old]["paramSpace"] == {"x": [1, 2, 3, 4]}
+    assert listed[old]["summary"]["finished"] == 4
+
+
+def test_retention_archives_terminal_jobs_by_age(monkeypatch, archive_store):
+    monkeypatch.setenv("OPT_RETAIN_TERMINAL_MAX_AGE_SECONDS", "60")
+    done = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+    )["id"]
+    _run_to_completion(done)
+    active = create_optimization_job(
+        owner_id="owner-1", version_id="v-2", param_space={"x": [2]}, concurrency_limit=1
+    )["id"]
+    orchestrator.flush_persistence()
+
+    assert orchestrator.enforce_retention() == 0
+    later = time.time() + 120
+    assert orchestrator.enforce_retention(later) == 1
+    assert debug_jobs()[done].archived
+    assert not debug_jobs()[active].archived
+    assert dequeue_next("owner-1")["jobId"] == active
+
+
+def test_running_task_of_archived_job_still_settles(monkeypatch, archive_store):
+    monkeypatch.setenv("OPT_RETAIN_TERMINAL_PER_OWNER", "0")
+    monkeypatch.setenv("OPT_TOP_N_LIMIT", "1")
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2, 3]}, concurrency_limit=2
+    )["id"]
+    first = dequeue_next("owner-1", job_id)
+    second = dequeue_next("owner-1", job_id)
+    mark_task_succeeded(job_id, first["id"], score=1.0)
+    cancel_job(job_id, "owner-1")
+    orchestrator.flush_persistence()
+
+    assert orchestrator.enforce_retention() == 1
+    assert debug_tasks(job_id) == []
+
+    late = mark_task_succeeded(job_id, second["id"], score=9.0)
+    assert late["id"] == second["id"]
+    assert late["status"] == "canceled"
+    assert mark_task_failed(job_id, second["id"], error_type="runtime", message="boom")["status"] == "canceled"
+    status = get_job_status(job_id, "owner-1")
+    assert status["status"] == "canceled"
+    assert [item["params"] for item in export_top_n_bundle(job_id, "owner-1")["items"]] == [first["params"]]
+
+
 def test_cancel_job_updates_tasks_and_summary():
     result = create_optimization_job(
         owner_id="owner-1",
@@ -530,6 +1000,22 @@ def test_cancel_job_updates_tasks_and_summary():
     assert statuses <= {"canceled", "succeeded", "failed"}
 
 
+def test_stopping_a_job_publishes_one_revision(monkeypatch):
+    published = []
+    monkeypatch.setattr(orchestrator._EVENTS, "publish", lambda job_id, revision: published.append(revision))
+    for finish_first in (False, True):
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+        )["id"]
+        if finish_first:
+            # nothing left to stop: the summary does not change, the status does
+            dequeue_next("owner-1", job_id)
+            orchestrator.mark_task_failed(job_id, debug_tasks(job_id)[0].id, error_type="internal", message="boom")
+        published.clear()
+        payload = cancel_job(job_id, "owner-1")
+        assert len(published) == 1 and payload["revision"] == published[0]
+
+
 def test_cancel_job_emits_metrics_and_logs(monkeypatch):
     captured_metrics = []
     captured_logs = []
@@ -570,3 +1056,240 @@ def test_cancel_job_emits_metrics_and_logs(monkeypatch):
     assert logged_owner == "owner-1"
     assert logged_status == "canceled"
     assert reason and reason.get("kind") == "CANCELED"
+
+
+def test_list_jobs_page_walks_cursor_without_overlap():
+    created = [
+        create_optimization_job(
+            owner_id="owner-1",
+            version_id=f"v-{idx}",
+            param_space={"x": [idx]},
+            concurrency_limit=1,
+        )["id"]
+        for idx in range(5)
+    ]
+    create_optimization_job(owner_id="owner-2", version_id="v-x", param_space={"x": [1]}, concurrency_limit=1)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = list_jobs_page("owner-1", limit=2, cursor=cursor)
+        seen.extend(entry["id"] for entry in page)
+        assert len(page) <= 2
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+    assert seen == [entry["id"] for entry in list_jobs("owner-1", limit=10)]
+
+
+def test_list_jobs_page_filters_status_and_rejects_bad_cursor():
+    first = create_optimization_job(owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1)
+    create_optimization_job(owner_id="owner-1", version_id="v-2", param_space={"x": [2]}, concurrency_limit=1)
+    cancel_job(first["id"], "owner-1")
+
+    page, cursor = list_jobs_page("owner-1", limit=10, statuses=["canceled"])
+    assert [entry["id"] for entry in page] == [first["id"]]
+    assert cursor is None
+
+    with pytest.raises(ParamInvalidError):
+        list_jobs_page("owner-1", cursor="not-a-cursor")
+
+
+def test_list_jobs_page_reads_non_resident_jobs_from_persistence(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_history.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        ids = [
+            create_optimization_job(
+                owner_id="owner-1",
+                version_id=f"v-{idx}",
+                param_space={"x": [idx]},
+                concurrency_limit=1,
+            )["id"]
+            for idx in range(3)
+        ]
+        orchestrator.flush_persistence()
+        with orchestrator._STORE_LOCK:
+            orchestrator._forget_job(ids[0])
+        assert ids[0] not in debug_jobs()
+
+        first_page, cursor = list_jobs_page("owner-1", limit=2)
+        second_page, tail = list_jobs_page("owner-1", limit=2, cursor=cursor)
+        assert [entry["id"] for entry in first_page] == [ids[2], ids[1]]
+        assert [entry["id"] for entry in second_page] == [ids[0]]
+        assert tail is None
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_list_jobs_page_merges_store_rows_with_one_bounded_query(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_merge.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    clock = VirtualClock(1_700_000_000.0)
+    try:
+        with use_clock(clock):
+            ids = []
+            for idx in range(7):
+                clock.advance(1)
+                ids.append(
+                    create_optimization_job(
+                        owner_id="owner-1", version_id=f"v-{idx}", param_space={"x": [idx]}, concurrency_limit=1
+                    )["id"]
+                )
+        orchestrator.flush_persistence()
+        with orchestrator._STORE_SECTION:
+            orchestrator._forget_job(ids[1])
+            orchestrator._forget_job(ids[4])
+        persistence = orchestrator.get_persistence()
+        query = persistence.query_jobs_page
+        calls = []
+
+        def _counted(*args, **kwargs):
+            rows = query(*args, **kwargs)
+            calls.append(len(rows))
+            return rows
+
+        monkeypatch.setattr(persistence, "query_jobs_page", _counted)
+        seen, cursor = [], None
+        while True:
+            page, cursor = list_jobs_page("owner-1", limit=2, cursor=cursor)
+            seen.extend(entry["id"] for entry in page)
+            if cursor is None:
+                break
+        # resident rows read back from the store are dropped, not paged past
+        assert seen == ids[::-1]
+        assert all(count <= 3 for count in calls)
+    finally:
+        monkeypatch.undo()
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_load_jobs_reads_only_ids_before_loading_owned_chunks(tmp_path, monkeypatch):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'opt_load.sqlite'}"
+    configure_persistence(dsn, create_tables=True)
+    try:
+        ids = [
+            create_optimization_job(
+                owner_id="owner-1", version_id="v-1", param_space={"x": [idx, idx + 10]}, concurrency_limit=1
+            )["id"]
+            for idx in range(5)
+        ]
+        orchestrator.flush_persistence()
+        persistence = orchestrator.get_persistence()
+        monkeypatch.setattr(orchestrator, "LOAD_CHUNK", 2)
+        statements = []
+        sqlalchemy.event.listen(
+            persistence._engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        wanted = set(ids) - {ids[2]}
+        loaded = persistence.load_jobs(lambda job_id: job_id in wanted)
+
+        assert [job.id for job, _ in loaded] == [job_id for job_id in ids if job_id in wanted]
+        assert all(len(tasks) == 2 for _, tasks in loaded)
+        # one id scan over the table, then two job and two task reads for the four owned ids
+        job_reads = [sql for sql in statements if "FROM optimization_jobs" in sql]
+        assert "param_space" not in job_reads[0] and len(job_reads) == 3
+        assert all("IN (" in sql for sql in job_reads[1:])
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_list_jobs_page_projects_requested_fields():
+    create_optimization_job(
+        owner_id="owner-1",
+        version_id="v-1",
+        param_space={"x": [1, 2]},
+        concurrency_limit=1,
+    )
+    page, _ = list_jobs_page("owner-1", fields=orchestrator.COMPACT_LIST_FIELDS)
+    entry = page[0]
+    assert set(entry) == set(orchestrator.COMPACT_LIST_FIELDS)
+    assert entry["counts"] == {"total": 2, "finished": 0, "running": 0, "throttled": 1}
+    assert "paramSpace" not in entry
+
+    only_status, _ = list_jobs_page("owner-1", fields=["status"])
+    assert set(only_status[0]) == {"id", "status"}
+
+    with pytest.raises(ParamInvalidError):
+        list_jobs_page("owner-1", fields=["bogus"])
+
+
+def test_sqlite_persistence_uses_wal_and_pool_settings(tmp_path, monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    monkeypatch.setenv("OPT_DB_POOL_SIZE", "3")
+    monkeypatch.setenv("OPT_DB_MAX_OVERFLOW", "1")
+    persistence = orchestrator.TaskPersistence(f"sqlite:///{tmp_path/'tuned.sqlite'}")
+    engine = persistence._engine
+    assert engine.pool.size() == 3
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+    monkeypatch.setenv("OPT_DB_SQLITE_WAL", "false")
+    plain = orchestrator.TaskPersistence(f"sqlite:///{tmp_path/'plain.sqlite'}")
+    with plain._engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+    assert orchestrator.TaskPersistence("sqlite:///:memory:").enabled
+
+
+def _dequeue_in_thread(owner_id, timeout):
+    result = {}
+
+    def run():
+        started = time.monotonic()
+        result["task"] = dequeue_next(owner_id, timeout=timeout)
+        result["finished"] = time.monotonic()
+        result["waited"] = result["finished"] - started
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def test_blocking_dequeue_wakes_on_job_creation():
+    thread, result = _dequeue_in_thread("owner-1", timeout=5.0)
+    time.sleep(0.1)
+    created = time.monotonic()
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+    )["id"]
+    thread.join(timeout=5)
+    assert result["task"]["jobId"] == job_id
+    assert result["finished"] - created < 0.5
+
+
+def test_blocking_dequeue_wakes_when_slot_frees_and_times_out_when_idle():
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    first = dequeue_next("owner-1")
+    thread, result = _dequeue_in_thread("owner-1", timeout=5.0)
+    time.sleep(0.1)
+    assert thread.is_alive()
+    mark_task_succeeded(job_id, first["id"], score=1.0)
+    thread.join(timeout=5)
+    assert result["task"] is not None and result["task"]["id"] != first["id"]
+
+    started = time.monotonic()
+    assert dequeue_next("owner-1", timeout=0.2) is None
+    assert time.monotonic() - started >= 0.2
+
+
+def test_blocking_dequeue_wakes_at_backoff_expiry():
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+    )["id"]
+    (task,) = debug_tasks(job_id)
+    with orchestrator._STORE_LOCK:
+        task.next_run_at = time.time() + 0.2
+    thread, result = _dequeue_in_thread("owner-1", timeout=5.0)
+    thread.join(timeout=5)
+    assert result["task"]["id"] == task.id
+    assert 0.15 <= result["waited"] < 1.0
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from services.backtest.app import orchestrator, profiler, worker
+from services.backtest.app.main import app
+
+client = TestClient(app)
+
+
+def test_profile_endpoint_samples_worker_threads():
+    orchestrator.configure_persistence(None)
+    orchestrator.debug_reset()
+    orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1]}, concurrency_limit=1
+    )
+    release = threading.Event()
+
+    def runner(task):
+        release.wait(timeout=5)
+        return 1.0
+
+    thread = threading.Thread(target=worker.process_next, args=("owner-1", runner), name="opt-worker")
+    thread.start()
+    try:
+        response = client.post("/internal/debug/profile", params={"seconds": 0.2, "intervalMs": 5})
+    finally:
+        release.set()
+        thread.join(timeout=5)
+        orchestrator.debug_reset()
+
+    assert response.status_code == 200
+    assert int(response.headers["x-profile-samples"]) > 1
+    lines = response.text.strip().splitlines()
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert any(line.startswith("opt-worker;") and "worker.py:process_next" in line for line in lines)
+
+
+def test_profile_sessions_do_not_overlap():
+    session = threading.Thread(target=profiler.sample_stacks, args=(0.5,))
+    session.start()
+    time.sleep(0.05)
+    try:
+        response = client.post("/internal/debug/profile", params={"seconds": 0.1})
+        assert response.status_code == 409
+        assert response.json()["detail"]["code"] == "E.PROFILER_BUSY"
+    finally:
+        session.join(timeout=5)
+    assert client.post("/internal/debug/profile", params={"seconds": 0, "format": "json"}).json()["samples"] == 1
@@ -6,6 +6,7 @@ from typing import Dict, List
 import pytest
 
 from services.backtest.app import orchestrator
+from services.backtest.app.clock import VirtualClock, use_clock
 from services.backtest.app.worker import process_next
 
 
@@ -34,6 +35,12 @@ def configure_environment():
             os.environ[key] = value
 
 
+@pytest.fixture
+def clock():
+    with use_clock(VirtualClock()) as virtual:
+        yield virtual
+
+
 @pytest.fixture
 def metric_capture(monkeypatch):
     recorded: Dict[str, List[float]] = {"queue_wait_seconds": []}
@@ -47,7 +54,7 @@ def metric_capture(monkeypatch):
     return recorded
 
 
-def test_queue_wait_p95_within_two_minutes(metric_capture):
+def test_queue_wait_p95_within_two_minutes(metric_capture, clock):
     owner_id = "owner-slo"
     job = orchestrator.create_optimization_job(
         owner_id=owner_id,
@@ -64,8 +71,8 @@ def test_queue_wait_p95_within_two_minutes(metric_capture):
     deadline = time.time() + 10
 
     def runner(_: dict) -> float:
-        # 模拟计算开销，防止所有任务瞬间结束导致队列指标空洞
-        time.sleep(0.01)
+        # 模拟计算开销（虚拟时钟推进），防止所有任务瞬间结束导致队列指标空洞
+        clock.advance(0.01)
         return 1.0
 
     while True:
@@ -75,7 +82,7 @@ def test_queue_wait_p95_within_two_minutes(metric_capture):
             if status["summary"]["finished"] >= total:
                 break
             assert time.time() < deadline, "queue processing exceeded safety timeout"
-            time.sleep(0.01)
+            clock.advance(0.01)
             continue
         processed += 1
 
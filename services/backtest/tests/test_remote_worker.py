@@ -0,0 +1,232 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from services.backtest.app import main, orchestrator
+from services.backtest.app.leases import LeaseRegistry, lease_node
+from services.backtest.app.main import app
+from services.backtest.app.remote_worker import RemoteWorker
+from services.backtest.app.sharding import ShardRouter, StaticMembership
+
+client = TestClient(app)
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def square_runner(task):
+    time.sleep(0.02)
+    return float(task["params"]["x"]) ** 2
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    orchestrator.configure_persistence(None)
+    orchestrator.debug_reset()
+    main.LEASES.clear()
+    yield
+    main.LEASES.clear()
+    orchestrator.debug_reset()
+
+
+def _create_job(values, concurrency=2):
+    return orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": values}, concurrency_limit=concurrency
+    )["id"]
+
+
+def _lease(worker_id="w-1", **overrides):
+    body = {"workerId": worker_id, "ownerId": "owner-1", "maxTasks": 2, "waitSeconds": 0}
+    body.update(overrides)
+    response = client.post("/internal/tasks/lease", json=body)
+    assert response.status_code == 200
+    return response.json()["leases"]
+
+
+def test_lease_heartbeat_complete_and_fail():
+    job_id = _create_job([1, 2, 3])
+    leases = _lease(maxTasks=5)
+    assert len(leases) == 2  # bounded by the job's concurrency limit
+    assert all(lease["task"]["status"] == "running" for lease in leases)
+
+    beat = client.post(
+        "/internal/tasks/heartbeat",
+        json={"workerId": "w-1", "leaseIds": [leases[0]["leaseId"], "missing"]},
+    ).json()
+    assert beat == {"renewed": [leases[0]["leaseId"]], "lost": ["missing"]}
+
+    stolen = client.post("/internal/tasks/complete", json={"workerId": "w-2", "leaseId": leases[0]["leaseId"]})
+    assert stolen.status_code == 403
+    done = client.post(
+        "/internal/tasks/complete", json={"workerId": "w-1", "leaseId": leases[0]["leaseId"], "score": 0.5}
+    )
+    assert done.status_code == 200 and done.json()["status"] == "succeeded"
+    again = client.post("/internal/tasks/complete", json={"workerId": "w-1", "leaseId": leases[0]["leaseId"]})
+    assert again.status_code == 409
+    assert again.json()["detail"]["code"] == "E.LEASE_INVALID"
+
+    failed = client.post(
+        "/internal/tasks/fail",
+        json={"workerId": "w-1", "leaseId": leases[1]["leaseId"], "code": "PARAM_ERROR", "message": "bad"},
+    )
+    assert failed.status_code == 200 and failed.json()["status"] == "failed"
+    summary = orchestrator.get_job_status(job_id, "owner-1")["summary"]
+    assert summary["finished"] == 2
+
+
+def test_lease_prefers_requested_versions():
+    _create_job([1])
+    preferred = orchestrator.create_optimization_job(
+        owner_id="owner-1", version_id="v-2", param_space={"x": [2]}, concurrency_limit=1
+    )["id"]
+    (lease,) = _lease(maxTasks=1, preferVersions=["v-2"])
+    assert lease["task"]["jobId"] == preferred
+    (lease,) = _lease(maxTasks=1, preferVersions=["v-2"])
+    assert lease["task"]["versionId"] == "v-1"
+
+
+def test_expired_lease_requeues_task():
+    job_id = _create_job([1])
+    (lease,) = _lease()
+    assert main.LEASES.expire(now=time.monotonic() + 3600) == 1
+    (task,) = orchestrator.debug_tasks(job_id)
+    assert task.status == "queued" and task.retries == 1
+    late = client.post("/internal/tasks/complete", json={"workerId": "w-1", "leaseId": lease["leaseId"]})
+    assert late.status_code == 409
+
+
+def test_leases_expire_on_a_timer(monkeypatch):
+    monkeypatch.setenv("OPT_LEASE_SECONDS", "1")
+    job_id = _create_job([1])
+    with TestClient(app) as live:
+        response = live.post(
+            "/internal/tasks/lease",
+            json={"workerId": "w-1", "ownerId": "owner-1", "waitSeconds": 0, "leaseSeconds": 0.1},
+        )
+        assert len(response.json()["leases"]) == 1
+        # no further worker calls: the expiry loop alone requeues the task
+        deadline = time.monotonic() + 10
+        while orchestrator.debug_tasks(job_id)[0].status == "running" and time.monotonic() < deadline:
+            time.sleep(0.05)
+    (task,) = orchestrator.debug_tasks(job_id)
+    assert task.status == "queued" and task.retries == 1
+    assert len(main.LEASES) == 0
+
+
+def test_restart_requeues_leased_tasks_and_worker_drops_lost_lease(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    dsn = f"sqlite:///{tmp_path/'leases.sqlite'}"
+    orchestrator.configure_persistence(dsn, create_tables=True)
+    try:
+        job_id = _create_job([1], concurrency=1)
+        (lease,) = _lease()
+        orchestrator.flush_persistence()
+
+        # the new process knows neither the lease nor a runner for the task
+        main.LEASES.clear()
+        orchestrator.configure_persistence(dsn)
+        (task,) = orchestrator.debug_tasks(job_id)
+        assert task.status == "queued"
+
+        worker = RemoteWorker("http://testserver", "owner-1", square_runner, worker_id="w-1", client=client)
+        worker._settle("complete", lease, score=1.0)  # 409 is a lost lease, not an error
+        (relet,) = _lease()
+        assert relet["task"]["id"] == lease["task"]["id"]
+    finally:
+        orchestrator.debug_reset_persistent()
+        orchestrator.configure_persistence(None)
+
+
+def test_lease_settles_are_routed_to_the_granting_replica(monkeypatch):
+    nodes = {"a": "http://replica-a", "b": "http://replica-b"}
+    orchestrator.configure_sharding(ShardRouter("a", StaticMembership(nodes)))
+    # leases granted by replica b; requests reach this app (replica a) first
+    monkeypatch.setattr(main, "LEASES", LeaseRegistry(node_id="b"))
+    monkeypatch.setattr(main, "SHARD_CLIENT", httpx.AsyncClient(transport=httpx.ASGITransport(app=app)))
+    try:
+        _create_job([1, 2])
+        first, second = _lease()
+        assert lease_node(first["leaseId"]) == "b"
+
+        beat = client.post(
+            "/internal/tasks/heartbeat",
+            json={"workerId": "w-1", "leaseIds": [first["leaseId"], "c.gone"]},
+        ).json()
+        assert beat == {"renewed": [first["leaseId"]], "lost": ["c.gone"]}
+        done = client.post("/internal/tasks/complete", json={"workerId": "w-1", "leaseId": first["leaseId"]})
+        assert done.status_code == 200 and done.json()["status"] == "succeeded"
+        failed = client.post(
+            "/internal/tasks/fail",
+            json={"workerId": "w-1", "leaseId": second["leaseId"], "code": "PARAM_ERROR", "message": "bad"},
+        )
+        assert failed.status_code == 200 and failed.json()["status"] == "failed"
+        gone = client.post("/internal/tasks/complete", json={"workerId": "w-1", "leaseId": "c.gone"})
+        assert gone.status_code == 409
+    finally:
+        orchestrator.configure_sharding(None)
+
+
+def test_lease_long_poll_returns_empty_after_wait():
+    started = time.monotonic()
+    assert _lease(waitSeconds=0.3) == []
+    assert time.monotonic() - started >= 0.3
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_remote_worker_processes_end_to_end():
+    uvicorn = pytest.importorskip("uvicorn")
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    try:
+        job_id = _create_job(list(range(12)), concurrency=4)
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        workers = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "services.backtest.app.remote_worker",
+                    "--url",
+                    f"http://127.0.0.1:{port}",
+                    "--owner",
+                    "owner-1",
+                    "--runner",
+                    "services.backtest.tests.test_remote_worker:square_runner",
+                    "--wait-seconds",
+                    "1",
+                    "--exit-when-idle",
+                ],
+                cwd=REPO_ROOT,
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(3)
+        ]
+        outputs = [json.loads(proc.communicate(timeout=60)[0].strip().splitlines()[-1]) for proc in workers]
+        assert all(proc.returncode == 0 for proc in workers)
+        assert sum(item["processed"] for item in outputs) == 12
+        status = orchestrator.get_job_status(job_id, "owner-1")
+        assert status["status"] == "succeeded"
+        assert status["summary"]["finished"] == 12
+        assert len(main.LEASES) == 0
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
@@ -0,0 +1,40 @@
+import json
+import math
+
+from services.backtest.app import serialization
+from services.backtest.app.serialization import FastJSONResponse, PayloadCache, dumps
+
+
+def test_dumps_matches_stdlib_and_fallback(monkeypatch):
+    payload = {"id": "job-1", "summary": {"topN": [{"score": 1.5}]}, "name": "回测"}
+    assert json.loads(dumps(payload)) == payload
+    non_finite = {"score": math.nan, "bounds": [-math.inf, 1.0, math.inf]}
+    expected = {"score": None, "bounds": [None, 1.0, None]}
+    assert json.loads(dumps(non_finite)) == expected
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(dumps(payload)) == payload
+    assert json.loads(dumps(non_finite)) == expected
+
+
+def test_fast_response_passes_bytes_through():
+    body = b'{"ok":true}'
+    assert FastJSONResponse(body).body == body
+    assert json.loads(FastJSONResponse({"ok": True}).body) == {"ok": True}
+
+
+def test_payload_cache_invalidates_by_revision_and_evicts_lru():
+    cache = PayloadCache(2)
+    cache.put("status", "job-1", 3, b"a")
+    assert cache.get("status", "job-1", 3) == b"a"
+    assert cache.get("status", "job-1", 4) is None
+
+    cache.put("status", "job-2", 1, b"b")
+    cache.get("status", "job-1", 3)
+    cache.put("status", "job-3", 1, b"c")  # evicts job-2, the least recently used
+    assert cache.get("status", "job-2", 1) is None
+    assert cache.get("status", "job-1", 3) == b"a"
+    assert len(cache) == 2
+
+    disabled = PayloadCache(0)
+    disabled.put("status", "job-1", 1, b"a")
+    assert disabled.get("status", "job-1", 1) is None
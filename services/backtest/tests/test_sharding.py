@@ -0,0 +1,202 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from services.backtest.app import main, orchestrator
+from services.backtest.app.clock import VirtualClock, use_clock
+from services.backtest.app.orchestrator import (
+    JobAccessError,
+    configure_persistence,
+    configure_sharding,
+    create_optimization_job,
+    debug_jobs,
+    debug_reset_persistent,
+    debug_tasks,
+    dequeue_next,
+    mark_task_succeeded,
+    refresh_shard_membership,
+)
+from services.backtest.app.sharding import HashRing, LeaseMembership, ShardRouter, StaticMembership
+
+NODES = {"a": "http://replica-a", "b": "http://replica-b"}
+
+
+@pytest.fixture(autouse=True)
+def reset_sharding():
+    yield
+    configure_sharding(None)
+    orchestrator.debug_reset()
+
+
+def _router(self_id):
+    return ShardRouter(self_id, StaticMembership(NODES))
+
+
+class _Members(StaticMembership):
+    def set(self, *node_ids):
+        self._nodes = {node_id: NODES.get(node_id, f"http://replica-{node_id}") for node_id in node_ids}
+
+
+def test_ring_spreads_keys_and_moves_few_on_join():
+    keys = [f"job-{idx}" for idx in range(3000)]
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.node_for(key) for key in keys}
+    for node in ("a", "b", "c"):
+        assert list(before.values()).count(node) > len(keys) * 0.2
+
+    grown = HashRing(["a", "b", "c", "d"])
+    moved = [key for key in keys if grown.node_for(key) != before[key]]
+    assert len(moved) < len(keys) * 0.4
+    assert all(grown.node_for(key) == "d" for key in moved)
+
+
+def test_lease_membership_drops_expired_replicas(tmp_path):
+    path = str(tmp_path / "leases.sqlite")
+    first = LeaseMembership(path, node_id="a", url="http://replica-a", ttl_seconds=10)
+    second = LeaseMembership(path, node_id="b", url="http://replica-b", ttl_seconds=10)
+    try:
+        assert first.members() == NODES
+        first.heartbeat(now=1_000_000_000_000.0)
+        assert first.members(now=1_000_000_000_000.0) == {"a": "http://replica-a"}
+        second.leave()
+        assert set(first.members()) == {"a"}
+    finally:
+        first.close()
+        second.close()
+
+
+def test_replicas_hydrate_and_schedule_only_their_shard(tmp_path):
+    configure_persistence(f"sqlite:///{tmp_path/'shard.sqlite'}", create_tables=True)
+    try:
+        ids = [
+            create_optimization_job(
+                owner_id="owner-1", version_id=f"v-{idx}", param_space={"x": [idx]}, concurrency_limit=1
+            )["id"]
+            for idx in range(20)
+        ]
+        orchestrator.flush_persistence()
+        resident = {}
+        for node in ("a", "b"):
+            router = _router(node)
+            configure_sharding(router)
+            resident[node] = set(debug_jobs())
+            assert resident[node] == {job_id for job_id in ids if router.owner(job_id) == node}
+            # New jobs land in the local shard without a hop.
+            created = create_optimization_job(
+                owner_id="owner-1", version_id="v-new", param_space={"x": [1]}, concurrency_limit=1
+            )["id"]
+            assert router.is_local(created)
+            scheduled = {dequeue_next("owner-1")["jobId"] for _ in range(len(resident[node]))}
+            assert scheduled <= resident[node] | {created}
+        assert resident["a"] | resident["b"] == set(ids)
+        assert not resident["a"] & resident["b"]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def _running_jobs(count):
+    """Create ``count`` concurrency-1 jobs and start one task of each."""
+
+    running = {}
+    for idx in range(count):
+        job_id = create_optimization_job(
+            owner_id="owner-1", version_id=f"v-{idx}", param_space={"x": [idx, idx + 100]}, concurrency_limit=1
+        )["id"]
+        running[job_id] = dequeue_next("owner-1", job_id)["id"]
+    orchestrator.flush_persistence()
+    return running
+
+
+def test_membership_change_hands_off_running_tasks(tmp_path):
+    configure_persistence(f"sqlite:///{tmp_path/'shard.sqlite'}", create_tables=True)
+    try:
+        members = _Members({})
+        members.set("a")
+        configure_sharding(ShardRouter("a", members))
+        running = _running_jobs(12)
+
+        # b joins: a requeues the running tasks of the jobs b takes over and
+        # fences results that its workers report for them afterwards
+        members.set("a", "b")
+        assert refresh_shard_membership()
+        ring = orchestrator.get_shard_router()
+        moved = {job_id for job_id in running if ring.owner(job_id) == "b"}
+        kept = set(running) - moved
+        assert moved and kept
+        assert set(debug_jobs()) == kept
+        job_id = next(iter(moved))
+        with pytest.raises(JobAccessError) as excinfo:
+            mark_task_succeeded(job_id, running[job_id], score=1.0)
+        assert excinfo.value.code == "E.JOB_MOVED"
+
+        # b's view: the moved jobs come back queued, nothing blocks concurrency 1
+        b_members = _Members({})
+        b_members.set("a", "b")
+        configure_sharding(ShardRouter("b", b_members))
+        assert set(debug_jobs()) == moved
+        assert dequeue_next("owner-1", job_id)["id"] == running[job_id]
+
+        # a dies with its tasks running: b requeues them right away
+        b_members.set("b")
+        assert refresh_shard_membership()
+        assert set(debug_jobs()) == set(running)
+        for job_id in kept:
+            assert {task.status for task in debug_tasks(job_id)} == {"queued"}
+            assert dequeue_next("owner-1", job_id)["id"] == running[job_id]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_jobs_taken_from_a_live_replica_wait_one_lease_ttl(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPT_SHARD_LEASE_TTL_SECONDS", "30")
+    configure_persistence(f"sqlite:///{tmp_path/'shard.sqlite'}", create_tables=True)
+    clock = VirtualClock()
+    try:
+        with use_clock(clock):
+            members = _Members({})
+            members.set("a")
+            configure_sharding(ShardRouter("a", members))
+            running = _running_jobs(12)
+
+            # b starts while a has not noticed yet and may still finish its tasks
+            members.set("a", "b")
+            configure_sharding(ShardRouter("b", members))
+            moved = set(debug_jobs())
+            assert moved and moved < set(running)
+            assert all(dequeue_next("owner-1", job_id) is None for job_id in moved)
+
+            clock.advance(31)
+            refresh_shard_membership()
+            for job_id in moved:
+                assert dequeue_next("owner-1", job_id)["id"] == running[job_id]
+    finally:
+        debug_reset_persistent()
+        configure_persistence(None)
+
+
+def test_foreign_job_requests_are_redirected_or_forwarded(monkeypatch):
+    configure_persistence(None)
+    configure_sharding(_router("a"))
+    job_id = create_optimization_job(
+        owner_id="owner-1", version_id="v-1", param_space={"x": [1, 2]}, concurrency_limit=1
+    )["id"]
+    # Membership changes so the job now belongs to replica b.
+    monkeypatch.setattr(orchestrator.get_shard_router(), "owner", lambda _job_id: "b")
+    client = TestClient(main.app)
+    headers = {"x-owner-id": "owner-1"}
+
+    response = client.get(f"/internal/optimizations/{job_id}/status", headers=headers, follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"] == f"http://replica-b/internal/optimizations/{job_id}/status"
+
+    # Proxy mode: the owner (this app, reached through the transport) serves it.
+    monkeypatch.setenv("OPT_SHARD_ROUTING", "proxy")
+    monkeypatch.setattr(main, "SHARD_CLIENT", httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app)))
+    response = client.get(f"/internal/optimizations/{job_id}/status", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == job_id
+    response = client.post(f"/internal/optimizations/{job_id}/cancel", headers=headers, json={"reason": "stop"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "canceled"
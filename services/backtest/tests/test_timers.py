@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from services.backtest.app import timers
+from services.backtest.app.observability import Timer
+from services.backtest.app.timers import LocalTimerStore, SqliteTimerStore, build_timer_store
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    captured = []
+    monkeypatch.setattr(timers, "emit_metric", lambda name, value, tags=None: captured.append((name, value)))
+    return captured
+
+
+def test_local_store_expires_and_bounds_entries(metrics):
+    store = LocalTimerStore(ttl_seconds=60, max_entries=2)
+    store.put("stale", Timer(started_at=time.time() - 120))
+    store.put("job-1", Timer())
+    assert ("timer_expired_total", 1.0) in metrics
+    assert store.pop("stale") is None
+
+    store.put("job-2", Timer())
+    store.put("job-3", Timer())
+    assert len(store) == 2
+    assert ("timer_evicted_total", 1.0) in metrics
+    assert store.pop("job-1") is None
+    assert store.pop("job-3") is not None
+
+
+def test_sqlite_store_shares_timers_between_instances(tmp_path, metrics):
+    path = str(tmp_path / "timers.sqlite")
+    starter = SqliteTimerStore(path, ttl_seconds=60, max_entries=10)
+    finisher = SqliteTimerStore(path, ttl_seconds=60, max_entries=10)
+    try:
+        starter.put("job-1", Timer(started_at=time.time() - 1.5))
+        timer = finisher.pop("job-1")
+        assert timer is not None
+        assert timer.ms() >= 1500.0
+        assert starter.pop("job-1") is None
+
+        starter.put("old", Timer(started_at=time.time() - 120))
+        assert finisher.pop("old") is None
+        assert ("timer_expired_total", 1.0) in metrics
+    finally:
+        starter.close()
+        finisher.close()
+
+
+def test_build_timer_store_selects_backend(tmp_path):
+    assert isinstance(build_timer_store(""), LocalTimerStore)
+    store = build_timer_store(f"sqlite:///{tmp_path/'t.sqlite'}")
+    try:
+        assert isinstance(store, SqliteTimerStore)
+    finally:
+        store.close()
@@ -1,8 +1,10 @@
-from datetime import datetime, timedelta
+import json
+import threading
+import time
 
 import pytest
 
-from services.backtest.app import worker
+from services.backtest.app import orchestrator, worker
 from services.backtest.app.orchestrator import (
     create_optimization_job,
     debug_reset,
@@ -109,7 +111,7 @@ def test_worker_retry_then_success(monkeypatch):
     assert first["retries"] == 1
 
     task_obj = debug_tasks(job_id)[0]
-    task_obj.next_run_at = datetime.utcnow() - timedelta(seconds=1)
+    task_obj.next_run_at = time.time() - 1
 
     second = worker.process_next("owner-1", flaky_runner)
     assert second["status"] == "succeeded"
@@ -147,3 +149,125 @@ def test_worker_respects_observability_toggle(monkeypatch):
 
     assert result["status"] == "succeeded"
     assert result["taskStatus"] == "succeeded"
+
+
+def test_worker_hands_runner_a_task_handle_without_status_refresh(monkeypatch):
+    metrics = capture_metrics(monkeypatch)
+
+    def no_status(*_args, **_kwargs):
+        raise AssertionError("process_next should not build a status payload")
+
+    monkeypatch.setattr("services.backtest.app.orchestrator.get_job_status", no_status)
+    job = create_optimization_job(
+        owner_id="owner-1",
+        version_id="v-1",
+        param_space={"alpha": [1, 2, 3]},
+        concurrency_limit=2,
+    )
+    seen = {}
+
+    def runner(task):
+        seen["task"] = task
+        return float(task["params"]["alpha"])
+
+    result = worker.process_next("owner-1", runner)
+    assert result["status"] == "succeeded"
+    task = seen["task"]
+    # runners get a plain dict they may serialize, copy or modify
+    assert type(task) is dict and task["jobId"] == job["id"]
+    assert json.loads(json.dumps(task))["id"] == task["id"]
+    task["params"] = {}
+    assert set(task) == set(orchestrator.dequeue_next("owner-1"))
+    active = [value for name, value, _ in metrics if name == "active_jobs"]
+    # read right after the settle, before the dequeue_next above
+    assert active == [0]
+    assert orchestrator.running_count(job["id"]) == 1
+    assert orchestrator.running_count("missing") == 0
+
+
+def test_warm_runner_caches_per_version_and_evicts_lru(monkeypatch):
+    metrics = capture_metrics(monkeypatch)
+    loads = []
+
+    class Context:
+        def __init__(self, version_id):
+            self.version_id = version_id
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    def load(task):
+        loads.append(task["versionId"])
+        return Context(task["versionId"])
+
+    runner = worker.WarmRunner(load, lambda task, ctx: float(task["params"]["x"]), max_entries=2)
+    for version_id in ("v-a", "v-b", "v-c"):
+        create_optimization_job(
+            owner_id="owner-1", version_id=version_id, param_space={"x": [1, 2]}, concurrency_limit=2
+        )
+    while worker.process_next("owner-1", runner) is not None:
+        pass
+
+    # each version loads once; loading v-c evicts the least recently used v-a
+    assert loads == ["v-a", "v-b", "v-c"]
+    assert runner.stats() == {"entries": 2, "hits": 3, "misses": 3, "evictions": 1, "hitRatio": 0.5}
+    assert runner.warm_versions() == {"v-b", "v-c"}
+    hits = [tags["versionId"] for name, _, tags in metrics if name == "runner_cache_hit_total"]
+    assert hits == ["v-a", "v-b", "v-c"]
+    assert any(name == "runner_cache_evictions_total" for name, _, _ in metrics)
+    runner.clear()
+    assert runner.warm_versions() == set()
+
+
+def test_warm_runner_defers_closing_contexts_still_in_use():
+    class Context:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    started, finish = threading.Event(), threading.Event()
+    contexts, seen = {}, {}
+
+    def run(task, ctx):
+        contexts[task["versionId"]] = ctx
+        if task["versionId"] == "v-a":
+            started.set()
+            assert finish.wait(5)
+        seen[task["versionId"]] = ctx.closed
+        return ctx
+
+    runner = worker.WarmRunner(lambda task: Context(), run, max_entries=1)
+    busy = threading.Thread(target=runner, args=({"versionId": "v-a"},))
+    busy.start()
+    assert started.wait(5)
+
+    # v-b evicts v-a while a task still runs against it; v-c evicts the idle v-b
+    context_b = runner({"versionId": "v-b"})
+    runner({"versionId": "v-c"})
+    assert context_b.closed and runner.stats()["evictions"] == 2
+    assert not contexts["v-a"].closed
+    finish.set()
+    busy.join(5)
+    assert contexts["v-a"].closed and not contexts["v-c"].closed
+    assert seen == {"v-a": False, "v-b": False, "v-c": False}
+    assert runner._retired == {} and list(runner._in_use.values()) == []
+
+
+def test_process_next_prefers_jobs_of_warm_versions():
+    cold = create_optimization_job(
+        owner_id="owner-1", version_id="v-cold", param_space={"x": [1]}, concurrency_limit=1
+    )
+    warm = create_optimization_job(
+        owner_id="owner-1", version_id="v-warm", param_space={"x": [2]}, concurrency_limit=1
+    )
+    runner = worker.WarmRunner(lambda task: object(), lambda task, ctx: 1.0)
+    runner.release(runner.context_for({"versionId": "v-warm", "ownerId": "owner-1"}))
+
+    first = worker.process_next("owner-1", runner)
+    second = worker.process_next("owner-1", runner)
+    assert [first["taskId"], second["taskId"]] == [
+        debug_tasks(warm["id"])[0].id,
+        debug_tasks(cold["id"])[0].id,
+    ]